@@ -0,0 +1,171 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+
+from devtime.intervals import IntervalTree, subtract_intervals
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+INDEX_PADDING_DAYS = 7  # Days indexed past the last exception before falling back to the weekly pattern
+
+class Availability:
+    """
+    Date-aware working time: weekly hours from the configuration, per-date
+    overrides (holidays, half days) and one-off busy intervals (meetings, PTO).
+
+    Busy intervals live in an IntervalTree, so free time for a day is found
+    in O(log n + k). Next-working-day lookups go through a calendar index
+    precomputed over the range that holds exceptions, with a 7-entry weekly
+    table beyond it, so they take O(1).
+    """
+
+    def __init__(self, config, busy=None):
+        """
+        Initialize an Availability instance.
+
+        Args:
+            config (dict): User configuration ("work_hours" and optional "date_overrides").
+            busy (IntervalTree or iterable, optional): (start datetime, end datetime, summary) busy blocks.
+        """
+        self.work_hours = config["work_hours"]
+        self.overrides = config.get("date_overrides", {})
+        if busy is None:
+            busy = IntervalTree()
+        elif not isinstance(busy, IntervalTree):
+            busy = IntervalTree(busy)
+        self.busy = busy
+        self._index_start = None
+        self._next_offset = None
+        self._weekly_next = None
+
+    def hours_for(self, day):
+        """
+        Returns the configured working hours for a date.
+
+        Args:
+            day (date): The date.
+
+        Returns:
+            tuple or None: (start_hour, end_hour), or None on a day off.
+        """
+        hours = self.overrides.get(day.strftime("%Y-%m-%d"))
+        if hours is None:
+            hours = self.work_hours.get(WEEKDAYS[day.weekday()], {"start": None, "end": None})
+        if hours.get("start") is None or hours.get("end") is None:
+            return None
+        return hours["start"], hours["end"]
+
+    def busy_hours(self, day, start_hour, end_hour):
+        """
+        Returns busy blocks overlapping part of a day as sorted hour ranges.
+
+        Args:
+            day (date): The date.
+            start_hour (float): Start of the queried range.
+            end_hour (float): End of the queried range.
+
+        Returns:
+            list[tuple]: (start, end) hour floats, clipped to the queried range, so a
+            block crossing midnight never yields hours outside the day.
+        """
+        if not len(self.busy):
+            return []
+        day_start = datetime.combine(day, datetime.min.time())
+        overlapping = self.busy.overlap(day_start + timedelta(hours=start_hour), day_start + timedelta(hours=end_hour))
+        return [
+            (max(start_hour, (start - day_start).total_seconds() / 3600.0),
+             min(end_hour, (end - day_start).total_seconds() / 3600.0))
+            for start, end, _ in overlapping
+        ]
+
+    def free_intervals(self, day, from_hour=None):
+        """
+        Returns the free working intervals of a day.
+
+        Args:
+            day (date): The date.
+            from_hour (float, optional): Ignore time before this hour.
+
+        Returns:
+            list[tuple]: (start, end) hour floats.
+        """
+        hours = self.hours_for(day)
+        if hours is None:
+            return []
+        start, end = hours
+        if from_hour is not None:
+            start = max(start, from_hour)
+        if start >= end:
+            return []
+        return subtract_intervals(start, end, self.busy_hours(day, start, end))
+
+    def is_working_day(self, day):
+        """Checks whether a date has any free working time."""
+        return bool(self.free_intervals(day))
+
+    def _build_index(self, anchor):
+        # Weekly fallback: days from each weekday to the next weekday with hours
+        works = [self.work_hours.get(name, {}).get("start") is not None and
+                 self.work_hours.get(name, {}).get("end") is not None for name in WEEKDAYS]
+        self._weekly_next = [
+            next((offset for offset in range(7) if works[(weekday + offset) % 7]), None)
+            for weekday in range(7)
+        ]
+
+        first, last = anchor, anchor
+        for key in self.overrides:
+            override_day = datetime.strptime(key, "%Y-%m-%d").date()
+            first, last = min(first, override_day), max(last, override_day)
+        if len(self.busy):
+            items = self.busy.overlap(datetime.min, datetime.max)
+            first = min(first, items[0][0].date())
+            last = max(last, max(item[1] for item in items).date())
+        last += timedelta(days=INDEX_PADDING_DAYS)
+
+        size = (last - first).days + 1
+        next_offset = [None] * size
+        following = None
+        for i in range(size - 1, -1, -1):
+            day = first + timedelta(days=i)
+            if self.is_working_day(day):
+                following = i
+            if following is not None:
+                next_offset[i] = following - i
+            else:
+                # Nothing working up to the end of the index; continue with the weekly pattern
+                beyond = last + timedelta(days=1)
+                weekly = self._weekly_next[beyond.weekday()]
+                next_offset[i] = None if weekly is None else (size - i) + weekly
+        self._index_start = first
+        self._next_offset = next_offset
+
+    def next_working_day(self, day):
+        """
+        Returns the first date on or after `day` with free working time.
+
+        Args:
+            day (date or datetime): Starting date.
+
+        Returns:
+            date: The next working day.
+
+        Raises:
+            RuntimeError: If no weekday has working hours configured.
+        """
+        if isinstance(day, datetime):
+            day = day.date()
+        if self._next_offset is None or day < self._index_start:
+            self._build_index(day)
+
+        i = (day - self._index_start).days
+        if i < len(self._next_offset):
+            offset = self._next_offset[i]
+        else:
+            offset = self._weekly_next[day.weekday()]
+        if offset is None:
+            raise RuntimeError(f"No working day found after {day}: no weekday has working hours.")
+        return day + timedelta(days=offset)
+
+    def digest(self):
+        """Returns a stable digest of overrides and busy blocks, e.g. for cache keys."""
+        payload = json.dumps({"overrides": self.overrides, "work_hours": self.work_hours}, sort_keys=True)
+        return hashlib.sha256((payload + self.busy.digest()).encode("utf-8")).hexdigest()
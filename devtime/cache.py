@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime
+
+from devtime.scheduler import Task, plan_tasks
+from devtime.storage import task_to_dict, dict_to_task
+
+PLAN_CACHE_DIR = ".devtime_cache"  # Directory for the on-disk plan cache tier
+MAX_MEMORY_ENTRIES = 32  # Plans kept in the in-process LRU
+MAX_DISK_ENTRIES = 256  # Plan files kept on disk before the oldest are pruned
+
+def plan_digest(tasks, config, start, corrections=None, availability=None):
+    """
+    Computes a stable digest identifying a planning request.
+
+    Args:
+        tasks (list[Task]): Tasks to schedule.
+        config (dict): User configuration.
+        start (datetime): Planning start, truncated to the minute.
+        corrections (dict, optional): Duration correction factors applied to the plan.
+        availability (Availability, optional): Date overrides and busy blocks.
+
+    Returns:
+        str: Hex SHA-256 digest of (tasks, config, start minute, corrections, availability).
+    """
+    payload = {
+        "tasks": [task_to_dict(task) for task in tasks],
+        "config": config,
+        "start": start.strftime("%Y-%m-%d %H:%M"),
+        "corrections": corrections or {},
+        "availability": availability.digest() if availability is not None else None,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def plan_to_dict(schedule_plan, remaining_tasks):
+    """
+    Converts a generated plan to a JSON-serializable dictionary.
+
+    Args:
+        schedule_plan (dict): Mapping of "YYYY-MM-DD" to (item, start, end) entries.
+        remaining_tasks (list[Task]): Tasks that did not fit into the plan.
+
+    Returns:
+        dict: Dictionary representation of the plan.
+    """
+    return {
+        "plan": {
+            day: [
+                [task_to_dict(item) if isinstance(item, Task) else item, start, end]
+                for item, start, end in entries
+            ]
+            for day, entries in schedule_plan.items()
+        },
+        "remaining": [task_to_dict(task) for task in remaining_tasks],
+    }
+
+def dict_to_plan(data):
+    """
+    Converts a stored plan dictionary back to (schedule_plan, remaining_tasks).
+
+    Args:
+        data (dict): Dictionary produced by plan_to_dict.
+
+    Returns:
+        tuple: (schedule_plan, remaining_tasks)
+    """
+    schedule_plan = {
+        day: [
+            (dict_to_task(item) if isinstance(item, dict) else item, start, end)
+            for item, start, end in entries
+        ]
+        for day, entries in data["plan"].items()
+    }
+    return schedule_plan, [dict_to_task(d) for d in data["remaining"]]
+
+class PlanCache:
+    """Two-tier (memory LRU + on-disk) cache of generated plans keyed by plan_digest."""
+
+    def __init__(self, max_entries=MAX_MEMORY_ENTRIES, cache_dir=PLAN_CACHE_DIR, max_disk_entries=MAX_DISK_ENTRIES):
+        """
+        Initialize a PlanCache instance.
+
+        Args:
+            max_entries (int): Maximum number of plans kept in memory.
+            cache_dir (str or None): Directory for the disk tier. None disables it.
+            max_disk_entries (int): Maximum number of plan files kept on disk.
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"plan-{key}.json")
+
+    def get(self, key):
+        """
+        Looks up a plan, promoting disk hits into memory.
+
+        Args:
+            key (str): Plan digest.
+
+        Returns:
+            dict or None: Stored plan dictionary, or None on a miss.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        if self.cache_dir:
+            try:
+                with open(self._path(key), "r") as f:
+                    data = json.load(f)
+                self._remember(key, data)
+                self.hits += 1
+                return data
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+
+        self.misses += 1
+        return None
+
+    def put(self, key, data):
+        """
+        Stores a plan dictionary in memory and, if enabled, on disk.
+
+        Args:
+            key (str): Plan digest.
+            data (dict): Plan dictionary produced by plan_to_dict.
+        """
+        self._remember(key, data)
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self._path(key))
+            self._prune_disk()
+        except OSError as e:
+            print(f"⚠ Error writing plan cache: {e}")
+
+    def clear(self):
+        """Drops every cached plan from memory and disk."""
+        self._entries.clear()
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.startswith("plan-"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def _remember(self, key, data):
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _prune_disk(self):
+        files = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.startswith("plan-") and name.endswith(".json")
+        ]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            os.remove(path)
+
+_default_cache = None
+
+def get_plan_cache():
+    """Returns the process-wide PlanCache, creating it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PlanCache()
+    return _default_cache
+
+def cached_plan(tasks, config, now=None, cache=None, corrections=None, availability=None):
+    """
+    Returns the plan for the given tasks, reusing a cached result when possible.
+
+    Args:
+        tasks (list[Task]): Tasks to schedule. They are not modified.
+        config (dict): User configuration.
+        now (datetime, optional): Planning start time. Defaults to the current time.
+        cache (PlanCache, optional): Cache to use. Defaults to the process-wide cache.
+        corrections (dict, optional): Duration correction factors to apply.
+        availability (Availability, optional): Date overrides and busy blocks.
+
+    Returns:
+        tuple: (schedule_plan, remaining_tasks)
+    """
+    if cache is None:
+        cache = get_plan_cache()
+    start = (now or datetime.now()).replace(second=0, microsecond=0)
+    key = plan_digest(tasks, config, start, corrections, availability)
+
+    data = cache.get(key)
+    if data is None:
+        schedule_plan, remaining_tasks = plan_tasks(tasks, config, start, corrections, availability)
+        data = plan_to_dict(schedule_plan, remaining_tasks)
+        cache.put(key, data)
+    return dict_to_plan(data)
@@ -0,0 +1,423 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+CHANGELOG_DIR = "changelog"  # Append-only log of task store changes, in segments, with periodic snapshots
+SNAPSHOT_EVERY = 200  # Events per log segment; a snapshot of the store is taken after each segment
+KEEP_SNAPSHOTS = 5  # Recent snapshots kept besides the first one
+MAX_UNDO = 100  # Command groups that can be undone
+
+_group = None  # Change group (one CLI command) that new events belong to
+_tail = None  # (events path, segment start, file size, last seq) after this process's last append
+
+def begin_group(label, **meta):
+    """
+    Starts a new change group, ending the current one.
+
+    Args:
+        label (str): What made the changes, e.g. the CLI command name.
+        **meta: Extra fields stored on every event of the group ("undo"/"redo": the target group).
+    """
+    global _group
+    _group = {"group": f"{time.time_ns():x}", "label": label, **meta}
+
+def end_group():
+    """Ends the current change group."""
+    global _group
+    _group = None
+
+@contextmanager
+def change_group(label, **meta):
+    """
+    Groups the changes made inside the block into one undoable step.
+
+    A nested group belongs to the outermost one (a batch is one step); its
+    meta fields are added to it.
+
+    Args:
+        label (str): What made the changes, e.g. the CLI command name.
+        **meta: Extra fields stored on every event of the group ("undo"/"redo": the target group).
+    """
+    if _group is not None:
+        _group.update(meta)
+        yield
+        return
+    begin_group(label, **meta)
+    try:
+        yield
+    finally:
+        end_group()
+
+def _path(kind, seq):
+    return os.path.join(CHANGELOG_DIR, f"{kind}-{seq:012d}.{'json' if kind == 'snapshot' else 'jsonl'}")
+
+def _list(kind):
+    if not os.path.isdir(CHANGELOG_DIR):
+        return []
+    prefix = kind + "-"
+    return sorted(int(name[len(prefix):].split(".")[0]) for name in os.listdir(CHANGELOG_DIR)
+                  if name.startswith(prefix) and not name.endswith(".tmp"))
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_json(path, data):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, separators=(",", ":")))
+    os.replace(path + ".tmp", path)
+
+def _read_segment(start):
+    try:
+        with open(_path("events", start), "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    events = []
+    for line in lines:
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError:
+            break  # Torn final write
+    return events
+
+def is_started():
+    """Checks whether the change log has been started (it has its first snapshot)."""
+    return bool(_list("snapshot"))
+
+def ensure_started(load_state):
+    """
+    Starts the change log with a snapshot of the current store, if it has not been started.
+
+    Args:
+        load_state (callable): Returns the current tasks as a list of task dictionaries.
+    """
+    if is_started():
+        return
+    os.makedirs(CHANGELOG_DIR, exist_ok=True)
+    _write_json(_path("snapshot", 0), {"seq": 0, "at": _now(), "tasks": load_state(), "undo": [], "redo": []})
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def build_event(changes, archived=None, completed_at=None, force=False, unarchived=None):
+    """
+    Builds a change event in the current group without writing it.
+
+    Args:
+        changes (list[tuple]): (task_id, before, after) with task dictionaries, None for a missing task.
+        archived (list[dict], optional): Completed tasks moved to the history archive.
+        completed_at (datetime, optional): Completion time of the archived tasks.
+        force (bool): Build the event even if nothing changed (marks an undo or redo step).
+        unarchived (list[dict], optional): Archived records (with "completed_at") deleted from the history.
+
+    Returns:
+        dict or None: The event, or None if nothing changed.
+    """
+    changes = [[task_id, before, after] for task_id, before, after in changes if before != after]
+    if not changes and not archived and not unarchived and not force:
+        return None
+    event = dict(_group) if _group is not None else {"group": f"{time.time_ns():x}", "label": ""}
+    event["at"] = _now()
+    event["changes"] = changes
+    if archived:
+        event["archived"] = archived
+        event["completed_at"] = completed_at.strftime("%Y-%m-%d %H:%M")
+    if unarchived:
+        event["unarchived"] = unarchived
+    return event
+
+def _segment_tail(start):
+    # (last seq, file size) of a segment, reading only the end of the file
+    try:
+        f = open(_path("events", start), "rb")
+    except FileNotFoundError:
+        return start, 0
+    with f:
+        size = position = f.seek(0, os.SEEK_END)
+        block = b""
+        while position > 0:
+            step = min(65536, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step) + block
+            lines = block.split(b"\n")
+            complete = lines if position == 0 else lines[1:]  # The first piece may be cut
+            for line in reversed(complete):
+                try:
+                    return json.loads(line)["seq"], size
+                except ValueError:
+                    continue  # Empty or torn line
+        return start, size
+
+def _file_size(path):
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+def append_events(events):
+    """
+    Appends events to the log, taking a snapshot whenever a segment is full.
+
+    The position in the open segment is remembered between calls and checked
+    against the file size, so an append reads neither the segment nor the
+    directory unless another process wrote to the log in between.
+
+    Args:
+        events (list[dict]): Outputs of build_event. None entries are ignored.
+    """
+    global _tail
+    events = [event for event in events if event is not None]
+    while events:
+        path = os.path.abspath(_path("events", _tail[1])) if _tail is not None else None
+        if path is not None and path == _tail[0] and _file_size(path) == _tail[2]:
+            start, last = _tail[1], _tail[3]
+        else:
+            snapshots = _list("snapshot")
+            if not snapshots:
+                return
+            start = snapshots[-1]
+            last, _ = _segment_tail(start)
+            path = os.path.abspath(_path("events", start))
+
+        count = max(0, min(len(events), start + SNAPSHOT_EVERY - last))
+        chunk, events = events[:count], events[count:]
+        lines = []
+        for seq, event in enumerate(chunk, last + 1):
+            lines.append(json.dumps(dict(event, seq=seq), separators=(",", ":")) + "\n")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+        last += len(chunk)
+        _tail = (path, start, _file_size(path), last)
+        if last - start >= SNAPSHOT_EVERY:
+            _take_snapshot(start, _read_segment(start))
+            _tail = None
+
+def append_event(event):
+    """
+    Appends an event to the log, taking a snapshot when a segment is full.
+
+    Args:
+        event (dict or None): Output of build_event. None is ignored.
+    """
+    append_events([event])
+
+def record(changes, archived=None, completed_at=None, force=False, unarchived=None):
+    """Builds and appends an event (see build_event)."""
+    append_event(build_event(changes, archived, completed_at, force, unarchived))
+
+def last_seq():
+    """Returns the sequence number of the latest event (0 if none)."""
+    snapshots = _list("snapshot")
+    if not snapshots:
+        return 0
+    events = _read_segment(snapshots[-1])
+    return events[-1]["seq"] if events else snapshots[-1]
+
+def iter_events(after=0):
+    """
+    Yields the events after a sequence number, in order.
+
+    Only the segments from the one containing `after + 1` are read.
+
+    Args:
+        after (int): Sequence number of the last event already seen.
+
+    Yields:
+        dict: Events.
+    """
+    segments = _list("events")
+    position = max((i for i, start in enumerate(segments) if start <= after), default=0)
+    for start in segments[position:]:
+        for event in _read_segment(start):
+            if event["seq"] > after:
+                yield event
+
+def initial_state():
+    """
+    Returns the first snapshot of the log.
+
+    Returns:
+        dict or None: {"seq", "at", "tasks", ...}, or None if the log has not been started.
+    """
+    snapshots = _list("snapshot")
+    return _read_json(_path("snapshot", snapshots[0])) if snapshots else None
+
+def _apply(tasks, event):
+    for task_id, _, after in event["changes"]:
+        if after is None:
+            tasks.pop(task_id, None)
+        else:
+            tasks[task_id] = after
+
+def _update_stacks(undo, redo, event, previous_group):
+    # Called once per event; only the first event of a group moves the stacks
+    if event["group"] == previous_group:
+        return
+    entry = [event["group"], event["seq"], event.get("label", ""), event["at"]]
+    if "undo" in event:
+        if undo and undo[-1][0] == event["undo"]:
+            redo.append(undo.pop())
+    elif "redo" in event:
+        if redo and redo[-1][0] == event["redo"]:
+            redo.pop()
+        undo.append(entry)
+    else:
+        undo.append(entry)
+        redo.clear()
+    del undo[:-MAX_UNDO]
+
+def _take_snapshot(start, events):
+    snapshot = _read_json(_path("snapshot", start))
+    tasks = {task["id"]: task for task in snapshot["tasks"]}
+    undo, redo = snapshot["undo"], snapshot["redo"]
+    previous_group = snapshot.get("last_group")
+    for event in events:
+        _apply(tasks, event)
+        _update_stacks(undo, redo, event, previous_group)
+        previous_group = event["group"]
+    seq = events[-1]["seq"]
+    _write_json(_path("snapshot", seq), {"seq": seq, "at": events[-1]["at"], "tasks": list(tasks.values()),
+                                         "undo": undo, "redo": redo, "last_group": previous_group})
+    for old in _list("snapshot")[1:-KEEP_SNAPSHOTS]:
+        os.remove(_path("snapshot", old))
+
+def stacks():
+    """
+    Returns the undo and redo stacks.
+
+    Replays only the latest segment on top of the latest snapshot.
+
+    Returns:
+        tuple: (undo, redo), lists of [group, first_seq, label, at] with the most recent last.
+    """
+    if not is_started():
+        return [], []
+    start = _list("snapshot")[-1]
+    snapshot = _read_json(_path("snapshot", start))
+    undo, redo = snapshot["undo"], snapshot["redo"]
+    previous_group = snapshot.get("last_group")
+    for event in _read_segment(start):
+        _update_stacks(undo, redo, event, previous_group)
+        previous_group = event["group"]
+    return undo, redo
+
+def group_events(entry):
+    """
+    Returns the events of a group.
+
+    Args:
+        entry (list): A stack entry from stacks().
+
+    Returns:
+        list[dict]: The group's events in order.
+    """
+    group, first_seq = entry[0], entry[1]
+    segments = _list("events")
+    position = max((i for i, start in enumerate(segments) if start < first_seq), default=0)
+    events = []
+    for start in segments[position:]:
+        for event in _read_segment(start):
+            if event["group"] == group:
+                events.append(event)
+            elif events:
+                return events
+    return events
+
+def group_effect(events, inverse=False):
+    """
+    Folds a group's events into the net change of each touched task.
+
+    Args:
+        events (list[dict]): Events of one group.
+        inverse (bool): Return the change that reverts the group instead.
+
+    Returns:
+        dict: {"put": [task dicts], "delete": [task IDs], "archived": [task dicts with "completed_at"],
+               "unarchived": [archived records the group deleted]}
+    """
+    final = {}
+    for event in (reversed(events) if inverse else events):
+        for task_id, before, after in event["changes"]:
+            final[task_id] = before if inverse else after
+    archived = [dict(task, completed_at=event["completed_at"]) for event in events for task in event.get("archived", [])]
+    return {
+        "put": [task for task in final.values() if task is not None],
+        "delete": [task_id for task_id, task in final.items() if task is None],
+        "archived": archived,
+        "unarchived": [task for event in events for task in event.get("unarchived", [])],
+    }
+
+def state_at(moment):
+    """
+    Reconstructs the task store as it was at a point in time.
+
+    Starts from the latest snapshot taken before `moment` and replays the
+    log from there, so at most one segment plus any segments after a pruned
+    snapshot are read.
+
+    Args:
+        moment (datetime): Point in time.
+
+    Returns:
+        list[dict]: Task dictionaries.
+
+    Raises:
+        ValueError: If the change log starts after `moment`.
+    """
+    stamp = moment.strftime("%Y-%m-%d %H:%M:%S")
+    snapshots = _list("snapshot")
+    chosen = None
+    for seq in snapshots:
+        snapshot = _read_json(_path("snapshot", seq))
+        if snapshot["at"] > stamp:
+            break
+        chosen = snapshot
+    if chosen is None:
+        raise ValueError("The change log starts after that time.")
+
+    tasks = {task["id"]: task for task in chosen["tasks"]}
+    for start in _list("events"):
+        if start < chosen["seq"]:
+            continue
+        for event in _read_segment(start):
+            if event["seq"] <= chosen["seq"]:
+                continue
+            if event["at"] > stamp:
+                return list(tasks.values())
+            _apply(tasks, event)
+    return list(tasks.values())
+
+def recent_groups(limit=20):
+    """
+    Summarizes the most recent change groups, newest first.
+
+    Args:
+        limit (int): Maximum number of groups.
+
+    Returns:
+        list[dict]: {"group", "seq", "at", "label", "changes", "archived", "unarchived", "undo"/"redo" if set}
+    """
+    groups = []
+    for start in reversed(_list("events")):
+        for event in reversed(_read_segment(start)):
+            if groups and groups[-1]["group"] == event["group"]:
+                summary = groups[-1]
+                summary["seq"] = event["seq"]
+                summary["changes"] += len(event["changes"])
+                summary["archived"] += len(event.get("archived", []))
+                summary["unarchived"] += len(event.get("unarchived", []))
+                continue
+            if len(groups) == limit:
+                return groups
+            summary = {"group": event["group"], "seq": event["seq"], "at": event["at"], "label": event.get("label", ""),
+                       "changes": len(event["changes"]), "archived": len(event.get("archived", [])),
+                       "unarchived": len(event.get("unarchived", []))}
+            for key in ("undo", "redo"):
+                if key in event:
+                    summary[key] = event[key]
+            groups.append(summary)
+    return groups
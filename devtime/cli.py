@@ -1,14 +1,43 @@
 import argparse
+import copy
 import shlex
 from tabulate import tabulate
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from devtime.scheduler import Task, generate_schedule, WorkSchedule
 from devtime.storage import (
-    generate_task_id, save_tasks, load_tasks, 
-    load_completed_tasks, save_completed_tasks
+    generate_task_id, save_tasks, load_tasks, dict_to_task,
+    get_tasks, upsert_tasks, remove_tasks, after_commit, iter_tasks, filter_tasks, load_tag_index,
+    load_busy_blocks, save_busy_blocks, build_snapshot, remove_snapshot, get_active_session, TASKS_FILE, BUSY_FILE
+)
+from devtime.config import load_config, save_config, update_config, CONFIG_FILE
+from devtime.cache import cached_plan
+from devtime.history import (
+    archive_completed, delete_archived, delete_archived_records, clear_history,
+    iter_completed, summarize_rollups, default_range
+)
+from devtime.tracking import (
+    start_timer, stop_timer, running_timer, record_completion,
+    update_stats, group_summary, correction_factors, ERROR_BUCKETS
+)
+from devtime.availability import Availability, WEEKDAYS
+from devtime.ics import write_plan_ics, iter_busy_blocks
+from devtime.session import TaskSession, DEFAULT_FLUSH_SECONDS
+from devtime.outofcore import stream_plan
+from devtime.slots import SlotIndex, slot_horizon, slot_state, load_slot_index, save_slot_index, reserve_added_task
+from devtime.team import load_team, save_team, plan_team
+from devtime.tags import normalize_tags
+from devtime.completion import completion_script
+from devtime.sync import load_sync_state, export_bundle, write_bundle, read_bundle, apply_bundle
+from devtime.changelog import (
+    change_group, begin_group, end_group, record, stacks, group_events, group_effect, state_at, recent_groups
+)
+from devtime.watch import FileWatcher, next_boundary, run_watch
+from devtime.server import make_server, DEFAULT_HOST, DEFAULT_PORT
+from devtime.remind import run_reminders, hook_notifier, print_notification, DEADLINE_LEAD_MINUTES
+from devtime.recurrence import (
+    WEEKDAY_NAMES, build_rule, parse_weekdays, describe_rule, next_occurrence, complete_occurrence
 )
-from devtime.config import load_config, save_config, update_config
 
 def parse_date(date_str):
     """
@@ -117,6 +146,22 @@ def parse_add_args(args):
         priority=priority
     )
 
+_confirm_answer = None  # Preset answer for confirmations (batch mode); None asks the user
+
+def confirm(prompt):
+    """
+    Asks the user a yes/no question, or returns the preset batch answer.
+
+    Args:
+        prompt (str): The question to show.
+
+    Returns:
+        bool: True if the user confirmed.
+    """
+    if _confirm_answer is not None:
+        return _confirm_answer
+    return input(prompt).strip().lower() in ("yes", "y")
+
 def add_task(args):
     """
     Handles adding a new task and saving it to storage.
@@ -124,7 +169,6 @@ def add_task(args):
     Args:
         args (Namespace): Command-line arguments containing task details.
     """
-    tasks = load_tasks()
     task_id = generate_task_id()
 
     name = args.name
@@ -132,12 +176,35 @@ def add_task(args):
     deadline = parse_date(args.deadline) if args.deadline else None
     priority = parse_priority(args.priority)
 
-    new_task = Task(name, duration, deadline, priority, task_id)
-    tasks.append(new_task)
-    save_tasks(tasks)
+    recurrence = None
+    if getattr(args, "repeat", None):
+        recurrence = build_rule(
+            args.repeat,
+            interval=args.every or 1,
+            weekdays=parse_weekdays(args.on) if args.on else None,
+            until=parse_date(args.until).date() if args.until else None,
+            count=args.count
+        )
+        if deadline is None:
+            deadline = datetime.now().replace(hour=23, minute=59, second=0, microsecond=0)
+
+    new_task = Task(name, duration, deadline, priority, task_id, recurrence,
+                    tags=normalize_tags(getattr(args, "tags", None)), project=getattr(args, "project", None))
+    new_task.assignee = getattr(args, "assign", None)
+    now = datetime.now().replace(second=0, microsecond=0)
+    state = slot_state(now) if get_active_session() is None else None
+    upsert_tasks([new_task])
+    if state is not None:
+        reserve_added_task(new_task, state, now, load_config())
 
     print(f"✅ Task added: [ID {task_id}] {new_task.name}, {new_task.duration}h, "
           f"{new_task.deadline.strftime('%Y-%m-%d %H:%M') if new_task.deadline else 'No deadline'}, {new_task.priority}")
+    if recurrence:
+        print(f"🔁 Repeats {describe_rule(recurrence)}.")
+    if new_task.assignee:
+        print(f"👤 Assigned to {new_task.assignee}.")
+    if new_task.project or new_task.tags:
+        print(f"🏷 {new_task.project or 'No project'}; tags: {', '.join(new_task.tags) or 'none'}.")
 
 def delete_task(args):
     """
@@ -145,10 +212,11 @@ def delete_task(args):
 
     Args:
         args (Namespace): Command-line arguments containing task IDs or 'all'.
-    """
-    tasks = load_tasks()
-    completed_tasks = load_completed_tasks()
 
+    Returns:
+        bool: False if an ID was invalid or unknown or the user canceled (batch mode aborts on it),
+        True otherwise.
+    """
     active_ids = getattr(args, "active_ids", getattr(args, "id", []))
     completed_ids = getattr(args, "completed_ids", getattr(args, "completed", []))
 
@@ -158,41 +226,50 @@ def delete_task(args):
         completed_ids = [completed_ids]
 
     if "all" in active_ids:
-        confirm = input("⚠ Are you sure you want to delete all active tasks? (yes/no): ").strip().lower()
-        if confirm in ("yes", "y"):
+        if confirm("⚠ Are you sure you want to delete all active tasks? (yes/no): "):
             save_tasks([])
             print("✅ All active tasks have been deleted successfully.")
-        else:
-            print("🚫 Operation canceled.")
-        return
+            return True
+        print("🚫 Operation canceled.")
+        return False
 
     if "all" in completed_ids:
-        confirm = input("⚠ Are you sure you want to delete all completed tasks? (yes/no): ").strip().lower()
-        if confirm in ("yes", "y"):
-            save_completed_tasks([])
+        if confirm("⚠ Are you sure you want to delete all completed tasks? (yes/no): "):
+            clear_history()
             print("✅ All completed tasks have been deleted successfully.")
-        else:
-            print("🚫 Operation canceled.")
-        return
+            return True
+        print("🚫 Operation canceled.")
+        return False
 
+    succeeded = True
     try:
         if active_ids:
             task_ids = set(map(int, active_ids))
-            tasks = [task for task in tasks if task.id not in task_ids]
-            save_tasks(tasks)
-            print(f"✅ Successfully deleted active tasks: {', '.join(map(str, task_ids))}.")
+            removed = {task.id for task in remove_tasks(task_ids)}
+            if removed:
+                print(f"✅ Successfully deleted active tasks: {', '.join(map(str, sorted(removed)))}.")
+            if removed != task_ids:
+                print(f"⚠ No active tasks found for IDs: {', '.join(map(str, sorted(task_ids - removed)))}.")
+                succeeded = False
 
         if completed_ids:
             completed_task_ids = set(map(int, completed_ids))
-            completed_tasks = [task for task in completed_tasks if task.id not in completed_task_ids]
-            save_completed_tasks(completed_tasks)
-            print(f"✅ Successfully deleted completed tasks: {', '.join(map(str, completed_task_ids))}.")
+            deleted = {record["id"] for record in delete_archived(completed_task_ids)}
+            if deleted:
+                print(f"✅ Successfully deleted completed tasks: {', '.join(map(str, sorted(deleted)))}.")
+            if deleted != completed_task_ids:
+                missing = sorted(completed_task_ids - deleted)
+                print(f"⚠ No completed tasks found for IDs: {', '.join(map(str, missing))}.")
+                succeeded = False
 
         if not active_ids and not completed_ids:
             print("⚠ No valid tasks specified for deletion.")
+            succeeded = False
 
     except ValueError:
         print("⚠ Error: Task IDs must be numbers.")
+        return False
+    return succeeded
 
 def edit_task(args):
     """
@@ -200,26 +277,32 @@ def edit_task(args):
 
     Args:
         args (Namespace): Command-line arguments containing task ID and new values.
+
+    Returns:
+        bool: False if the task was not found (batch mode aborts on it), True otherwise.
     """
-    tasks = load_tasks()
     task_id = args.id
 
-    for task in tasks:
-        if task.id == task_id:
-            if args.name:
-                task.name = args.name
-            if args.duration:
-                task.duration = args.duration
-            if args.deadline:
-                task.deadline = datetime.strptime(args.deadline, "%Y-%m-%d %H:%M")
-            if args.priority:
-                task.priority = args.priority
-
-            save_tasks(tasks)
-            print(f"✅ Task {task_id} updated successfully.")
-            return
+    for task in get_tasks([task_id]):
+        if args.name:
+            task.name = args.name
+        if args.duration:
+            task.duration = args.duration
+        if args.deadline:
+            task.deadline = datetime.strptime(args.deadline, "%Y-%m-%d %H:%M")
+        if args.priority:
+            task.priority = args.priority
+        if getattr(args, "tags", None) is not None:
+            task.tags = normalize_tags(args.tags)
+        if getattr(args, "project", None) is not None:
+            task.project = None if args.project.lower() == "none" else args.project
+
+        upsert_tasks([task])
+        print(f"✅ Task {task_id} updated successfully.")
+        return True
 
     print(f"⚠ Task with ID {task_id} not found.")
+    return False
 
 def complete_task(args):
     """
@@ -227,33 +310,124 @@ def complete_task(args):
 
     Args:
         args (Namespace): Command-line arguments containing task IDs or 'all'.
+
+    Returns:
+        bool: False if an ID was unknown (batch mode aborts on it), True otherwise.
     """
-    tasks = load_tasks()
-    completed_tasks = load_completed_tasks()
-
-    if args.id == "all":
-        confirm = input("⚠ Are you sure you want to mark all tasks as completed? (yes/no): ").strip().lower()
-        if confirm in ("yes", "y"):
-            completed_tasks.extend(tasks)
-            save_completed_tasks(completed_tasks)
-            save_tasks([])  # Clear active tasks
+    ids = getattr(args, "id", None) or getattr(args, "ids", None)
+    if ids == ["all"]:
+        ids = "all"
+
+    if ids == "all":
+        if confirm("⚠ Are you sure you want to mark all tasks as completed? (yes/no): "):
+            finish_tasks(load_tasks())  # Recurring series only advance to their next occurrence
             print("✅ All tasks have been marked as completed.")
         else:
             print("🚫 Operation canceled.")
         return
 
-    task_ids = args.id if isinstance(args.id, list) else [args.id]
+    task_ids = list(map(int, ids if isinstance(ids, list) else [ids]))
 
-    remaining_tasks = [task for task in tasks if task.id not in map(int, task_ids)]
-    completed_now = [task for task in tasks if task.id in map(int, task_ids)]
+    completed_now = get_tasks(task_ids)
+    if completed_now:
+        finish_tasks(completed_now)
+        print(f"✅ Successfully marked tasks as completed: {', '.join(str(task.id) for task in completed_now)}.")
 
-    if not completed_now:
-        print(f"⚠ No matching tasks found for IDs: {', '.join(map(str, task_ids))}.")
-    else:
-        completed_tasks.extend(completed_now)
-        save_completed_tasks(completed_tasks)
-        save_tasks(remaining_tasks)
-        print(f"✅ Successfully marked tasks as completed: {', '.join(map(str, task_ids))}.")
+    found = {task.id for task in completed_now}
+    missing = [task_id for task_id in task_ids if task_id not in found]
+    if missing:
+        print(f"⚠ No matching tasks found for IDs: {', '.join(map(str, missing))}.")
+        return False
+    return True
+
+def finish_tasks(tasks):
+    """
+    Archives completed tasks and removes them from the active list.
+
+    A recurring series completes only its earliest open occurrence, which is
+    recorded as an exception on the series; the series row is removed once
+    no occurrences are left.
+
+    Args:
+        tasks (list[Task]): Tasks to complete.
+    """
+    done, finished, advanced = [], [], []
+    for task in tasks:
+        if not task.recurrence:
+            done.append(task)
+            finished.append(task.id)
+            continue
+        deadline = next_occurrence(task.recurrence, task.deadline)
+        if deadline is not None:
+            occurrence = copy.copy(task)
+            occurrence.recurrence = None
+            occurrence.deadline = deadline
+            occurrence.occurrence = deadline.strftime("%Y-%m-%d")
+            done.append(occurrence)
+            task.recurrence = complete_occurrence(task.recurrence, task.deadline, deadline.date())
+            print(f"🔁 Completed the {occurrence.occurrence} occurrence of '{task.name}'.")
+        if deadline is None or next_occurrence(task.recurrence, task.deadline) is None:
+            finished.append(task.id)
+        else:
+            advanced.append(task)
+
+    archive_completed(done, compress=load_config().get("compress_history", False))
+    for task in done:
+        after_commit(record_completion, task)
+    if advanced:
+        upsert_tasks(advanced)
+    if finished:
+        remove_tasks(finished)
+
+def build_plan(tasks, args=None):
+    """
+    Generates (or fetches from the plan cache) the multi-day plan for the given tasks.
+
+    Applies estimate corrections when requested and keeps imported busy
+    calendar blocks free.
+
+    Args:
+        tasks (list[Task]): Tasks to schedule.
+        args (Namespace, optional): Command-line arguments with an optional corrected flag.
+
+    Returns:
+        tuple: (schedule_plan, remaining_tasks)
+    """
+    config = load_config()
+    corrections = None
+    if getattr(args, "corrected", False) or config.get("apply_time_corrections", False):
+        corrections = correction_factors()
+
+    availability = Availability(config, load_busy_blocks())
+    return cached_plan(tasks, config, corrections=corrections, availability=availability)
+
+def list_tasks(args):
+    """
+    Lists active tasks, optionally filtered by tags and project through the tag index.
+
+    Args:
+        args (Namespace): Command-line arguments with tags, any and project.
+    """
+    all_tags = normalize_tags(getattr(args, "tags", None))
+    any_tags = normalize_tags(getattr(args, "any", None))
+    tasks = filter_tasks(all_tags, any_tags, getattr(args, "project", None))
+    if not tasks:
+        print("🎉 No matching tasks.")
+        return
+
+    rows = [[task.id, task_label(task), task.duration,
+             task.deadline.strftime("%Y-%m-%d %H:%M") if task.deadline else "-",
+             task.priority, task.project or "-", ", ".join(task.tags) or "-"] for task in tasks]
+    print(tabulate(rows, headers=["ID", "Task Name", "Hours", "Deadline", "Priority", "Project", "Tags"],
+                   tablefmt="fancy_grid"))
+    if getattr(args, "counts", False):
+        tag_counts, project_counts = load_tag_index().counts()
+        print("\n🏷 Tags: " + (", ".join(f"{tag} ({count})" for tag, count in sorted(tag_counts.items())) or "none"))
+        print("📁 Projects: " + (", ".join(f"{name} ({count})" for name, count in sorted(project_counts.items())) or "none"))
+
+def task_label(task):
+    """Returns the display name of a task, with the day of a recurring occurrence."""
+    return f"{task.name} ({task.occurrence})" if task.occurrence else task.name
 
 def plan_schedule(args):
     """
@@ -262,44 +436,486 @@ def plan_schedule(args):
     Args:
         args (Namespace): Command-line arguments.
     """
+    if getattr(args, "out", None):
+        plan_to_file(args)
+        return
+    if getattr(args, "watch", False):
+        watch_plan(args)
+        return
+
     tasks = load_tasks()
     if not tasks:
         print("⚠ No tasks available to schedule.")
         return
 
-    schedule_plan, remaining_tasks = generate_schedule(tasks, None)
-    
+    schedule_plan, remaining_tasks = build_plan(tasks, args)
+
     today_str = datetime.now().strftime("%Y-%m-%d")
     if today_str in schedule_plan:
         daily_schedule = schedule_plan[today_str]
         print("\n📅 Schedule for today (" + today_str + "):")
         headers = ["ID", "Task Name", "Start Time", "End Time"]
-        table_data = [
-            [
-                str(item.id) if isinstance(item, Task) else "",
-                item.name if isinstance(item, Task) else "Break",
-                f"{int(start):02}:{int((start % 1) * 60):02}",
-                f"{int(end):02}:{int((end % 1) * 60):02}"
-            ]
-            for item, start, end in daily_schedule
-        ]
-        print(tabulate(table_data, headers=headers, tablefmt="fancy_grid"))
+        print(tabulate(schedule_rows(daily_schedule), headers=headers, tablefmt="fancy_grid"))
     else:
         print("\n📅 No schedule generated for today.")
 
     if remaining_tasks:
         print("\n⚠ The following tasks could not be scheduled today:")
         for task in remaining_tasks:
-            print(f"- {task.name} (ID: {task.id}, remaining duration: {task.duration}h)")
+            print(f"- {task_label(task)} (ID: {task.id}, remaining duration: {task.duration}h)")
+
+def schedule_rows(daily_schedule, hour=None):
+    """
+    Formats a day's schedule entries as table rows.
+
+    Args:
+        daily_schedule (list[tuple]): (item, start, end) entries.
+        hour (float, optional): Current time in hours; adds a first column marking the running slot.
+
+    Returns:
+        list[list[str]]: Table rows.
+    """
+    rows = []
+    for item, start, end in daily_schedule:
+        row = [
+            str(item.id) if isinstance(item, Task) else "",
+            task_label(item) if isinstance(item, Task) else "Break",
+            f"{int(start):02}:{int((start % 1) * 60):02}",
+            f"{int(end):02}:{int((end % 1) * 60):02}"
+        ]
+        if hour is not None:
+            row.insert(0, "▶" if start <= hour < end else "")
+        rows.append(row)
+    return rows
+
+def watch_plan(args):
+    """
+    Keeps today's plan on screen and updates it in place.
+
+    The plan is rebuilt only when tasks.json, config.json or the busy
+    blocks change, or when the current time reaches the start or end of a
+    slot; only the lines that differ are redrawn.
+
+    Args:
+        args (Namespace): Command-line arguments with an optional corrected flag.
+    """
+    import sys
+
+    def render():
+        now = datetime.now()
+        today_str = now.strftime("%Y-%m-%d")
+        tasks = load_tasks()
+        schedule_plan, remaining_tasks = build_plan(tasks, args) if tasks else ({}, [])
+        daily_schedule = schedule_plan.get(today_str, [])
+        lines = [f"📅 Schedule for today ({today_str}). Watching for changes, press Ctrl+C to stop.", ""]
+        if daily_schedule:
+            rows = schedule_rows(daily_schedule, now.hour + now.minute / 60.0)
+            lines += tabulate(rows, headers=["Now", "ID", "Task Name", "Start Time", "End Time"],
+                              tablefmt="fancy_grid").splitlines()
+        else:
+            lines.append("No schedule for the rest of today.")
+        if remaining_tasks:
+            lines += ["", "⚠ The following tasks could not be scheduled today:"]
+            lines += [f"- {task_label(task)} (ID: {task.id}, remaining duration: {task.duration}h)"
+                      for task in remaining_tasks]
+        return lines, next_boundary(daily_schedule, now)
+
+    def write(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    watcher = FileWatcher([TASKS_FILE, CONFIG_FILE, BUSY_FILE])
+    try:
+        run_watch(render, watcher, write, ansi=sys.stdout.isatty())
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+    finally:
+        watcher.close()
+
+def plan_to_file(args):
+    """
+    Plans the whole store out of core and writes the plan to a JSON Lines file.
+
+    Tasks are streamed from storage, sorted on disk by deadline and priority,
+    and planned through a fixed-size window, so memory stays bounded however
+    large the store is.
+
+    Args:
+        args (Namespace): Command-line arguments with out, days and corrected.
+    """
+    config = load_config()
+    corrections = None
+    if getattr(args, "corrected", False) or config.get("apply_time_corrections", False):
+        corrections = correction_factors()
+
+    fields = ["id", "name", "duration", "deadline", "priority", "project", "recurrence"]
+    with open(args.out, "w", encoding="utf-8") as f:
+        summary = stream_plan(iter_tasks(fields=fields), f, config, corrections=corrections,
+                              availability=Availability(config, load_busy_blocks()), max_days=args.days)
+
+    print(f"✅ Planned {summary['entries']} session(s) over {summary['days']} day(s) into {args.out}.")
+    if summary["expired"]:
+        print(f"⚠ Skipped {summary['expired']} task(s) with past deadlines.")
+    if summary["remaining"]:
+        print(f"⚠ {summary['remaining']} task(s) did not fit into the planning horizon.")
+
+def find_slot(args):
+    """
+    Finds the earliest time the given durations fit into the planned calendar.
+
+    Several durations are placed one after another, as if each were added
+    as a task, so later ones only get the time the earlier ones left free.
+    The index of the planning horizon is stored next to the plan cache and
+    kept up to date by 'add', so it is only rebuilt from the plan after
+    other changes.
+
+    Args:
+        args (Namespace): Command-line arguments with durations, optional before and contiguous.
+    """
+    now = datetime.now().replace(second=0, microsecond=0)
+    before = parse_date(args.before) if args.before else None
+    if before is not None and before <= now:
+        print("⚠ The --before date is already in the past.")
+        return
+
+    config = load_config()
+    corrected = getattr(args, "corrected", False) or config.get("apply_time_corrections", False)
+    # A session keeps changes in memory, and corrections follow the history, so neither matches the stored state
+    stored = not corrected and get_active_session() is None and (before is None or before <= slot_horizon(now))
+    state = slot_state(now)
+    index = load_slot_index(state) if stored else None
+    if index is None:
+        tasks = load_tasks()
+        schedule_plan, _ = build_plan(tasks, args) if tasks else ({}, [])
+        index = SlotIndex.from_plan(schedule_plan, config, Availability(config, load_busy_blocks()), now,
+                                    None if stored else before)
+        if stored:
+            save_slot_index(index, state)
+
+    for hours in args.durations:
+        pieces = index.earliest(hours, contiguous=args.contiguous)
+        if pieces is not None and before is not None:
+            day, _, end = pieces[-1]
+            if datetime.combine(day, datetime.min.time()) + timedelta(hours=end) > before:
+                pieces = None
+        if pieces is not None:
+            index.reserve(hours, contiguous=args.contiguous)  # Only for the following durations; not stored
+        if pieces is None:
+            limit = f"before {before.strftime('%Y-%m-%d %H:%M')}" if before else "in the planning horizon"
+            print(f"⚠ No room for {hours}h {limit}.")
+            if args.contiguous and hours > config["max_concentration_hours"]:
+                print(f"ℹ Focus blocks are at most {config['max_concentration_hours']}h long; drop --contiguous to split it.")
+            continue
+        formatted = ", ".join(
+            f"{day} {int(start):02}:{round(start % 1 * 60):02}–{int(end):02}:{round(end % 1 * 60):02}"
+            for day, start, end in pieces
+        )
+        print(f"🕒 {hours}h fits at: {formatted}")
+
+def export_ics(args):
+    """
+    Exports the generated multi-day plan to an iCalendar (.ics) file.
+
+    Args:
+        args (Namespace): Command-line arguments with file, breaks and corrected.
+    """
+    tasks = load_tasks()
+    if not tasks:
+        print("⚠ No tasks available to schedule.")
+        return
+
+    schedule_plan, _ = build_plan(tasks, args)
+    try:
+        with open(args.file, "w", encoding="utf-8", newline="") as f:
+            count = write_plan_ics(schedule_plan, f, include_breaks=args.breaks)
+    except IOError as e:
+        print(f"⚠ Error writing calendar: {e}")
+        return
+    print(f"✅ Exported {count} events to {args.file}.")
+
+def import_ics(args):
+    """
+    Imports busy blocks from an iCalendar (.ics) file so that plans keep them free.
+
+    Args:
+        args (Namespace): Command-line arguments with file and replace.
+    """
+    try:
+        with open(args.file, "r", encoding="utf-8") as f:
+            imported = list(iter_busy_blocks(f))
+    except (IOError, ValueError) as e:
+        print(f"⚠ Error reading calendar: {e}")
+        return
+
+    blocks = imported if args.replace else load_busy_blocks() + imported
+    blocks = sorted(set(blocks))
+    save_busy_blocks(blocks)
+    print(f"✅ Imported {len(imported)} busy blocks ({len(blocks)} total).")
+
+def start_tracking(args):
+    """
+    Starts the timer for a task, stopping any running timer.
+
+    Args:
+        args (Namespace): Command-line arguments containing the task ID.
+    """
+    task_id = int(args.id)
+    if not any(iter_tasks(where=lambda d: d["id"] == task_id, fields=["id"])):
+        print(f"⚠ Task with ID {task_id} not found.")
+        return
+
+    stopped = start_timer(task_id)
+    if stopped is not None:
+        print(f"⏹ Stopped timer for task {stopped[0]}.")
+    print(f"▶ Started timer for task {task_id}.")
+
+def stop_tracking(args):
+    """
+    Stops the running timer.
+
+    Args:
+        args (Namespace): Command-line arguments.
+    """
+    stopped = stop_timer()
+    if stopped is None:
+        print("⚠ No timer is running.")
+        return
+    elapsed = (datetime.now() - stopped[1]).total_seconds() / 3600.0
+    print(f"⏹ Stopped timer for task {stopped[0]} after {elapsed:.2f}h.")
+
+def view_estimate_stats(args):
+    """
+    Displays estimate accuracy per priority and per keyword.
+
+    Args:
+        args (Namespace): Command-line arguments.
+    """
+    running = running_timer()
+    if running is not None:
+        print(f"▶ Timer running for task {running[0]} since {running[1].strftime('%H:%M')}.")
+
+    stats = update_stats()
+    bucket_labels = [f"≤{int(bound * 100):+d}%" for bound in ERROR_BUCKETS] + [f">{int(ERROR_BUCKETS[-1] * 100):+d}%"]
+    for kind, title in (("priority", "Priority"), ("keyword", "Keyword")):
+        if not stats[kind]:
+            continue
+        table_data = []
+        for key, group in sorted(stats[kind].items()):
+            summary = group_summary(group)
+            table_data.append([key, summary["count"], f"{summary['factor']:.2f}x", f"×/÷{summary['spread']:.2f}"]
+                              + summary["histogram"])
+        print(f"\n⏱ Actual vs. estimated time by {kind}:")
+        print(tabulate(table_data, headers=[title, "Tasks", "Factor", "Spread"] + bucket_labels, tablefmt="fancy_grid"))
+
+    if not stats["priority"]:
+        print("⚠ No tracked tasks have been completed yet.")
+
+HISTORY_PAGE_ROWS = 50  # Completed tasks printed per table, bounding memory for long ranges
 
 def view_history(args):
     """
-    Displays the task history (placeholder).
+    Displays completed tasks and hours per priority for a date range.
+
+    Only the month partitions overlapping the range are read, and records are
+    streamed and printed in pages, so memory does not grow with the range.
+    The totals come from the precomputed rollups.
+
+    Args:
+        args (Namespace): Command-line arguments with optional start, end and weekly.
+    """
+    start, end = default_range()
+    if args is not None and getattr(args, "start", None):
+        start = parse_date(args.start).date()
+    if args is not None and getattr(args, "end", None):
+        end = parse_date(args.end).date()
+    weekly = bool(getattr(args, "weekly", False))
+
+    print(f"\n📜 Completed tasks ({start} – {end}):")
+    fields = ["id", "name", "duration", "priority"]
+    page = []
+    shown = 0
+    for record in iter_completed(start, end, fields=fields):
+        page.append([record[field] for field in fields])
+        if len(page) == HISTORY_PAGE_ROWS:
+            print(tabulate(page, headers=["ID", "Task Name", "Hours", "Priority"], tablefmt="fancy_grid"))
+            shown += len(page)
+            page = []
+    if page:
+        print(tabulate(page, headers=["ID", "Task Name", "Hours", "Priority"], tablefmt="fancy_grid"))
+    elif not shown:
+        print("No completed tasks in this period.")
+
+    rows = summarize_rollups(start, end, weekly=weekly)
+    if rows:
+        print("\n📊 Hours completed by priority:")
+        table_data = [
+            [period, totals.get("high", 0), totals.get("medium", 0), totals.get("low", 0), round(sum(totals.values()), 2)]
+            for period, totals in rows
+        ]
+        headers = ["Week" if weekly else "Day", "High", "Medium", "Low", "Total"]
+        print(tabulate(table_data, headers=headers, tablefmt="fancy_grid"))
+
+def manage_snapshot(args):
+    """
+    Enables or disables the binary snapshot of the task store.
+
+    Args:
+        args (Namespace): Command-line arguments with off.
+    """
+    if args.off:
+        remove_snapshot()
+        print("✅ Binary snapshot disabled.")
+        return
+    count = build_snapshot()
+    print(f"✅ Binary snapshot built with {count} task(s). It is kept in sync with tasks.json automatically.")
+
+def apply_effect(effect, forward):
+    """
+    Applies the net change of a change group to the task store and the archive.
+
+    Args:
+        effect (dict): Output of group_effect.
+        forward (bool): True to redo the group (archive its completed tasks again and
+            delete the records it deleted), False to undo it (the other way round).
+    """
+    record([], force=True)  # Marks the step even if the store already matches
+    if effect["put"]:
+        upsert_tasks([dict_to_task(task) for task in effect["put"]])
+    if effect["delete"]:
+        remove_tasks(effect["delete"])
+    archive, unarchive = effect["archived"], effect["unarchived"]
+    if not forward:
+        archive, unarchive = unarchive, archive
+    if unarchive:
+        delete_archived_records(unarchive)
+    batches = {}
+    for task in archive:
+        batches.setdefault(task["completed_at"], []).append(dict_to_task(task))
+    for completed_at, tasks in batches.items():
+        archive_completed(tasks, completed_at=datetime.strptime(completed_at, "%Y-%m-%d %H:%M"),
+                          compress=load_config().get("compress_history", False))
+
+def undo_change(args):
+    """
+    Reverts the most recent command that changed tasks.
 
     Args:
         args (Namespace): Command-line arguments.
     """
-    print("⚠ Feature under development. Coming soon!")
+    undo, _ = stacks()
+    if not undo:
+        print("⚠ Nothing to undo.")
+        return
+    entry = undo[-1]
+    effect = group_effect(group_events(entry), inverse=True)
+    with change_group("undo", undo=entry[0]):
+        apply_effect(effect, forward=False)
+    print(f"↩ Undid '{entry[2] or 'change'}' from {entry[3]} ({len(effect['put']) + len(effect['delete'])} task(s), "
+          f"{len(effect['archived']) + len(effect['unarchived'])} completion(s)).")
+
+def redo_change(args):
+    """
+    Applies the most recently undone command again.
+
+    Args:
+        args (Namespace): Command-line arguments.
+    """
+    _, redo = stacks()
+    if not redo:
+        print("⚠ Nothing to redo.")
+        return
+    entry = redo[-1]
+    effect = group_effect(group_events(entry))
+    with change_group("redo", redo=entry[0]):
+        apply_effect(effect, forward=True)
+    print(f"↪ Redid '{entry[2] or 'change'}' from {entry[3]} ({len(effect['put']) + len(effect['delete'])} task(s), "
+          f"{len(effect['archived']) + len(effect['unarchived'])} completion(s)).")
+
+def view_log(args):
+    """
+    Displays the most recent changes to the task store.
+
+    Args:
+        args (Namespace): Command-line arguments with limit.
+    """
+    groups = recent_groups(args.limit)
+    if not groups:
+        print("📭 No changes recorded yet.")
+        return
+    table_data = []
+    for group in groups:
+        note = "undo" if "undo" in group else "redo" if "redo" in group else ""
+        table_data.append([group["seq"], group["at"], group["label"], group["changes"], group["archived"],
+                           group["unarchived"], note])
+    print(tabulate(table_data, headers=["Seq", "Time", "Command", "Task changes", "Completed", "History deleted", "Note"],
+                   tablefmt="fancy_grid"))
+
+def restore_tasks(args):
+    """
+    Shows the tasks as they were at a point in time, and optionally restores them.
+
+    Args:
+        args (Namespace): Command-line arguments with at and apply.
+    """
+    moment = parse_date(args.at)
+    try:
+        restored = [dict_to_task(task) for task in state_at(moment)]
+    except ValueError as e:
+        print(f"⚠ Error: {e}")
+        return
+
+    print(f"\n🕰 Tasks at {moment.strftime('%Y-%m-%d %H:%M')}:")
+    table_data = [[task.id, task.name, task.duration,
+                   task.deadline.strftime("%Y-%m-%d %H:%M") if task.deadline else "None", task.priority]
+                  for task in restored]
+    print(tabulate(table_data, headers=["ID", "Task Name", "Hours", "Deadline", "Priority"], tablefmt="fancy_grid"))
+
+    if args.apply:
+        with change_group("restore"):
+            save_tasks(restored)
+        print(f"✅ Restored {len(restored)} task(s). Run 'devtime undo' to go back.")
+
+def sync_store(args):
+    """
+    Exchanges changes with another DevTime store through delta bundle files.
+
+    Args:
+        args (Namespace): Command-line arguments with action, file and peer.
+    """
+    state = load_sync_state()
+    if args.action == "status":
+        print(f"🔄 This store: {state['replica']}")
+        table_data = [[replica, position["sent"], position["received"]] for replica, position in state["peers"].items()]
+        if table_data:
+            print(tabulate(table_data, headers=["Peer", "Changes confirmed", "Changes received"], tablefmt="fancy_grid"))
+        else:
+            print("No peers yet. Run 'devtime sync export FILE' here and 'devtime sync import FILE' on the other store.")
+        return
+
+    if not args.file:
+        print(f"⚠ Error: 'sync {args.action}' needs a bundle file.")
+        return
+
+    if args.action == "export":
+        peer = args.peer
+        if peer is None and len(state["peers"]) == 1:
+            peer = next(iter(state["peers"]))
+        bundle = export_bundle(peer)
+        write_bundle(bundle, args.file)
+        target = f"for {peer} " if peer else ""
+        print(f"✅ Exported {len(bundle['tasks'])} changed task(s) and {sum(len(b['tasks']) for b in bundle['completed'])} "
+              f"completion(s) {target}to {args.file}.")
+        return
+
+    try:
+        result = apply_bundle(read_bundle(args.file))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠ Error: Could not apply {args.file}: {e}")
+        return
+    print(f"✅ Sync applied: {result['updated']} updated, {result['deleted']} deleted, "
+          f"{result['completed']} completed.")
+    if result["kept"]:
+        print(f"ℹ Kept {result['kept']} newer local value(s) over the peer's.")
 
 def view_schedule(args):
     """
@@ -311,13 +927,41 @@ def view_schedule(args):
     print("⚠ Feature under development. Coming soon!")
 
 def interactive_mode():
-    """Runs the interactive CLI mode, allowing users to enter commands in a loop."""
+    """
+    Runs the interactive CLI mode, allowing users to enter commands in a loop.
+
+    Tasks are kept in an in-memory session for the whole loop; changes are
+    journaled immediately and written to the JSON files after a debounce
+    interval, on 'save' and on exit.
+    """
     print("\nWelcome to DevTime interactive mode!")
     print("Type a command or 'help' to see available commands.")
     print("-" * 50)
 
+    session = TaskSession(flush_interval=load_config().get("session_flush_seconds", DEFAULT_FLUSH_SECONDS))
+    session.open()
+    try:
+        run_interactive_loop(session)
+    finally:
+        end_group()
+        session.close()
+
+def run_interactive_loop(session):
+    """
+    Reads and dispatches interactive commands until the user exits.
+
+    Args:
+        session (TaskSession): The active in-memory session.
+    """
+    import sys
+
     while True:
-        command = input("DevTime> ").strip().lower()
+        session.maybe_flush()
+        session.sync()
+        print("DevTime> ", end="", flush=True)
+        session.wait_for_input(sys.stdin)
+        command = input().strip().lower()
+        begin_group(command.split()[0] if command else "")  # Each command is one undoable step
 
         if command in ["q", "exit", "quit"]:
             print("Exiting interactive mode. Goodbye!")
@@ -332,6 +976,12 @@ def interactive_mode():
             print("  edit       - Edit an existing task")
             print("  delete     - Delete a task")
             print("  complete   - Mark a task as completed")
+            print("  start      - Start the timer for a task")
+            print("  stop       - Stop the running timer")
+            print("  stats      - View estimate accuracy")
+            print("  undo       - Revert the last change")
+            print("  redo       - Apply the last undone change again")
+            print("  save       - Write pending changes to disk now")
             print("  exit       - Exit interactive mode")
             print("-" * 50)
 
@@ -436,9 +1086,109 @@ def interactive_mode():
         elif command == "history":
             view_history(None)
 
+        elif command.startswith("start"):
+            parts = command.split()[1:]
+            task_id = parts[0] if parts else input("Task ID to start: ").strip()
+            try:
+                start_tracking(argparse.Namespace(id=int(task_id)))
+            except ValueError:
+                print(f"⚠ Invalid task ID: {task_id}")
+
+        elif command == "stop":
+            stop_tracking(None)
+
+        elif command == "stats":
+            view_estimate_stats(None)
+
+        elif command == "undo":
+            undo_change(None)
+
+        elif command == "redo":
+            redo_change(None)
+
+        elif command == "save":
+            if session.dirty:
+                session.flush()
+                print("✅ Changes saved.")
+            else:
+                print("✅ Nothing to save.")
+
         else:
             print("⚠ Invalid command. Type 'help' to see available commands.")
 
+BATCH_COMMANDS = {"add", "edit", "delete", "complete"}  # Commands that only touch the task store
+
+def run_batch(args):
+    """
+    Applies a stream of commands against one in-memory store.
+
+    Each line uses the command-line grammar ("add 'Write report' 2.5 10 1",
+    "complete 12345", ...); blank lines and '#' comments are skipped. Changes
+    are committed once at the end, or every --commit-every commands. If a
+    command fails (including an unknown task ID), the uncommitted group is
+    rolled back and nothing from it reaches disk.
+
+    Args:
+        args (Namespace): Command-line arguments with file, commit_every, yes and quiet.
+    """
+    import contextlib
+    import io
+    import sys
+
+    global _confirm_answer
+    parser = build_parser()
+    try:
+        stream = sys.stdin if args.file == "-" else open(args.file, "r", encoding="utf-8")
+    except OSError as e:
+        print(f"⚠ Cannot read batch file {args.file}: {e.strerror}.")
+        return
+    session = TaskSession(journal_path=None)
+    session.open()
+    _confirm_answer = bool(args.yes)
+    applied = committed = 0
+
+    try:
+        for line_number, line in enumerate(stream, 1):
+            argv = shlex.split(line, comments=True)
+            if argv and argv[0].lower() == "devtime":
+                argv = argv[1:]
+            if not argv:
+                continue
+            if argv[0] not in BATCH_COMMANDS:
+                raise ValueError(f"'{argv[0]}' is not supported in batch mode.")
+
+            try:
+                command_args = parser.parse_args(argv)
+            except SystemExit:
+                raise ValueError(f"Invalid arguments: {line.strip()}")
+            if command_args.command == "delete" and command_args.completed_ids is not None:
+                raise ValueError("Deleting completed tasks is not supported in batch mode.")
+            if command_args.command == "add":
+                command_args = normalize_add_args(command_args)
+
+            output = io.StringIO() if args.quiet else sys.stdout
+            with contextlib.redirect_stdout(output):
+                succeeded = command_args.func(command_args)
+            if succeeded is False:
+                raise ValueError(f"Command failed: {line.strip()}")
+            applied += 1
+
+            if args.commit_every and applied % args.commit_every == 0:
+                session.flush()
+                committed = applied
+    except Exception as e:
+        session.rollback()
+        print(f"⚠ Batch aborted at line {line_number}: {e}")
+        print(f"🚫 Rolled back {applied - committed} uncommitted command(s); {committed} committed.")
+        return
+    finally:
+        _confirm_answer = None
+        if stream is not sys.stdin:
+            stream.close()
+
+    session.close()
+    print(f"✅ Batch applied {applied} command(s).")
+
 def view_config(args):
     """
     Displays the current user configuration.
@@ -468,6 +1218,201 @@ def update_work_hours(args):
     save_config(config)
     print(f"✅ Updated working hours for {args.day}.")
 
+def update_date_hours(args):
+    """
+    Overrides working hours for a specific date (holiday, half day) or removes the override.
+
+    Args:
+        args (Namespace): Command-line arguments with date, start and end.
+    """
+    day = parse_date(args.date).strftime("%Y-%m-%d")
+    config = load_config()
+    overrides = config.setdefault("date_overrides", {})
+
+    if args.start.lower() == "default":
+        overrides.pop(day, None)
+        message = f"✅ Restored default working hours for {day}."
+    elif args.start.lower() == "none":
+        overrides[day] = {"start": None, "end": None}
+        message = f"✅ Marked {day} as a day off."
+    else:
+        if args.end is None:
+            print("⚠ Error: End time is required.")
+            return
+        overrides[day] = {"start": int(args.start), "end": int(args.end)}
+        message = f"✅ Updated working hours for {day}."
+
+    save_config(config)
+    print(message)
+
+def add_busy_block(args):
+    """
+    Adds a one-off busy interval (meeting, PTO) that plans keep free.
+
+    Args:
+        args (Namespace): Command-line arguments with start, end and summary.
+    """
+    start = parse_date(args.start)
+    end = parse_date(args.end)
+    if end <= start:
+        print("⚠ Error: End must be after start.")
+        return
+
+    blocks = sorted(set(load_busy_blocks() + [(start, end, args.summary)]))
+    save_busy_blocks(blocks)
+    print(f"✅ Added busy block: {start.strftime('%Y-%m-%d %H:%M')} – {end.strftime('%Y-%m-%d %H:%M')} {args.summary}")
+
+def add_team_member(args):
+    """
+    Adds a team member or updates their skills and work hours.
+
+    Args:
+        args (Namespace): Command-line arguments with name, skills, days, start, end and focus.
+    """
+    team = load_team()
+    profile = team.get(args.name, {"skills": []})
+    if args.skills is not None:
+        profile["skills"] = [skill.strip().lower() for skill in args.skills.split(",") if skill.strip()]
+    if args.start is not None and args.end is not None:
+        days = {WEEKDAY_NAMES[day] for day in parse_weekdays(args.days or "mon,tue,wed,thu,fri")}
+        profile["work_hours"] = {
+            name: {"start": args.start, "end": args.end} if name[:3].lower() in days else {"start": None, "end": None}
+            for name in WEEKDAYS
+        }
+    if args.focus is not None:
+        profile["max_concentration_hours"] = args.focus
+    team[args.name] = profile
+    save_team(team)
+    print(f"✅ Saved team member {args.name} (skills: {', '.join(profile['skills']) or 'none'}).")
+
+def remove_team_member(args):
+    """
+    Removes a team member.
+
+    Args:
+        args (Namespace): Command-line arguments with name.
+    """
+    team = load_team()
+    if team.pop(args.name, None) is None:
+        print(f"⚠ No team member named {args.name}.")
+        return
+    save_team(team)
+    print(f"✅ Removed team member {args.name}.")
+
+def plan_for_team(args):
+    """
+    Distributes tasks across the team and shows each person's plan for today.
+
+    Args:
+        args (Namespace): Command-line arguments with workers and assign.
+    """
+    team = load_team()
+    if not team:
+        print("⚠ No team members yet. Add one with 'devtime team-add <name>'.")
+        return
+    tasks = load_tasks()
+    plans, result = plan_team(tasks, team, load_config(), workers=args.workers)
+
+    today_str = datetime.now().strftime("%Y-%m-%d")
+    at_risk = {id(task) for task in result["at_risk"]}
+    summary = []
+    for name, assigned in result["assignments"].items():
+        schedule_plan, remaining = plans[name]
+        summary.append([name, len(assigned), round(sum(task.duration for task in assigned), 2),
+                        sum(1 for task in assigned if id(task) in at_risk), len(remaining)])
+        today = [entry for entry in schedule_plan.get(today_str, []) if isinstance(entry[0], Task)]
+        if today:
+            print(f"\n👤 {name} today:")
+            print(tabulate(
+                [[item.id, task_label(item), f"{int(start):02}:{int((start % 1) * 60):02}",
+                  f"{int(end):02}:{int((end % 1) * 60):02}"] for item, start, end in today],
+                headers=["ID", "Task Name", "Start Time", "End Time"], tablefmt="fancy_grid"))
+
+    print("\n👥 Team load:")
+    print(tabulate(summary, headers=["Person", "Tasks", "Hours", "At risk", "Unplanned"], tablefmt="fancy_grid"))
+    for task in result["unassignable"]:
+        print(f"⚠ Nobody has the skills for {task_label(task)} (ID: {task.id}).")
+
+    if args.assign:
+        chosen = {task.id: name for name, assigned in result["assignments"].items()
+                  for task in assigned if not task.occurrence and not task.assignee}
+        updated = get_tasks(chosen)
+        for task in updated:
+            task.assignee = chosen[task.id]
+        upsert_tasks(updated)
+        print(f"✅ Saved {len(updated)} assignment(s).")
+
+def remind(args):
+    """
+    Runs the reminder loop: notifies when planned sessions and breaks start and deadlines approach.
+
+    Args:
+        args (Namespace): Command-line arguments with hook and lead.
+    """
+    config = load_config()
+    hook = args.hook or config.get("remind_hook")
+    notify = hook_notifier(shlex.split(hook)) if hook else print_notification
+    lead = args.lead if args.lead is not None else config.get("remind_lead_minutes", DEADLINE_LEAD_MINUTES)
+
+    def load_plan():
+        tasks = load_tasks()
+        schedule_plan, _ = build_plan(tasks) if tasks else ({}, [])
+        return schedule_plan, tasks
+
+    print("🔔 Reminders are running. Press Ctrl+C to stop.")
+    try:
+        run_reminders(load_plan, notify, lead)
+    except KeyboardInterrupt:
+        print("\n👋 Reminders stopped.")
+
+def serve_status(args):
+    """
+    Runs the read-only HTTP/JSON status server in the foreground.
+
+    Args:
+        args (Namespace): Command-line arguments with host and port.
+    """
+    server = make_server(lambda tasks: build_plan(tasks), args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"🌐 Serving /tasks, /overdue, /plan and /forecast on http://{host}:{port}. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped.")
+    finally:
+        server.server_close()
+
+def print_completion(args):
+    """
+    Prints the shell completion script.
+
+    Args:
+        args (Namespace): Command-line arguments with shell.
+    """
+    print(completion_script(args.shell, build_parser()), end="")
+
+def update_project_quota(args):
+    """
+    Sets or removes the daily hour quota of a project.
+
+    Args:
+        args (Namespace): Command-line arguments with project and hours ('none' removes the quota).
+    """
+    config = load_config()
+    quotas = config.setdefault("project_quotas", {})
+    if args.hours.lower() == "none":
+        quotas.pop(args.project, None)
+        message = f"✅ Removed the daily quota of {args.project}."
+    else:
+        hours = float(args.hours)
+        if hours <= 0:
+            print("⚠ Error: The quota must be positive (or 'none' to remove it).")
+            return
+        quotas[args.project] = hours
+        message = f"✅ {args.project} is limited to {hours}h per day."
+    save_config(config)
+    print(message)
+
 def update_concentration(args):
     """
     Updates max concentration hours.
@@ -488,17 +1433,13 @@ def update_break(args):
     update_config("min_break_minutes", int(args.minutes))
     print(f"✅ Updated minimum break to {args.minutes} minutes.")
 
-def main():
-    """
-    Sets up the CLI interface using argparse and executes the corresponding command.
-    If no command is provided, launches interactive mode.
+def build_parser():
     """
-    import sys
-
-    if len(sys.argv) == 1:
-        interactive_mode()
-        return
+    Builds the argparse parser shared by the command line and batch mode.
 
+    Returns:
+        argparse.ArgumentParser: The configured parser.
+    """
     parser = argparse.ArgumentParser(
         prog="DevTime",
         description="Intelligent CLI-based task scheduler for developers."
@@ -512,6 +1453,14 @@ def main():
     add_parser.add_argument("duration", type=float, help="Task duration in hours")
     add_parser.add_argument("deadline", type=str, nargs="*", default=None, help="Deadline (e.g. '10', '02-10', '2025-02-10 18:00')")
     add_parser.add_argument("priority", type=str, nargs="?", default="2", help="Priority (1=high, 2=medium, 3=low or 'high')")
+    add_parser.add_argument("--repeat", choices=["daily", "weekly"], help="Make the task recurring; the deadline is the first occurrence")
+    add_parser.add_argument("--every", type=int, help="Days (daily) or weeks (weekly) between occurrences (default: 1)")
+    add_parser.add_argument("--on", type=str, help="Weekdays for weekly tasks (e.g. mon,thu)")
+    add_parser.add_argument("--until", type=str, help="Last day an occurrence may fall on")
+    add_parser.add_argument("--count", type=int, help="Total number of occurrences")
+    add_parser.add_argument("--assign", type=str, help="Team member to assign the task to")
+    add_parser.add_argument("--tags", type=str, help="Comma-separated tags (e.g. bug,backend)")
+    add_parser.add_argument("--project", type=str, help="Project the task belongs to")
     add_parser.set_defaults(func=add_task)
 
     # "delete" command: Delete a task
@@ -527,8 +1476,18 @@ def main():
     edit_parser.add_argument("--duration", type=float, help="New task duration in hours", required=False)
     edit_parser.add_argument("--deadline", type=str, help="New deadline (YYYY-MM-DD HH:MM)", required=False)
     edit_parser.add_argument("--priority", type=str, choices=["low", "medium", "high"], help="New task priority", required=False)
+    edit_parser.add_argument("--tags", type=str, help="New comma-separated tags ('' to clear)", required=False)
+    edit_parser.add_argument("--project", type=str, help="New project ('none' to clear)", required=False)
     edit_parser.set_defaults(func=edit_task)
 
+    # "tasks" command: List tasks filtered by tags and project
+    tasks_parser = subparsers.add_parser("tasks", help="List active tasks, filtered by tags and project")
+    tasks_parser.add_argument("--tags", type=str, help="Only tasks with all of these comma-separated tags")
+    tasks_parser.add_argument("--any", type=str, help="Only tasks with at least one of these comma-separated tags")
+    tasks_parser.add_argument("--project", type=str, help="Only tasks of this project")
+    tasks_parser.add_argument("--counts", action="store_true", help="Also show the number of tasks per tag and project")
+    tasks_parser.set_defaults(func=list_tasks)
+
     # "complete" command: Mark a task as completed
     complete_parser = subparsers.add_parser("complete", help="Mark tasks as completed.")
     complete_parser.add_argument("ids", nargs="+", help="Task IDs to mark as completed or 'all' to complete all tasks.")
@@ -536,16 +1495,129 @@ def main():
 
     # "plan" command: Generate an optimized schedule
     plan_parser = subparsers.add_parser("plan", help="Generate an optimized work schedule")
+    plan_parser.add_argument("--corrected", action="store_true", help="Scale durations by learned estimate corrections")
+    plan_parser.add_argument("--out", type=str, help="Plan the whole store out of core and write it day by day to this JSONL file")
+    plan_parser.add_argument("--days", type=int, help="Calendar days to plan with --out (default: 30, the planning horizon)")
+    plan_parser.add_argument("--watch", action="store_true", help="Keep today's plan on screen and update it when tasks or settings change")
     plan_parser.set_defaults(func=plan_schedule)
 
+    # "slot" command: Find free time without adding a task
+    slot_parser = subparsers.add_parser("slot", help="Find the earliest free time for a duration in the plan")
+    slot_parser.add_argument("durations", type=float, nargs="+", help="Duration(s) in hours, placed one after another")
+    slot_parser.add_argument("--before", type=str, help="Latest end of the placement (e.g. 2025-03-07 or 07 18:00)")
+    slot_parser.add_argument("--contiguous", action="store_true", help="Require one uninterrupted focus block")
+    slot_parser.set_defaults(func=find_slot)
+
+    # "export-ics" / "import-ics" commands: Exchange plans and busy time with calendars
+    export_parser = subparsers.add_parser("export-ics", help="Export the plan to an iCalendar file")
+    export_parser.add_argument("file", type=str, nargs="?", default="devtime.ics", help="Output .ics file (default: devtime.ics)")
+    export_parser.add_argument("--breaks", action="store_true", help="Include breaks as events")
+    export_parser.add_argument("--corrected", action="store_true", help="Scale durations by learned estimate corrections")
+    export_parser.set_defaults(func=export_ics)
+
+    import_parser = subparsers.add_parser("import-ics", help="Import busy blocks from an iCalendar file")
+    import_parser.add_argument("file", type=str, help="Input .ics file")
+    import_parser.add_argument("--replace", action="store_true", help="Replace previously imported busy blocks")
+    import_parser.set_defaults(func=import_ics)
+
+    # "start" / "stop" commands: Track actual time spent on a task
+    start_parser = subparsers.add_parser("start", help="Start the timer for a task")
+    start_parser.add_argument("id", type=int, help="Task ID")
+    start_parser.set_defaults(func=start_tracking)
+
+    stop_parser = subparsers.add_parser("stop", help="Stop the running timer")
+    stop_parser.set_defaults(func=stop_tracking)
+
+    # "stats" command: Estimate accuracy from tracked time
+    stats_parser = subparsers.add_parser("stats", help="View estimate accuracy from tracked time")
+    stats_parser.set_defaults(func=view_estimate_stats)
+
     # "history" command: View task history
-    history_parser = subparsers.add_parser("history", help="View task history (Coming soon!)")
-    history_parser.set_defaults(func=lambda args: print("⚠ Feature under development. Coming soon!"))
+    history_parser = subparsers.add_parser("history", help="View completed tasks and hours per priority")
+    history_parser.add_argument("--from", dest="start", type=str, help="First day of the range (default: 6 days ago)")
+    history_parser.add_argument("--to", dest="end", type=str, help="Last day of the range (default: today)")
+    history_parser.add_argument("--weekly", action="store_true", help="Show per-week totals instead of per-day")
+    history_parser.set_defaults(func=view_history)
+
+    # "snapshot" command: Enable or disable the binary task snapshot
+    snapshot_parser = subparsers.add_parser("snapshot", help="Build a memory-mapped snapshot of tasks.json for fast loading")
+    snapshot_parser.add_argument("--off", action="store_true", help="Delete the snapshot and read tasks.json directly")
+    snapshot_parser.set_defaults(func=manage_snapshot)
 
     # "schedule" command: View a saved schedule
     schedule_parser = subparsers.add_parser("schedule", help="View last saved schedule (Coming soon!)")
     schedule_parser.set_defaults(func=lambda args: print("⚠ Feature under development. Coming soon!"))
 
+    # "batch" command: Apply many commands in one process
+    batch_parser = subparsers.add_parser("batch", help="Run commands from a file or stdin with one commit")
+    batch_parser.add_argument("file", type=str, nargs="?", default="-", help="Command file ('-' for stdin)")
+    batch_parser.add_argument("--commit-every", type=int, default=0, help="Commit after every N commands (default: once at the end)")
+    batch_parser.add_argument("--yes", action="store_true", help="Answer 'yes' to confirmations such as 'delete all'")
+    batch_parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    batch_parser.set_defaults(func=run_batch)
+
+    # "remind" command: Notify about planned sessions and deadlines
+    remind_parser = subparsers.add_parser("remind", help="Notify when planned sessions start and deadlines approach")
+    remind_parser.add_argument("--hook", type=str, help="Command run for each notification, with the message as last argument")
+    remind_parser.add_argument("--lead", type=int, help=f"Minutes before a deadline to warn (default: {DEADLINE_LEAD_MINUTES})")
+    remind_parser.set_defaults(func=remind)
+
+    # "completion" command: Print a shell completion script
+    completion_parser = subparsers.add_parser("completion", help="Print a bash/zsh/fish completion script")
+    completion_parser.add_argument("shell", choices=["bash", "zsh", "fish"], help="Shell to generate the script for")
+    completion_parser.set_defaults(func=print_completion)
+
+    # "team-add" / "team-remove" / "team-plan" commands: Plan for several people
+    team_add_parser = subparsers.add_parser("team-add", help="Add or update a team member")
+    team_add_parser.add_argument("name", type=str, help="Team member name")
+    team_add_parser.add_argument("--skills", type=str, help="Comma-separated skills matched against task names (e.g. sql,frontend)")
+    team_add_parser.add_argument("--days", type=str, help="Working weekdays for --start/--end (default: mon,tue,wed,thu,fri)")
+    team_add_parser.add_argument("--start", type=int, help="Start of the working day (default: shared work hours)")
+    team_add_parser.add_argument("--end", type=int, help="End of the working day")
+    team_add_parser.add_argument("--focus", type=float, help="Maximum concentration hours per block")
+    team_add_parser.set_defaults(func=add_team_member)
+
+    team_remove_parser = subparsers.add_parser("team-remove", help="Remove a team member")
+    team_remove_parser.add_argument("name", type=str, help="Team member name")
+    team_remove_parser.set_defaults(func=remove_team_member)
+
+    team_plan_parser = subparsers.add_parser("team-plan", help="Distribute tasks across the team and plan everyone's day")
+    team_plan_parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    team_plan_parser.add_argument("--assign", action="store_true", help="Save the chosen assignees on the tasks")
+    team_plan_parser.set_defaults(func=plan_for_team)
+
+    # "undo" command: Revert the last change
+    undo_parser = subparsers.add_parser("undo", help="Revert the last command that changed tasks")
+    undo_parser.set_defaults(func=undo_change)
+
+    # "redo" command: Apply the last undone change again
+    redo_parser = subparsers.add_parser("redo", help="Apply the last undone command again")
+    redo_parser.set_defaults(func=redo_change)
+
+    # "log" command: Show recent changes
+    log_parser = subparsers.add_parser("log", help="Show recent changes to tasks")
+    log_parser.add_argument("--limit", type=int, default=20, help="Number of commands to show (default: 20)")
+    log_parser.set_defaults(func=view_log)
+
+    # "restore" command: View or restore the tasks as of a past time
+    restore_parser = subparsers.add_parser("restore", help="Show the tasks as they were at a past time")
+    restore_parser.add_argument("--at", type=str, required=True, help="Point in time (e.g. '2025-03-03 10:00')")
+    restore_parser.add_argument("--apply", action="store_true", help="Replace the current tasks with that state")
+    restore_parser.set_defaults(func=restore_tasks)
+
+    # "sync" command: Exchange changes with another store
+    sync_parser = subparsers.add_parser("sync", help="Exchange changes with another DevTime store")
+    sync_parser.add_argument("action", choices=["export", "import", "status"], help="What to do")
+    sync_parser.add_argument("file", type=str, nargs="?", help="Bundle file to write or read")
+    sync_parser.add_argument("--peer", type=str, help="Replica ID of the receiving store (export only)")
+    sync_parser.set_defaults(func=sync_store)
+
+    # "serve" command: Read-only JSON endpoints for dashboards
+    serve_parser = subparsers.add_parser("serve", help="Serve tasks, today's plan and the forecast as JSON over HTTP")
+    serve_parser.add_argument("--host", type=str, default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST})")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    serve_parser.set_defaults(func=serve_status)
+
     # "config" command: View or change user settings
     config_parser = subparsers.add_parser("config", help="View or change user settings")
     config_parser.set_defaults(func=view_config)
@@ -557,6 +1629,26 @@ def main():
     work_hours_parser.add_argument("end", type=str, help="End time (ignored if 'none')")
     work_hours_parser.set_defaults(func=update_work_hours)
 
+    # "config-date" command: Override working hours on a specific date
+    date_hours_parser = subparsers.add_parser("config-date", help="Override working hours for a date (holiday, half day)")
+    date_hours_parser.add_argument("date", type=str, help="Date (e.g. '25', '12-25', '2025-12-25')")
+    date_hours_parser.add_argument("start", type=str, help="Start time, 'none' for a day off or 'default' to remove the override")
+    date_hours_parser.add_argument("end", type=str, nargs="?", default=None, help="End time (ignored for 'none'/'default')")
+    date_hours_parser.set_defaults(func=update_date_hours)
+
+    # "busy" command: Block out a one-off interval
+    busy_parser = subparsers.add_parser("busy", help="Add a one-off busy interval (meeting, PTO)")
+    busy_parser.add_argument("start", type=str, help="Start (e.g. '2025-03-03 10:00')")
+    busy_parser.add_argument("end", type=str, help="End (e.g. '2025-03-03 11:30')")
+    busy_parser.add_argument("summary", type=str, nargs="?", default="Busy", help="Description")
+    busy_parser.set_defaults(func=add_busy_block)
+
+    # "config-quota" command: Cap the hours a project gets per day
+    quota_parser = subparsers.add_parser("config-quota", help="Limit the hours a project is planned per day")
+    quota_parser.add_argument("project", type=str, help="Project name")
+    quota_parser.add_argument("hours", type=str, help="Maximum hours per day (or 'none' to remove the quota)")
+    quota_parser.set_defaults(func=update_project_quota)
+
     # Subparsers for updating concentration and break time
     concentration_parser = subparsers.add_parser("config-focus", help="Update concentration time")
     concentration_parser.add_argument("hours", type=float, help="Max concentration hours")
@@ -567,46 +1659,80 @@ def main():
     break_parser.add_argument("minutes", type=int, help="Minimum break time in minutes")
     break_parser.set_defaults(func=update_break)
 
-    args = parser.parse_args()
+    return parser
 
-    if args.command == "add":
-        deadline = None
-        priority = args.priority
+def normalize_add_args(args):
+    """
+    Resolves the flexible deadline/priority positionals of the add command.
 
-        if isinstance(args.deadline, list):
-            args.deadline = [d.strip() for d in args.deadline if d.strip()]
+    Args:
+        args (Namespace): Parsed "add" arguments.
 
-        if args.deadline:
-            if len(args.deadline) == 1:
-                deadline = args.deadline[0]
-            elif len(args.deadline) == 2 and " " not in args.deadline[0]:
-                if ":" in args.deadline[1]:
-                    deadline = f"{args.deadline[0]} {args.deadline[1]}"
-                else:
-                    deadline = f"{args.deadline[0]}"
-                    priority = args.deadline[1]
-            elif len(args.deadline) == 2 and " " in args.deadline[0]:
+    Returns:
+        argparse.Namespace: Arguments for add_task.
+    """
+    deadline = None
+    priority = args.priority
+
+    if isinstance(args.deadline, list):
+        args.deadline = [d.strip() for d in args.deadline if d.strip()]
+
+    if args.deadline:
+        if len(args.deadline) == 1:
+            deadline = args.deadline[0]
+        elif len(args.deadline) == 2 and " " not in args.deadline[0]:
+            if ":" in args.deadline[1]:
+                deadline = f"{args.deadline[0]} {args.deadline[1]}"
+            else:
                 deadline = f"{args.deadline[0]}"
                 priority = args.deadline[1]
-            elif len(args.deadline) > 2:
-                deadline = f"{args.deadline[0]} {args.deadline[1]}"
-                priority = args.deadline[2]
+        elif len(args.deadline) == 2 and " " in args.deadline[0]:
+            deadline = f"{args.deadline[0]}"
+            priority = args.deadline[1]
+        elif len(args.deadline) > 2:
+            deadline = f"{args.deadline[0]} {args.deadline[1]}"
+            priority = args.deadline[2]
+
+    if not deadline:
+        deadline = None
 
-        if not deadline:
-            deadline = None
+    valid_priorities = {"1": "high", "2": "medium", "3": "low"}
+    priority = valid_priorities.get(priority, "medium")
 
-        valid_priorities = {"1": "high", "2": "medium", "3": "low"}
-        priority = valid_priorities.get(priority, "medium")
+    return argparse.Namespace(
+        name=args.name,
+        duration=args.duration,
+        deadline=deadline,
+        priority=priority,
+        repeat=args.repeat,
+        every=args.every,
+        on=args.on,
+        until=args.until,
+        count=args.count,
+        assign=args.assign,
+        tags=args.tags,
+        project=args.project,
+        func=add_task
+    )
 
-        args = argparse.Namespace(
-            name=args.name,
-            duration=args.duration,
-            deadline=deadline,
-            priority=priority,
-            func=add_task
-        )
+def main():
+    """
+    Sets up the CLI interface using argparse and executes the corresponding command.
+    If no command is provided, launches interactive mode.
+    """
+    import sys
+
+    if len(sys.argv) == 1:
+        interactive_mode()
+        return
+
+    args = build_parser().parse_args()
+    command = args.command
+    if command == "add":
+        args = normalize_add_args(args)
 
-    args.func(args)
+    with change_group(command):  # One command is one undoable step
+        args.func(args)
 
 if __name__ == "__main__":
     main()
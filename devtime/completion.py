@@ -0,0 +1,242 @@
+# Runs as a plain script on every TAB press, so it imports only the standard
+# library (json only when the index must be rebuilt) and never the task model.
+import mmap
+import os
+import sys
+
+COMPLETION_FILE = "completion.idx"  # Task IDs and name prefixes for shell completion
+TASKS_FILE = "tasks.json"  # Same file as devtime.storage.TASKS_FILE
+MAGIC = b"devtime-completion 1"
+NAME_PREFIX_CHARS = 40  # Characters of the task name kept in the index
+MAX_RESULTS = 50  # Completions returned per request
+ID_COMMANDS = ("edit", "complete", "delete", "start")  # Commands whose positionals are task IDs
+
+def _clean(name):
+    return " ".join(name.split())[:NAME_PREFIX_CHARS]
+
+def write_completion_index(records, path=COMPLETION_FILE):
+    """
+    Writes the completion index for a list of tasks.
+
+    The file has two sections of sorted lines: "id<TAB>name" ordered by the
+    ID digits and "lowercase name<TAB>id" ordered by name, so a prefix of
+    either is found by a binary search over the mapped file.
+
+    Args:
+        records (iterable): Task objects or task dictionaries with an ID.
+        path (str): Index file to write.
+    """
+    by_id, by_name = [], []
+    for record in records:
+        task_id = record["id"] if isinstance(record, dict) else record.id
+        name = _clean(record["name"] if isinstance(record, dict) else record.name)
+        if task_id is None:
+            continue
+        by_id.append(f"{task_id}\t{name}\n".encode("utf-8"))
+        by_name.append(f"{name.lower()}\t{task_id}\n".encode("utf-8"))
+    by_id.sort()
+    by_name.sort()
+    id_section = b"".join(by_id)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + b" %d\n" % len(id_section))
+        f.write(id_section)
+        f.writelines(by_name)
+    os.replace(tmp_path, path)
+
+def _first_at_least(data, lo, hi, prefix):
+    # Offset of the first line in data[lo:hi] (sorted lines) that is >= prefix
+    left, right = lo, hi
+    while left < right:
+        mid = (left + right) // 2
+        start = data.rfind(b"\n", lo, mid) + 1 or lo
+        end = data.find(b"\n", start, hi)
+        if data[start:end] < prefix:
+            left = end + 1
+        else:
+            right = start
+    return left
+
+def _scan(data, lo, hi, prefix, limit):
+    # Lines of data[lo:hi] starting with prefix, in order, at most `limit`
+    pos = _first_at_least(data, lo, hi, prefix)
+    lines = []
+    while pos < hi and len(lines) < limit:
+        end = data.find(b"\n", pos, hi)
+        line = data[pos:end]
+        if not line.startswith(prefix):
+            break
+        lines.append(line.decode("utf-8"))
+        pos = end + 1
+    return lines
+
+def _is_stale(path, source_path):
+    try:
+        return os.stat(path).st_mtime_ns < os.stat(source_path).st_mtime_ns
+    except FileNotFoundError:
+        return os.path.exists(source_path)
+
+def lookup(prefix, path=COMPLETION_FILE, source_path=TASKS_FILE, limit=MAX_RESULTS):
+    """
+    Returns the tasks whose ID or name starts with a prefix.
+
+    A missing or outdated index (tasks.json edited by hand) is rebuilt from
+    tasks.json with the plain json module first.
+
+    Args:
+        prefix (str): Typed text. Digits match IDs; anything else matches names, case-insensitively.
+        path (str): Completion index file.
+        source_path (str): The tasks JSON file.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list[tuple]: (id, name) pairs.
+    """
+    if _is_stale(path, source_path):
+        import json
+        try:
+            with open(source_path, "r") as f:
+                write_completion_index(json.load(f), path)
+        except (OSError, ValueError, KeyError):
+            return []
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header_end = data.find(b"\n")
+            magic, _, id_bytes = data[:header_end].rpartition(b" ")
+            if magic != MAGIC:
+                return []
+            id_start = header_end + 1
+            id_end = id_start + int(id_bytes)
+            if not prefix or prefix.isdigit():
+                lines = _scan(data, id_start, id_end, prefix.encode("utf-8"), limit)
+                return [tuple(line.split("\t", 1)) for line in lines]
+            lines = _scan(data, id_end, len(data), prefix.lower().encode("utf-8"), limit)
+            return [tuple(reversed(line.rsplit("\t", 1))) for line in lines]
+
+def _command_table(parser):
+    # [(command, help, [option strings])] from the argparse parser
+    commands = []
+    for action in parser._actions:
+        if hasattr(action, "choices") and isinstance(action.choices, dict):
+            helps = {choice.dest: choice.help or "" for choice in action._choices_actions}
+            for name, subparser in action.choices.items():
+                options = [option for sub_action in subparser._actions for option in sub_action.option_strings
+                           if option.startswith("--")]
+                commands.append((name, helps.get(name, ""), options))
+    return commands
+
+def _bash_script(commands, runner):
+    cases = "\n".join(f'        {name}) COMPREPLY=($(compgen -W "{" ".join(options)}" -- "$cur")) ;;'
+                      for name, _, options in commands if options)
+    return f"""# DevTime bash completion. Load with: source <(devtime completion bash)
+_devtime() {{
+    local cur="${{COMP_WORDS[COMP_CWORD]}}" cmd="${{COMP_WORDS[1]}}"
+    if [ "$COMP_CWORD" -eq 1 ]; then
+        COMPREPLY=($(compgen -W "{" ".join(name for name, _, _ in commands)}" -- "$cur"))
+        return
+    fi
+    if [[ "$cur" == -* ]]; then
+        case "$cmd" in
+{cases}
+        esac
+        return
+    fi
+    case "$cmd" in
+        {"|".join(ID_COMMANDS)})
+            local IFS=$'\\n'
+            COMPREPLY=($({runner} query "$cur" 2>/dev/null))
+            ;;
+    esac
+}}
+complete -F _devtime devtime
+"""
+
+def _zsh_script(commands, runner):
+    described = "\n".join("        '{}:{}'".format(name, help_text.replace("'", "'\\''"))
+                          for name, help_text, _ in commands)
+    cases = "\n".join(f"        {name}) compadd -- {' '.join(options)} ;;" for name, _, options in commands if options)
+    return f"""#compdef devtime
+# DevTime zsh completion. Load with: source <(devtime completion zsh)
+_devtime() {{
+    local -a commands lines ids display
+    if (( CURRENT == 2 )); then
+        commands=(
+{described}
+        )
+        _describe 'command' commands
+        return
+    fi
+    if [[ "$PREFIX" == -* ]]; then
+        case "$words[2]" in
+{cases}
+        esac
+        return
+    fi
+    case "$words[2]" in
+        {"|".join(ID_COMMANDS)})
+            lines=("${{(@f)$({runner} query --describe "$PREFIX" 2>/dev/null)}}")
+            ids=(${{lines%%$'\\t'*}})
+            display=(${{lines/$'\\t'/  -- }})
+            compadd -U -l -d display -a ids
+            ;;
+    esac
+}}
+compdef _devtime devtime
+"""
+
+def _fish_script(commands, runner):
+    def quote(text):
+        return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    lines = ["# DevTime fish completion. Load with: devtime completion fish | source", "complete -c devtime -f"]
+    for name, help_text, options in commands:
+        lines.append(f"complete -c devtime -n __fish_use_subcommand -a {name} -d {quote(help_text)}")
+        for option in options:
+            lines.append(f"complete -c devtime -n '__fish_seen_subcommand_from {name}' -l {option[2:]}")
+    lines.append(f"complete -c devtime -n '__fish_seen_subcommand_from {' '.join(ID_COMMANDS)}' "
+                 f"-a '({runner} query --describe (commandline -ct) 2>/dev/null)'")
+    return "\n".join(lines) + "\n"
+
+SHELLS = {"bash": _bash_script, "zsh": _zsh_script, "fish": _fish_script}
+
+def completion_script(shell, parser, python=None):
+    """
+    Generates the completion script for a shell.
+
+    Command names and options are taken from the parser once, at generation
+    time; task IDs are looked up through the index on every TAB press.
+
+    Args:
+        shell (str): "bash", "zsh" or "fish".
+        parser (argparse.ArgumentParser): The DevTime parser.
+        python (str, optional): Interpreter the script calls (with -S, as the
+            lookup needs only the standard library). Defaults to the current one.
+
+    Returns:
+        str: The script.
+    """
+    runner = f'"{python or sys.executable}" -S "{os.path.abspath(__file__)}"'
+    return SHELLS[shell](_command_table(parser), runner)
+
+def main(argv=None):
+    """Entry point for `python devtime/completion.py query [--describe] [PREFIX]`."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "query":
+        print("usage: completion.py query [--describe] [PREFIX]", file=sys.stderr)
+        return 2
+    argv = argv[1:]
+    describe = bool(argv) and argv[0] == "--describe"
+    if describe:
+        argv = argv[1:]
+    for task_id, name in lookup(argv[0] if argv else ""):
+        print(f"{task_id}\t{name}" if describe else task_id)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
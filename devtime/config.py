@@ -14,7 +14,10 @@ DEFAULT_CONFIG = {
         "Sunday": {"start": None, "end": None}
     },
     "max_concentration_hours": 2.0,
-    "min_break_minutes": 10
+    "min_break_minutes": 10,
+    "compress_history": False,
+    "apply_time_corrections": False,
+    "session_flush_seconds": 5.0
 }
 
 def load_config():
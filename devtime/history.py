@@ -0,0 +1,344 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+from devtime.storage import (
+    COMPLETED_TASKS_FILE, task_to_dict, dict_to_task, load_completed_tasks, load_tasks,
+    get_active_session
+)
+from devtime.changelog import ensure_started, record
+from devtime.jsonstream import iter_json_lines, select_records
+
+HISTORY_DIR = "history"  # Directory holding month-partitioned completed-task archives
+ROLLUPS_FILE = "rollups.json"  # Per-day and per-week hour totals, stored inside HISTORY_DIR
+
+def partition_key(moment):
+    """Returns the "YYYY-MM" partition a completion timestamp belongs to."""
+    return moment.strftime("%Y-%m")
+
+def week_key(moment):
+    """Returns the ISO week ("YYYY-Www") a completion timestamp belongs to."""
+    return moment.strftime("%G-W%V")
+
+def _partition_paths(key):
+    base = os.path.join(HISTORY_DIR, f"completed-{key}.jsonl")
+    return base, base + ".gz"
+
+def _open_partition(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def _temp_path(path):
+    # Keeps the ".gz" suffix, so the rewrite uses the same compression as the partition
+    stem, suffix = os.path.splitext(path)
+    return f"{stem}.tmp{suffix}"
+
+def list_partitions():
+    """
+    Lists the archived partitions on disk.
+
+    Returns:
+        list[str]: Sorted "YYYY-MM" partition keys.
+    """
+    if not os.path.isdir(HISTORY_DIR):
+        return []
+    keys = set()
+    for name in os.listdir(HISTORY_DIR):
+        if name.startswith("completed-") and (name.endswith(".jsonl") or name.endswith(".jsonl.gz")):
+            keys.add(name[len("completed-"):len("completed-") + 7])
+    return sorted(keys)
+
+def load_rollups():
+    """
+    Loads the precomputed rollups.
+
+    Returns:
+        dict: {"daily": {day: {priority: hours}}, "weekly": {week: {priority: hours}}}
+    """
+    try:
+        with open(os.path.join(HISTORY_DIR, ROLLUPS_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"daily": {}, "weekly": {}}
+
+def save_rollups(rollups):
+    """Saves the rollups atomically."""
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    path = os.path.join(HISTORY_DIR, ROLLUPS_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(rollups, f, indent=4, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def _add_to_rollups(rollups, record, sign=1):
+    completed_at = datetime.strptime(record["completed_at"], "%Y-%m-%d %H:%M")
+    hours = sign * float(record["duration"])
+    for bucket, key in (("daily", completed_at.strftime("%Y-%m-%d")), ("weekly", week_key(completed_at))):
+        totals = rollups[bucket].setdefault(key, {})
+        totals[record["priority"]] = round(totals.get(record["priority"], 0) + hours, 4)
+        if all(abs(value) < 1e-9 for value in totals.values()):
+            del rollups[bucket][key]
+
+def archive_completed(tasks, completed_at=None, compress=False):
+    """
+    Appends completed tasks to their month partition and updates the rollups.
+
+    Only the current partition is opened (in append mode); earlier history is
+    never read. While a session is active the tasks are buffered in memory
+    and written when the session flushes.
+
+    Args:
+        tasks (list[Task]): Tasks that were just completed.
+        completed_at (datetime, optional): Completion time. Defaults to now.
+        compress (bool): Create new partitions gzip-compressed.
+    """
+    if not tasks:
+        return
+    completed_at = completed_at or datetime.now()
+    session = get_active_session()
+    if session is not None:
+        session.archive(tasks, completed_at, compress)
+        return
+    write_archive(tasks, completed_at, compress)
+    ensure_started(lambda: [task_to_dict(task) for task in load_tasks()])
+    record([], [task_to_dict(task) for task in tasks], completed_at)
+
+def write_archive(tasks, completed_at, compress=False, journal_tags=None):
+    """
+    Appends completed tasks to their month partition, bypassing any active session.
+
+    Args:
+        tasks (list[Task]): Tasks that were completed.
+        completed_at (datetime): Completion time.
+        compress (bool): Create new partitions gzip-compressed.
+        journal_tags (list[str], optional): Session journal entry of each task, stored
+            on its record so a replayed journal does not archive it twice (see journal_tags_in).
+    """
+    migrate_legacy_completed()
+    _append_archive(tasks, completed_at, compress, journal_tags)
+
+def journal_tags_in(completed_at):
+    """
+    Returns the session journal tags stored in the partition of a completion time.
+
+    Args:
+        completed_at (datetime): Completion time.
+
+    Returns:
+        set[str]: Tags of the records written by journaled sessions.
+    """
+    return {record["journal"] for record in _read_partition(partition_key(completed_at)) if "journal" in record}
+
+def _append_archive(tasks, completed_at, compress=False, journal_tags=None):
+    plain_path, gz_path = _partition_paths(partition_key(completed_at))
+    if os.path.exists(gz_path) or (compress and not os.path.exists(plain_path)):
+        path = gz_path
+    else:
+        path = plain_path
+
+    rollups = load_rollups()
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    with _open_partition(path, "a") as f:
+        for i, task in enumerate(tasks):
+            record = task_to_dict(task)
+            record["completed_at"] = completed_at.strftime("%Y-%m-%d %H:%M")
+            if journal_tags:
+                record["journal"] = journal_tags[i]
+            f.write(json.dumps(record) + "\n")
+            _add_to_rollups(rollups, record)
+    save_rollups(rollups)
+
+def _read_partition(key):
+    for path in _partition_paths(key):
+        if os.path.exists(path):
+            with _open_partition(path, "r") as f:
+                yield from iter_json_lines(f)
+
+def iter_history(start=None, end=None):
+    """
+    Yields archived records whose completion date falls in [start, end].
+
+    Only partitions overlapping the range are opened.
+
+    Args:
+        start (date, optional): First day of the range. Unbounded if omitted.
+        end (date, optional): Last day of the range. Unbounded if omitted.
+
+    Yields:
+        dict: Task dictionary with an extra "completed_at" field.
+    """
+    _flush_session()
+    migrate_legacy_completed()
+    keys = list_partitions()
+    if start is not None:
+        keys = [k for k in keys if k >= partition_key(start)]
+    if end is not None:
+        keys = [k for k in keys if k <= partition_key(end)]
+
+    start_str = start.strftime("%Y-%m-%d") if start else None
+    end_str = end.strftime("%Y-%m-%d") if end else None
+    for key in keys:
+        for record in _read_partition(key):
+            day = record["completed_at"][:10]
+            if (start_str is None or day >= start_str) and (end_str is None or day <= end_str):
+                yield record
+
+def iter_completed(start=None, end=None, where=None, fields=None):
+    """
+    Yields archived completed tasks in a date range, in constant memory.
+
+    Args:
+        start (date, optional): First day of the range. Unbounded if omitted.
+        end (date, optional): Last day of the range. Unbounded if omitted.
+        where (callable, optional): Predicate on the raw record (including "completed_at").
+            Records it rejects are never turned into Task objects.
+        fields (list[str], optional): Yield dictionaries with only these keys instead of Task objects.
+
+    Yields:
+        Task or dict: Matching completed tasks.
+    """
+    yield from select_records(iter_history(start, end), where, fields, dict_to_task)
+
+def load_history(start=None, end=None):
+    """
+    Loads archived completed tasks in a date range as Task objects.
+
+    Returns:
+        list[Task]: Completed tasks.
+    """
+    return [dict_to_task(record) for record in iter_history(start, end)]
+
+def summarize_rollups(start, end, weekly=False):
+    """
+    Sums the precomputed hours per priority over a date range.
+
+    Args:
+        start (date): First day of the range.
+        end (date): Last day of the range.
+        weekly (bool): Return per-ISO-week rows instead of per-day rows.
+
+    Returns:
+        list[tuple]: (period, {priority: hours}) rows in chronological order.
+    """
+    _flush_session()
+    rollups = load_rollups()
+    if weekly:
+        first, last = week_key(start), week_key(end)
+        return sorted((k, v) for k, v in rollups["weekly"].items() if first <= k <= last)
+    first, last = start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+    return sorted((k, v) for k, v in rollups["daily"].items() if first <= k <= last)
+
+def delete_archived(task_ids):
+    """
+    Removes tasks from the archive and subtracts them from the rollups.
+
+    The removed records are written to the change log first, so the
+    deletion can be undone.
+
+    Args:
+        task_ids (set[int]): IDs of completed tasks to remove.
+
+    Returns:
+        list[dict]: The removed records.
+    """
+    return _delete_where(lambda record: record.get("id") in task_ids)
+
+def delete_archived_records(records):
+    """
+    Removes specific completions from the archive and subtracts them from the rollups.
+
+    Occurrences of a recurring series share the series' ID, so a record is
+    identified by its ID, occurrence and completion time.
+
+    Args:
+        records (list[dict]): Archived task dictionaries with "completed_at".
+
+    Returns:
+        list[dict]: The removed records.
+    """
+    keys = {(record["id"], record.get("occurrence"), record["completed_at"]) for record in records}
+    return _delete_where(lambda record: (record.get("id"), record.get("occurrence"), record["completed_at"]) in keys)
+
+def _log_removed(records):
+    # Written before the archive changes, so undo can put the records back
+    ensure_started(lambda: [task_to_dict(task) for task in load_tasks()])
+    record([], unarchived=records)
+
+def _delete_where(match):
+    _flush_session()
+    migrate_legacy_completed()
+    rewrites, removed = [], []
+    for key in list_partitions():
+        for path in _partition_paths(key):
+            if not os.path.exists(path):
+                continue
+            with _open_partition(path, "r") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+            kept = [r for r in records if not match(r)]
+            if len(kept) < len(records):
+                removed.extend(r for r in records if match(r))
+                rewrites.append((path, kept))
+    if not removed:
+        return []
+
+    _log_removed(removed)
+    rollups = load_rollups()
+    for record in removed:
+        _add_to_rollups(rollups, record, sign=-1)
+    for path, kept in rewrites:
+        if kept:
+            temp_path = _temp_path(path)
+            with _open_partition(temp_path, "w") as f:
+                for record in kept:
+                    f.write(json.dumps(record) + "\n")
+            os.replace(temp_path, path)
+        else:
+            os.remove(path)
+    save_rollups(rollups)
+    return removed
+
+def clear_history():
+    """
+    Deletes every archived partition and the rollups.
+
+    The archived records are written to the change log first, so the
+    deletion can be undone.
+
+    Returns:
+        int: Number of removed records.
+    """
+    records = list(iter_history())  # Also flushes the session and migrates the legacy file
+    if records:
+        _log_removed(records)
+    if os.path.isdir(HISTORY_DIR):
+        for name in os.listdir(HISTORY_DIR):
+            os.remove(os.path.join(HISTORY_DIR, name))
+    if os.path.exists(COMPLETED_TASKS_FILE):
+        os.remove(COMPLETED_TASKS_FILE)
+    return len(records)
+
+def _flush_session():
+    # Buffered completions must reach the partitions before they are read or rewritten
+    session = get_active_session()
+    if session is not None:
+        session.flush()
+
+def migrate_legacy_completed():
+    """
+    Moves tasks from the legacy completed_tasks.json into the archive.
+
+    The legacy file has no completion timestamps, so its modification time is
+    used. It is removed only after the archive has been written.
+    """
+    if not os.path.exists(COMPLETED_TASKS_FILE):
+        return
+    tasks = load_completed_tasks()
+    completed_at = datetime.fromtimestamp(os.path.getmtime(COMPLETED_TASKS_FILE)).replace(second=0, microsecond=0)
+    _append_archive(tasks, completed_at)
+    os.remove(COMPLETED_TASKS_FILE)
+
+def default_range(days=7):
+    """Returns (start, end) dates covering the last given number of days."""
+    end = datetime.now().date()
+    return end - timedelta(days=days - 1), end
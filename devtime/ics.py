@@ -0,0 +1,231 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+from devtime.scheduler import Task
+from devtime.intervals import IntervalTree
+
+PRODID = "-//DevTime//DevTime Planner//EN"
+
+def escape_text(value):
+    """Escapes a TEXT property value as required by RFC 5545 section 3.3.11."""
+    return (value.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+def fold_line(line):
+    """
+    Folds a content line to at most 75 octets per physical line (RFC 5545 section 3.1).
+
+    Args:
+        line (str): Unfolded content line without the trailing CRLF.
+
+    Returns:
+        str: Folded line terminated by CRLF.
+    """
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    chunks = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1  # Never split a multi-byte UTF-8 sequence
+        chunks.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # Continuation lines start with a space
+    return "\r\n ".join(chunks) + "\r\n"
+
+def _format_local(moment):
+    return moment.strftime("%Y%m%dT%H%M%S")
+
+def _hours_to_datetime(day, hours):
+    return datetime.strptime(day, "%Y-%m-%d") + timedelta(minutes=round(hours * 60))
+
+def iter_plan_events(schedule_plan, include_breaks=False, stamp=None):
+    """
+    Yields the content lines of the VEVENTs for a plan, one entry at a time.
+
+    Args:
+        schedule_plan (dict): Mapping of "YYYY-MM-DD" to (item, start, end) entries.
+        include_breaks (bool): Also emit events for breaks.
+        stamp (datetime, optional): DTSTAMP value (UTC). Defaults to now.
+
+    Yields:
+        str: Folded content lines.
+    """
+    stamp = (stamp or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    for day in sorted(schedule_plan):
+        for index, (item, start, end) in enumerate(schedule_plan[day]):
+            is_task = isinstance(item, Task)
+            if not is_task and not include_breaks:
+                continue
+            summary = item.name if is_task else str(item)
+            uid = f"{day.replace('-', '')}-{index}-{item.id if is_task else 'break'}@devtime"
+            lines = [
+                "BEGIN:VEVENT",
+                f"UID:{uid}",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{_format_local(_hours_to_datetime(day, start))}",
+                f"DTEND:{_format_local(_hours_to_datetime(day, end))}",
+                f"SUMMARY:{escape_text(summary)}",
+            ]
+            if is_task:
+                lines.append(f"DESCRIPTION:{escape_text(f'DevTime task {item.id} ({item.priority} priority)')}")
+                lines.append("CATEGORIES:DEVTIME")
+            else:
+                lines.append("TRANSP:TRANSPARENT")
+            lines.append("END:VEVENT")
+            for line in lines:
+                yield fold_line(line)
+
+def write_plan_ics(schedule_plan, stream, include_breaks=False):
+    """
+    Streams a plan into an iCalendar document.
+
+    Events are written as they are generated, so the document is never held
+    in memory as a whole.
+
+    Args:
+        schedule_plan (dict): Mapping of "YYYY-MM-DD" to (item, start, end) entries.
+        stream (file): Text stream opened with newline="" (CRLF is written explicitly).
+        include_breaks (bool): Also emit events for breaks.
+
+    Returns:
+        int: Number of events written.
+    """
+    count = 0
+    for line in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN"):
+        stream.write(fold_line(line))
+    for line in iter_plan_events(schedule_plan, include_breaks):
+        if line.startswith("BEGIN:VEVENT"):
+            count += 1
+        stream.write(line)
+    stream.write(fold_line("END:VCALENDAR"))
+    return count
+
+def iter_unfolded_lines(stream):
+    """
+    Unfolds iCalendar content lines from a text stream lazily.
+
+    Yields:
+        str: Logical content lines without line terminators.
+    """
+    current = None
+    for raw in stream:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+def _split_property(line):
+    name_part, _, value = line.partition(":")
+    name, *params = name_part.split(";")
+    return name.upper(), dict(p.split("=", 1) for p in params if "=" in p), value
+
+_DURATION_RE = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+def parse_duration(value):
+    """Parses an RFC 5545 DURATION value into a timedelta."""
+    match = _DURATION_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid duration: '{value}'.")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    delta = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                      minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
+
+def parse_ics_datetime(value, params):
+    """
+    Parses a DATE or DATE-TIME value into a naive local datetime.
+
+    UTC values are converted to local time; TZID-qualified values are treated
+    as local (floating) time.
+
+    Returns:
+        tuple: (datetime, is_all_day)
+    """
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d"), True
+    if value.endswith("Z"):
+        utc = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        return utc.astimezone().replace(tzinfo=None), False
+    return datetime.strptime(value, "%Y%m%dT%H%M%S"), False
+
+def iter_busy_blocks(stream):
+    """
+    Streams busy (start, end, summary) blocks out of an iCalendar document.
+
+    Transparent and cancelled events are skipped. Recurrence rules are not
+    expanded; only the first occurrence of a recurring event is returned.
+
+    Args:
+        stream (file): Text stream of the .ics document.
+
+    Yields:
+        tuple: (start datetime, end datetime, summary)
+    """
+    event = None
+    depth = 0  # Sub-components (e.g. VALARM) open inside the current event
+    for line in iter_unfolded_lines(stream):
+        upper = line.upper()
+        if event is None:
+            if upper == "BEGIN:VEVENT":
+                event = {}
+            continue
+        if upper.startswith("BEGIN:"):
+            depth += 1
+            continue
+        if upper.startswith("END:") and depth:
+            depth -= 1
+            continue
+        if upper == "END:VEVENT":
+            block = _event_to_block(event)
+            if block is not None:
+                yield block
+            event = None
+            continue
+        if depth:
+            continue  # Alarm properties must not override the event's own
+        name, params, value = _split_property(line)
+        event[name] = (params, value)
+
+def _event_to_block(event):
+    if "DTSTART" not in event:
+        return None
+    if event.get("TRANSP", ({}, ""))[1].upper() == "TRANSPARENT":
+        return None
+    if event.get("STATUS", ({}, ""))[1].upper() == "CANCELLED":
+        return None
+
+    start, all_day = parse_ics_datetime(event["DTSTART"][1], event["DTSTART"][0])
+    if "DTEND" in event:
+        end, _ = parse_ics_datetime(event["DTEND"][1], event["DTEND"][0])
+    elif "DURATION" in event:
+        end = start + parse_duration(event["DURATION"][1])
+    else:
+        end = start + (timedelta(days=1) if all_day else timedelta(0))
+
+    summary = event.get("SUMMARY", ({}, ""))[1].replace("\\,", ",").replace("\\;", ";").replace("\\n", "\n")
+    if end <= start:
+        return None
+    return start, end, summary
+
+def load_busy_tree(path):
+    """
+    Builds an IntervalTree of busy blocks from an .ics file.
+
+    Args:
+        path (str): Path to the .ics file.
+
+    Returns:
+        IntervalTree: Busy blocks keyed by local datetimes.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return IntervalTree(iter_busy_blocks(f))
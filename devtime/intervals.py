@@ -0,0 +1,123 @@
+import hashlib
+
+class IntervalTree:
+    """
+    Static augmented interval tree over half-open [start, end) intervals.
+
+    Intervals are kept sorted by start and viewed as an implicit balanced
+    binary search tree (the middle element of every index range is the root
+    of that range). Each node stores the maximum end of its subtree, so
+    overlap queries run in O(log n + k). Inserts mark the tree dirty and it
+    is rebuilt in O(n log n) on the next query, which suits calendars that
+    are loaded in bulk and queried many times.
+    """
+
+    def __init__(self, intervals=()):
+        """
+        Initialize an IntervalTree instance.
+
+        Args:
+            intervals (iterable): (start, end, data) tuples. Start and end may be
+                any mutually comparable values (datetimes, numbers).
+        """
+        self._items = [tuple(item) for item in intervals if item[0] < item[1]]
+        self._max_end = []
+        self._dirty = True
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, start, end, data=None):
+        """Adds an interval; empty intervals are ignored."""
+        if start < end:
+            self._items.append((start, end, data))
+            self._dirty = True
+
+    def _build(self):
+        self._items.sort(key=lambda item: (item[0], item[1]))
+        self._max_end = [None] * len(self._items)
+        self._fill(0, len(self._items))
+        self._dirty = False
+
+    def _fill(self, lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        best = self._items[mid][1]
+        for child in (self._fill(lo, mid), self._fill(mid + 1, hi)):
+            if child is not None and child > best:
+                best = child
+        self._max_end[mid] = best
+        return best
+
+    def overlap(self, start, end):
+        """
+        Returns intervals overlapping [start, end), ordered by start.
+
+        Args:
+            start: Query start.
+            end: Query end.
+
+        Returns:
+            list[tuple]: Overlapping (start, end, data) tuples.
+        """
+        if self._dirty:
+            self._build()
+        result = []
+        self._query(0, len(self._items), start, end, result)
+        return result
+
+    def _query(self, lo, hi, start, end, result):
+        # In-order walk that prunes subtrees ending before `start` and
+        # everything to the right of the first node starting at or after `end`
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._max_end[mid] <= start:
+                return
+            self._query(lo, mid, start, end, result)
+            item = self._items[mid]
+            if item[0] >= end:
+                return
+            if item[1] > start:
+                result.append(item)
+            lo = mid + 1
+
+    def overlaps(self, start, end):
+        """Checks whether any interval overlaps [start, end)."""
+        return bool(self.overlap(start, end))
+
+    def digest(self):
+        """Returns a stable digest of the stored intervals, e.g. for cache keys."""
+        if self._dirty:
+            self._build()
+        h = hashlib.sha256()
+        for item_start, item_end, _ in self._items:
+            h.update(f"{item_start}|{item_end};".encode("utf-8"))
+        return h.hexdigest()
+
+def subtract_intervals(start, end, busy):
+    """
+    Removes busy intervals from [start, end).
+
+    Args:
+        start: Start of the free range.
+        end: End of the free range.
+        busy (list[tuple]): (start, end, ...) intervals sorted by start.
+
+    Returns:
+        list[tuple]: Remaining free (start, end) pieces.
+    """
+    free = []
+    cursor = start
+    for item in busy:
+        busy_start, busy_end = item[0], item[1]
+        if busy_end <= cursor:
+            continue
+        if busy_start >= end:
+            break
+        if busy_start > cursor:
+            free.append((cursor, busy_start))
+        cursor = max(cursor, busy_end)
+    if cursor < end:
+        free.append((cursor, end))
+    return free
@@ -0,0 +1,113 @@
+import json
+import re
+
+CHUNK_SIZE = 1 << 16  # Characters read from the stream at a time
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = frozenset(" \t\n\r,]")
+
+def iter_json_array(stream, chunk_size=CHUNK_SIZE):
+    """
+    Yields the elements of a top-level JSON array from a text stream.
+
+    The stream is read in chunks and each element is decoded as soon as it
+    is complete, so memory is bounded by the chunk size plus the largest
+    single element, not by the size of the document. An empty document
+    yields nothing.
+
+    Args:
+        stream (file): Text stream positioned at the start of the document.
+        chunk_size (int): Characters to read at a time.
+
+    Yields:
+        object: Decoded array elements, in order.
+
+    Raises:
+        json.JSONDecodeError: If the document is not a well-formed array.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    state = "start"  # start -> first -> (value -> next)* -> done
+
+    while True:
+        if not eof and len(buffer) - pos < chunk_size:
+            chunk = stream.read(chunk_size)
+            if chunk:
+                buffer, pos = buffer[pos:] + chunk, 0
+            else:
+                eof = True
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if not eof:
+                continue
+            if state == "start":
+                return
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+
+        char = buffer[pos]
+        if state == "start":
+            if char != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            pos += 1
+            state = "first"
+        elif char == "]" and state in ("first", "next"):
+            return
+        elif state == "next":
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            state = "value"
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                value, end = None, None
+            if end is None or (not eof and (end == len(buffer) or buffer[end] not in _DELIMITERS)):
+                # The element may continue past the buffer ("-0" of "-0.5"): read more and retry
+                chunk = stream.read(chunk_size)
+                if chunk:
+                    buffer += chunk
+                else:
+                    eof = True
+                continue
+            yield value
+            pos = end
+            state = "next"
+
+def iter_json_lines(stream):
+    """
+    Yields the records of a JSON Lines stream, skipping blank lines.
+
+    Args:
+        stream (file): Text stream with one JSON document per line.
+
+    Yields:
+        object: Decoded records, in order.
+    """
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+def select_records(records, where=None, fields=None, convert=None):
+    """
+    Applies filter and projection pushdown to a stream of raw records.
+
+    Args:
+        records (iterable[dict]): Raw decoded records.
+        where (callable, optional): Predicate on the raw record; rejected records are skipped before conversion.
+        fields (list[str], optional): Yield dictionaries with only these keys (missing keys become None).
+        convert (callable, optional): Applied to each kept record when no fields are requested.
+
+    Yields:
+        object: Selected records.
+    """
+    for record in records:
+        if where is not None and not where(record):
+            continue
+        if fields is not None:
+            yield {field: record.get(field) for field in fields}
+        elif convert is not None:
+            yield convert(record)
+        else:
+            yield record
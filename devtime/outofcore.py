@@ -0,0 +1,185 @@
+import heapq
+import json
+import os
+import tempfile
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import islice
+
+from devtime.availability import Availability
+from devtime.config import load_config
+from devtime.jsonstream import iter_json_lines
+from devtime.scheduler import (Task, PLANNING_HORIZON_DAYS, build_day_blocks, fill_day, correction_factor,
+                               expand_occurrences)
+from devtime.storage import dict_to_task, task_to_dict
+
+RUN_SIZE = 100_000  # Records sorted in memory per on-disk run
+MAX_FAN_IN = 64  # Runs merged at once; more runs are merged in several passes
+WINDOW_SIZE = 1_000  # Tasks the scheduler holds in memory at a time
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+def task_sort_key(record):
+    """
+    Sort key for raw task dictionaries: earliest deadline first, then priority.
+
+    Tasks without a deadline come last; the ID breaks ties so the order is stable.
+    """
+    deadline = record.get("deadline") or "9999-12-31 23:59"
+    return deadline.replace("T", " "), PRIORITY_RANK.get(record.get("priority"), 1), record.get("id") or 0
+
+def _write_run(records, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+def _merge_runs(paths, key):
+    files = [open(path, "r", encoding="utf-8") for path in paths]
+    try:
+        yield from heapq.merge(*(iter_json_lines(f) for f in files), key=key)
+    finally:
+        for f in files:
+            f.close()
+
+def external_sort(records, key=task_sort_key, run_size=RUN_SIZE, tmp_dir=None):
+    """
+    Sorts a stream of JSON-serializable records that may not fit in memory.
+
+    Records are cut into runs of `run_size`, each run is sorted in memory
+    and spilled to a temporary JSONL file, and the runs are merged lazily.
+    At most `run_size` records (while splitting) or one record per run
+    (while merging) are held in memory. The temporary files are removed
+    when the generator is exhausted or closed.
+
+    Args:
+        records (iterable[dict]): Records to sort.
+        key (callable): Sort key.
+        run_size (int): Records per in-memory run.
+        tmp_dir (str, optional): Directory for the runs. Defaults to the system temp dir.
+
+    Yields:
+        dict: Records in sorted order.
+    """
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix="devtime-sort-") as run_dir:
+        paths = []
+        records = iter(records)
+        while True:
+            run = list(islice(records, run_size))
+            if not run:
+                break
+            run.sort(key=key)
+            paths.append(os.path.join(run_dir, f"run-{len(paths):06d}.jsonl"))
+            _write_run(run, paths[-1])
+
+        generation = 0
+        while len(paths) > MAX_FAN_IN:
+            merged = []
+            for i in range(0, len(paths), MAX_FAN_IN):
+                group = paths[i:i + MAX_FAN_IN]
+                merged.append(os.path.join(run_dir, f"merge{generation}-{len(merged):06d}.jsonl"))
+                _write_run(_merge_runs(group, key), merged[-1])
+                for path in group:
+                    os.remove(path)
+            paths = merged
+            generation += 1
+
+        yield from _merge_runs(paths, key)
+
+def _expand_records(records, start, end):
+    # Recurring series become one record per open occurrence in [start, end]
+    for record in records:
+        if not record.get("recurrence") or not record.get("deadline"):
+            yield record
+            continue
+        for occurrence in expand_occurrences([dict_to_task(record)], start, end):
+            yield task_to_dict(occurrence)
+
+def _entry_to_dict(item, start, end):
+    if isinstance(item, Task):
+        entry = {"id": item.id, "name": item.name, "start": round(start, 4), "end": round(end, 4)}
+        if item.occurrence:
+            entry["occurrence"] = item.occurrence
+        return entry
+    return {"break": True, "start": round(start, 4), "end": round(end, 4)}
+
+def stream_plan(records, out, config=None, now=None, corrections=None, availability=None,
+                max_days=None, window_size=WINDOW_SIZE, run_size=RUN_SIZE, tmp_dir=None):
+    """
+    Plans a task store larger than memory and writes the plan day by day.
+
+    Tasks are externally sorted by (deadline, priority) and fed to the same
+    day-filling logic as plan_tasks through a window of at most
+    `window_size` tasks. Recurring series (records need their "recurrence")
+    are expanded into their occurrences within the planned days first, and
+    each occurrence waits for its own day. Each planned day is written to `out` as one JSON
+    line, {"date": "YYYY-MM-DD", "entries": [...]}, as soon as it is complete.
+
+    Args:
+        records (iterable[dict]): Raw task dictionaries, e.g. storage.iter_tasks(fields=[...]).
+        out (file): Text stream the plan lines are written to.
+        config (dict, optional): Configuration to plan with. Read from disk if omitted.
+        now (datetime, optional): Planning start time. Defaults to the current time.
+        corrections (dict, optional): Learned duration correction factors.
+        availability (Availability, optional): Date overrides and busy blocks. Built from config if omitted.
+        max_days (int, optional): Calendar days to plan. Defaults to the horizon of the
+            in-memory planner (PLANNING_HORIZON_DAYS); tasks not placed by then are
+            counted as remaining.
+        window_size (int): Tasks held by the scheduler at a time.
+        run_size (int): Records per in-memory sort run.
+        tmp_dir (str, optional): Directory for the sort runs.
+
+    Returns:
+        dict: {"days": planned days, "entries": written task entries,
+               "expired": tasks skipped for past deadlines, "remaining": tasks left unscheduled}
+    """
+    if config is None:
+        config = load_config()
+    if now is None:
+        now = datetime.now()
+    if availability is None:
+        availability = Availability(config)
+    if max_days is None:
+        max_days = PLANNING_HORIZON_DAYS
+    summary = {"days": 0, "entries": 0, "expired": 0, "remaining": 0}
+    horizon = now + timedelta(days=max_days)
+
+    def tasks():
+        expanded = _expand_records(records, now, horizon)
+        for record in external_sort(expanded, run_size=run_size, tmp_dir=tmp_dir):
+            task = dict_to_task(record)
+            if task.occurrence:
+                task.available_from = task.deadline.date()
+            if task.deadline is not None and task.deadline < now:
+                summary["expired"] += 1
+                continue
+            if corrections:
+                task.duration = round(task.duration * correction_factor(task, corrections), 4)
+            yield task
+
+    source = tasks()
+    pending = deque()
+    current_day = now.date()
+    try:
+        while True:
+            if not pending:
+                pending.extend(islice(source, window_size))
+                if not pending:
+                    break
+            try:
+                current_day = availability.next_working_day(current_day)
+            except RuntimeError:
+                break
+            if (current_day - now.date()).days >= max_days:
+                break
+
+            daily_schedule = fill_day(build_day_blocks(current_day, now, config, availability),
+                                      pending, source, window_size, config.get("project_quotas"), current_day)
+            entries = [_entry_to_dict(item, start, end) for item, start, end in daily_schedule]
+            out.write(json.dumps({"date": current_day.strftime("%Y-%m-%d"), "entries": entries}) + "\n")
+            summary["days"] += 1
+            summary["entries"] += sum(1 for entry in entries if "id" in entry)
+            current_day += timedelta(days=1)
+
+        summary["remaining"] = len(pending) + sum(1 for _ in source)
+    finally:
+        source.close()
+    return summary
@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta
+
+WEEKDAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+FREQUENCIES = {"daily", "weekly"}
+
+def build_rule(freq, interval=1, weekdays=None, until=None, count=None):
+    """
+    Creates a recurrence rule as stored on a Task.
+
+    Args:
+        freq (str): "daily" (every `interval` days) or "weekly" (every `interval` weeks).
+        interval (int): Days or weeks between occurrences.
+        weekdays (list[int], optional): Weekdays (0=Monday) for weekly rules. Defaults to the first occurrence's weekday.
+        until (date, optional): Last day an occurrence may fall on.
+        count (int, optional): Total number of occurrences.
+
+    Returns:
+        dict: The rule.
+
+    Raises:
+        ValueError: If the rule is invalid.
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Invalid recurrence: '{freq}'. Choose from {sorted(FREQUENCIES)}.")
+    if interval < 1:
+        raise ValueError("The recurrence interval must be at least 1.")
+    if count is not None and count < 1:
+        raise ValueError("The occurrence count must be at least 1.")
+    rule = {"freq": freq, "interval": interval}
+    if freq == "weekly" and weekdays:
+        rule["weekdays"] = sorted(set(weekdays))
+    if until is not None:
+        rule["until"] = until.strftime("%Y-%m-%d")
+    if count is not None:
+        rule["count"] = count
+    return rule
+
+def parse_weekdays(text):
+    """
+    Parses a comma-separated weekday list such as "mon,thu".
+
+    Returns:
+        list[int]: Weekday numbers (0=Monday).
+    """
+    days = []
+    for part in text.split(","):
+        key = part.strip().lower()[:3]
+        if key not in WEEKDAY_NAMES:
+            raise ValueError(f"Invalid weekday: '{part}'.")
+        days.append(WEEKDAY_NAMES.index(key))
+    return days
+
+def describe_rule(rule):
+    """Returns a short human-readable description of a rule, e.g. "every 2 weeks on mon, thu"."""
+    unit = "day" if rule["freq"] == "daily" else "week"
+    interval = rule.get("interval", 1)
+    text = f"every {unit}" if interval == 1 else f"every {interval} {unit}s"
+    if rule.get("weekdays"):
+        text += " on " + ", ".join(WEEKDAY_NAMES[day] for day in rule["weekdays"])
+    if rule.get("count"):
+        text += f", {rule['count']} times"
+    if rule.get("until"):
+        text += f", until {rule['until']}"
+    return text
+
+def _parse_day(value):
+    return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+
+def iter_occurrences(rule, anchor, start=None, end=None, skip_done=True):
+    """
+    Lazily yields the occurrence deadlines of a series in chronological order.
+
+    The generator jumps straight to `start` (and past the completed prefix
+    of the series) arithmetically instead of stepping through every earlier
+    occurrence, so expanding a long-running series near today is cheap.
+
+    Args:
+        rule (dict): Recurrence rule (see build_rule).
+        anchor (datetime): Deadline of the first occurrence; later occurrences keep its time of day.
+        start (date, optional): Skip occurrences before this day.
+        end (date, optional): Stop after this day.
+        skip_done (bool): Leave out occurrences recorded as completed.
+
+    Yields:
+        datetime: Occurrence deadlines.
+    """
+    first_day = anchor.date()
+    interval = rule.get("interval", 1)
+    until = _parse_day(rule.get("until"))
+    count = rule.get("count")
+    done_through = _parse_day(rule.get("done_through")) if skip_done else None
+    done = set(rule.get("done", ())) if skip_done else set()
+
+    lower = first_day
+    if start is not None:
+        lower = max(lower, start)
+    if done_through is not None:
+        lower = max(lower, done_through + timedelta(days=1))
+    if end is not None and until is not None:
+        end = min(end, until)
+    elif until is not None:
+        end = until
+
+    if rule["freq"] == "daily":
+        index = max(0, -(-(lower - first_day).days // interval))
+        while True:
+            day = first_day + timedelta(days=index * interval)
+            if (count is not None and index >= count) or (end is not None and day > end):
+                return
+            if day.strftime("%Y-%m-%d") not in done:
+                yield datetime.combine(day, anchor.time())
+            index += 1
+
+    weekdays = rule.get("weekdays") or [first_day.weekday()]
+    base_monday = first_day - timedelta(days=first_day.weekday())
+    week = max(0, (lower - base_monday).days // 7 // interval)
+    first_week_count = sum(1 for weekday in weekdays if weekday >= first_day.weekday())
+    index = 0 if week == 0 else first_week_count + (week - 1) * len(weekdays)
+    while True:
+        monday = base_monday + timedelta(weeks=week * interval)
+        for weekday in weekdays:
+            day = monday + timedelta(days=weekday)
+            if day < first_day:
+                continue
+            if (count is not None and index >= count) or (end is not None and day > end):
+                return
+            index += 1
+            if day >= lower and day.strftime("%Y-%m-%d") not in done:
+                yield datetime.combine(day, anchor.time())
+        week += 1
+
+def next_occurrence(rule, anchor):
+    """
+    Returns the deadline of the earliest open occurrence, or None if the series is finished.
+    """
+    return next(iter_occurrences(rule, anchor), None)
+
+def complete_occurrence(rule, anchor, day):
+    """
+    Records one occurrence as completed.
+
+    Completions are kept as per-occurrence exceptions. The contiguous
+    completed prefix of the series is folded into a single "done_through"
+    date, so the stored rule stays small for a series completed in order.
+
+    Args:
+        rule (dict): Recurrence rule.
+        anchor (datetime): Deadline of the first occurrence.
+        day (date): Day of the completed occurrence.
+
+    Returns:
+        dict: A new rule with the completion recorded.
+    """
+    rule = dict(rule)
+    done = set(rule.get("done", ()))
+    done.add(day.strftime("%Y-%m-%d"))
+
+    done_through = rule.get("done_through")
+    for occurrence in iter_occurrences(rule, anchor, skip_done=False,
+                                       start=_parse_day(done_through) + timedelta(days=1) if done_through else None):
+        key = occurrence.strftime("%Y-%m-%d")
+        if key not in done:
+            break
+        done.discard(key)
+        done_through = key
+
+    if done_through:
+        rule["done_through"] = done_through
+    if done:
+        rule["done"] = sorted(done)
+    else:
+        rule.pop("done", None)
+    return rule
@@ -0,0 +1,276 @@
+import math
+import os
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+from devtime.config import CONFIG_FILE
+from devtime.scheduler import Task, expand_occurrences
+from devtime.storage import TASKS_FILE, BUSY_FILE
+from devtime.watch import file_stamps
+
+WHEEL_BITS = 6
+WHEEL_SLOTS = 1 << WHEEL_BITS  # Slots per wheel level
+WHEEL_LEVELS = 4  # Slot widths of 1 s, 64 s, ~68 min and ~3 days: about 194 days before the overflow list
+DEADLINE_LEAD_MINUTES = 60  # Warn this long before a deadline
+RELOAD_CHECK_SECONDS = 15  # How often the task and config files are checked for changes
+HOOK_TIMEOUT_SECONDS = 10  # Longest a notification hook may run
+WATCHED_FILES = (TASKS_FILE, CONFIG_FILE, BUSY_FILE)
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel with one-second resolution.
+
+    Level l has WHEEL_SLOTS slots of WHEEL_SLOTS**l seconds each, indexed by
+    the absolute time, so inserting an event is O(1). When time reaches the
+    start of a coarse slot, its events are cascaded into finer levels, and
+    an event moves down at most WHEEL_LEVELS times before it fires. Empty
+    stretches are skipped: next_expiry() tells the caller how long it can
+    sleep, and advance() jumps straight between the seconds where a slot
+    fires or cascades.
+    """
+
+    def __init__(self, now):
+        """
+        Initialize a TimingWheel instance.
+
+        Args:
+            now (float): Current time as a Unix timestamp.
+        """
+        self.now = int(now)
+        self._levels = [[[] for _ in range(WHEEL_SLOTS)] for _ in range(WHEEL_LEVELS)]
+        self._overflow = []  # Events beyond the range of the top level
+        self._due = []
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, when, item):
+        """
+        Arms an event.
+
+        Args:
+            when (float): Unix timestamp to fire at (rounded up to the second, so it never fires early).
+            item (object): Returned by advance() when the event fires.
+        """
+        self._count += 1
+        self._place(math.ceil(when), item)
+
+    def _place(self, when, item):
+        delta = when - self.now
+        if delta <= 0:
+            self._due.append((when, item))
+            return
+        for level in range(WHEEL_LEVELS):
+            if delta < 1 << (WHEEL_BITS * (level + 1)):
+                self._levels[level][(when >> (WHEEL_BITS * level)) & (WHEEL_SLOTS - 1)].append((when, item))
+                return
+        self._overflow.append((when, item))
+
+    def _tick(self):
+        self.now += 1
+        # Coarse slots starting at this second are cascaded, highest level first
+        cascading = [level for level in range(1, WHEEL_LEVELS)
+                     if not self.now & ((1 << (WHEEL_BITS * level)) - 1)]
+        if self._overflow and len(cascading) == WHEEL_LEVELS - 1:
+            overflow, self._overflow = self._overflow, []
+            for when, item in overflow:
+                self._place(when, item)
+        for level in reversed(cascading):
+            slot = (self.now >> (WHEEL_BITS * level)) & (WHEEL_SLOTS - 1)
+            events, self._levels[level][slot] = self._levels[level][slot], []
+            for when, item in events:
+                self._place(when, item)
+        slot = self.now & (WHEEL_SLOTS - 1)
+        self._due.extend(self._levels[0][slot])
+        self._levels[0][slot] = []
+
+    def next_expiry(self):
+        """
+        Returns when the next event fires, so the caller can sleep until then.
+
+        The earliest event is in the first non-empty slot of some level, so
+        at most WHEEL_LEVELS slots are inspected.
+
+        Returns:
+            int or None: Unix timestamp, or None if no event is armed.
+        """
+        if self._due:
+            return self.now
+        best = min((when for when, _ in self._overflow), default=None)
+        for level in range(WHEEL_LEVELS):
+            bucket = self.now >> (WHEEL_BITS * level)
+            for step in range(1, WHEEL_SLOTS + 1):
+                events = self._levels[level][(bucket + step) & (WHEEL_SLOTS - 1)]
+                if events:
+                    first = min(when for when, _ in events)
+                    best = first if best is None else min(best, first)
+                    break
+        return best
+
+    def _next_tick(self):
+        # Next second with work inside the wheel: an event firing or a coarse slot cascading
+        best = None
+        for level in range(WHEEL_LEVELS):
+            shift = WHEEL_BITS * level
+            bucket = self.now >> shift
+            for step in range(1, WHEEL_SLOTS + 1):
+                if self._levels[level][(bucket + step) & (WHEEL_SLOTS - 1)]:
+                    tick = (bucket + step) << shift
+                    best = tick if best is None else min(best, tick)
+                    break
+        if self._overflow:
+            shift = WHEEL_BITS * (WHEEL_LEVELS - 1)
+            tick = ((self.now >> shift) + 1) << shift
+            best = tick if best is None else min(best, tick)
+        return best
+
+    def advance(self, now):
+        """
+        Moves the wheel forward to `now` and returns the events that fired.
+
+        Args:
+            now (float): Current time as a Unix timestamp.
+
+        Returns:
+            list[tuple]: (when, item) pairs in firing order.
+        """
+        target = int(now)
+        while self.now < target:
+            tick = self._next_tick()
+            if tick is None or tick > target:
+                self.now = target  # Nothing is armed in between
+                break
+            self.now = tick - 1
+            self._tick()
+        due, self._due = self._due, []
+        due.sort(key=lambda event: event[0])
+        self._count -= len(due)
+        return due
+
+def _clock_time(moment):
+    return moment.strftime("%H:%M")
+
+def plan_events(schedule_plan, tasks, now, lead_minutes=DEADLINE_LEAD_MINUTES):
+    """
+    Lists the notifications for a plan: session starts, breaks and approaching deadlines.
+
+    Args:
+        schedule_plan (dict): Mapping of "YYYY-MM-DD" to (item, start, end) entries.
+        tasks (list[Task]): Active tasks (recurring series are expanded to their occurrences).
+        now (datetime): Only events after this moment are returned.
+        lead_minutes (int): Minutes before a deadline to warn.
+
+    Returns:
+        list[tuple]: (datetime, kind, message) in time order; kind is "start", "break" or "deadline".
+    """
+    events = []
+    for day, entries in schedule_plan.items():
+        midnight = datetime.strptime(day, "%Y-%m-%d")
+        for item, start, end in entries:
+            begins = midnight + timedelta(seconds=round(start * 3600))
+            ends = midnight + timedelta(seconds=round(end * 3600))
+            if isinstance(item, Task):
+                label = f"{item.name} ({item.occurrence})" if item.occurrence else item.name
+                events.append((begins, "start", f"▶ Time for {label} (ID: {item.id}) until {_clock_time(ends)}."))
+            else:
+                events.append((begins, "break", f"☕ Break until {_clock_time(ends)}."))
+
+    horizon = max((datetime.strptime(day, "%Y-%m-%d") for day in schedule_plan), default=now) + timedelta(days=1)
+    for task in expand_occurrences(tasks, now, max(horizon, now + timedelta(days=1))):
+        if task.deadline is None:
+            continue
+        events.append((task.deadline - timedelta(minutes=lead_minutes), "deadline",
+                       f"⏰ {task.name} (ID: {task.id}) is due at {_clock_time(task.deadline)}."))
+        events.append((task.deadline, "deadline", f"⌛ {task.name} (ID: {task.id}) is due now."))
+
+    return sorted((event for event in events if event[0] > now), key=lambda event: event[0])
+
+def print_notification(kind, message, when):
+    """Default notifier: prints the message to stdout."""
+    print(f"[{_clock_time(datetime.fromtimestamp(when))}] {message}", flush=True)
+
+def hook_notifier(command):
+    """
+    Returns a notifier that runs a local command for each notification.
+
+    The message is passed as the last argument; DEVTIME_EVENT (start, break
+    or deadline), DEVTIME_MESSAGE and DEVTIME_TIME are set in its environment.
+
+    Args:
+        command (list[str]): Command and leading arguments, e.g. ["notify-send", "DevTime"].
+
+    Returns:
+        callable: notify(kind, message, when).
+    """
+    def notify(kind, message, when):
+        env = dict(os.environ, DEVTIME_EVENT=kind, DEVTIME_MESSAGE=message,
+                   DEVTIME_TIME=datetime.fromtimestamp(when).strftime("%Y-%m-%d %H:%M"))
+        try:
+            subprocess.run(command + [message], env=env, timeout=HOOK_TIMEOUT_SECONDS, check=False)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"⚠ Notification hook failed: {e}")
+            print_notification(kind, message, when)
+    return notify
+
+def run_reminders(load_plan, notify=print_notification, lead_minutes=DEADLINE_LEAD_MINUTES,
+                  clock=time.time, sleep=time.sleep, stop=None,
+                  watched=WATCHED_FILES, check_seconds=RELOAD_CHECK_SECONDS):
+    """
+    Runs the reminder loop in the foreground.
+
+    The plan is loaded once and its events are armed in a TimingWheel; the
+    loop then sleeps until the next event. The plan is reloaded only when
+    one of the watched files changes (checked with a stat every
+    `check_seconds`, as the standard library has no file-change
+    notification) and at midnight.
+
+    Args:
+        load_plan (callable): Returns (schedule_plan, tasks) for the current time.
+        notify (callable): Called as notify(kind, message, when) for each event.
+        lead_minutes (int): Minutes before a deadline to warn.
+        clock (callable): Returns the current Unix timestamp.
+        sleep (callable): Sleeps for a number of seconds.
+        stop (callable, optional): Checked once per wake-up; the loop ends when it returns True.
+        watched (tuple[str]): Files whose changes trigger a reload.
+        check_seconds (float): Seconds between change checks.
+
+    Returns:
+        int: Number of notifications sent.
+    """
+    def load():
+        now = datetime.fromtimestamp(clock())
+        schedule_plan, tasks = load_plan()
+        wheel = TimingWheel(clock())
+        for at, kind, message in plan_events(schedule_plan, tasks, now, lead_minutes):
+            wheel.add(at.timestamp(), (kind, message))
+        tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        wheel.add(tomorrow.timestamp(), ("reload", None))
+        return wheel
+
+    stamps = file_stamps(watched)
+    wheel = load()
+    next_check = clock() + check_seconds
+    sent = 0
+    while stop is None or not stop():
+        reload = False
+        for when, (kind, message) in wheel.advance(clock()):
+            if kind == "reload":
+                reload = True
+            else:
+                notify(kind, message, when)
+                sent += 1
+
+        if reload or clock() >= next_check:
+            current = file_stamps(watched)
+            if reload or current != stamps:
+                stamps = current
+                wheel = load()
+            next_check = clock() + check_seconds
+
+        wake = wheel.next_expiry()
+        timeout = min(next_check, wake if wake is not None else next_check) - clock()
+        if timeout > 0:
+            sleep(timeout)
+    return sent
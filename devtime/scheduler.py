@@ -1,12 +1,22 @@
+import copy
+import re
+from collections import deque
+from itertools import islice
 from datetime import datetime, timedelta
 from devtime.config import load_config
+from devtime.availability import Availability
+from devtime.intervals import subtract_intervals
+from devtime.recurrence import iter_occurrences
+
+PLANNING_HORIZON_DAYS = 30  # Calendar days the planner looks ahead
 
 class Task:
     """Represents a task with a name, duration, deadline, and priority."""
     
     PRIORITIES = {"low", "medium", "high"}
 
-    def __init__(self, name: str, duration: float, deadline: str, priority: str = "medium", task_id: int = None):
+    def __init__(self, name: str, duration: float, deadline: str, priority: str = "medium", task_id: int = None,
+                 recurrence: dict = None, tags: list = None, project: str = None):
         """
         Initialize a Task instance.
 
@@ -16,6 +26,10 @@ class Task:
             deadline (str): The deadline for the task in "YYYY-MM-DD HH:MM" format.
             priority (str): The priority level ("low", "medium", or "high").
             task_id (int, optional): The ID of the task.
+            recurrence (dict, optional): Recurrence rule (see devtime.recurrence). The deadline
+                is then the deadline of the first occurrence.
+            tags (list[str], optional): Lowercase tags (see devtime.tags).
+            project (str, optional): Project the task belongs to.
         
         Raises:
             ValueError: If the provided priority is not valid.
@@ -28,6 +42,12 @@ class Task:
         self.duration = duration
         self.deadline = datetime.strptime(deadline, "%Y-%m-%d %H:%M") if isinstance(deadline, str) else deadline
         self.priority = priority
+        self.recurrence = recurrence
+        self.tags = tags or []
+        self.project = project
+        self.occurrence = None  # "YYYY-MM-DD" for a task expanded from a recurring series
+        self.available_from = None  # Earliest day (date) the task may be scheduled on
+        self.assignee = None  # Team member the task is assigned to (see devtime.team)
 
     def __repr__(self):
         return f"Task({self.name}, {self.duration}h, {self.deadline}, {self.priority})"
@@ -35,14 +55,17 @@ class Task:
 class WorkSchedule:
     """Represents the work schedule with defined working hours, lunch, concentration limits, and breaks."""
     
-    def __init__(self, day_of_week):
+    def __init__(self, day_of_week, config=None):
         """
         Initialize a WorkSchedule instance.
 
         Args:
             day_of_week (str): The day of the week.
+            config (dict, optional): Preloaded configuration. Read from disk if omitted.
         """
-        config = load_config()
+        if config is None:
+            config = load_config()
+        self.config = config
         work_hours = config["work_hours"].get(day_of_week, {"start": None, "end": None})
         if work_hours["start"] is None or work_hours["end"] is None:
             self.is_day_off = True
@@ -55,15 +78,20 @@ class WorkSchedule:
         self.max_concentration_hours = config["max_concentration_hours"]
         self.min_break_minutes = config["min_break_minutes"]
 
+    @property
+    def availability(self):
+        """Date-aware availability (weekly hours plus per-date overrides) for this configuration."""
+        if getattr(self, "_availability", None) is None:
+            self._availability = Availability(self.config)
+        return self._availability
+
     def is_working_day(self, date):
-        """Checks if a given date is a working day based on configuration."""
-        weekday = date.strftime("%A")
-        work_hours = load_config()["work_hours"].get(weekday, {"start": None, "end": None})
-        return work_hours["start"] is not None and work_hours["end"] is not None
+        """Checks if a given date is a working day based on configuration and date overrides."""
+        return self.availability.hours_for(date) is not None
 
     def get_next_working_day(self, date, max_days=7):
         """
-        Finds the next working day to avoid infinite loops.
+        Finds the next working day through the precomputed calendar index.
 
         Args:
             date (datetime): Starting date.
@@ -75,11 +103,13 @@ class WorkSchedule:
         Raises:
             RuntimeError: If no working day is found within max_days.
         """
-        for _ in range(max_days):
-            if self.is_working_day(date):
-                return date
-            date += timedelta(days=1)
-        raise RuntimeError(f"No working day found within {max_days} days. Stuck on {date}.")
+        try:
+            offset = (self.availability.next_working_day(date) - (date.date() if isinstance(date, datetime) else date)).days
+        except RuntimeError:
+            offset = max_days
+        if offset >= max_days:
+            raise RuntimeError(f"No working day found within {max_days} days. Stuck on {date + timedelta(days=max_days)}.")
+        return date + timedelta(days=offset)
 
     def __repr__(self):
         return (f"WorkSchedule(Start: {self.start_hour}, End: {self.end_hour}, "
@@ -87,81 +117,117 @@ class WorkSchedule:
                 f"Break: {self.min_break_minutes} min, "
                 f"Lunch: {self.lunch_start}:00 - {self.lunch_end}:00)")
 
-def generate_schedule(tasks, initial_schedule):
+def task_keywords(name):
+    """Returns the lowercase words of a task name used for keyword statistics."""
+    return sorted({word for word in re.findall(r"[a-zа-яіїєґ0-9]+", name.lower()) if len(word) >= 3})
+
+def correction_factor(task, corrections):
+    """
+    Looks up the learned duration correction factor for a task.
+
+    Keyword factors matching words of the task name take precedence (averaged
+    if several match); otherwise the factor for the task priority is used.
+
+    Args:
+        task (Task): The task to correct.
+        corrections (dict): {"priority": {priority: factor}, "keyword": {word: factor}}
+
+    Returns:
+        float: Multiplier for the estimated duration (1.0 if unknown).
+    """
+    if not corrections:
+        return 1.0
+    keyword_factors = corrections.get("keyword", {})
+    words = set(task_keywords(task.name))
+    matches = [factor for word, factor in keyword_factors.items() if word in words]
+    if matches:
+        return sum(matches) / len(matches)
+    return corrections.get("priority", {}).get(task.priority, 1.0)
+
+def generate_schedule(tasks, initial_schedule, corrections=None):
     """
     Generates a multi-day work schedule based on user configuration.
 
+    Note: scheduled durations are consumed from the given Task objects in place.
+    Use plan_tasks() when the input tasks must stay untouched.
+
     Args:
         tasks (list[Task]): List of tasks to schedule.
         initial_schedule (WorkSchedule): Unused here (MVP version).
+        corrections (dict, optional): Learned duration correction factors.
+
+    Returns:
+        tuple: (schedule_plan, remaining_tasks)
+    """
+    return _build_schedule(tasks, load_config(), datetime.now(), corrections)
+
+def plan_tasks(tasks, config=None, now=None, corrections=None, availability=None):
+    """
+    Non-mutating variant of generate_schedule.
+
+    The scheduler works on shallow copies of the tasks, so the caller's Task
+    objects keep their original durations and can be reused or cached.
+
+    Args:
+        tasks (list[Task]): List of tasks to schedule.
+        config (dict, optional): Configuration to plan with. Read from disk if omitted.
+        now (datetime, optional): Planning start time. Defaults to the current time.
+        corrections (dict, optional): Learned duration correction factors.
+        availability (Availability, optional): Date overrides and busy blocks. Built from config if omitted.
+
+    Returns:
+        tuple: (schedule_plan, remaining_tasks) built from copies of the tasks.
+    """
+    if config is None:
+        config = load_config()
+    if now is None:
+        now = datetime.now()
+    return _build_schedule([copy.copy(task) for task in tasks], config, now, corrections, availability)
+
+def _build_schedule(tasks, config, now, corrections=None, availability=None):
+    """
+    Core scheduling loop shared by generate_schedule and plan_tasks.
+
+    Args:
+        tasks (list[Task]): Tasks to schedule. Their durations are consumed in place.
+        config (dict): User configuration.
+        now (datetime): Planning start time.
+        corrections (dict, optional): Learned duration correction factors.
+        availability (Availability, optional): Date overrides and busy blocks. Built from config if omitted.
 
     Returns:
         tuple: (schedule_plan, remaining_tasks)
     """
     schedule_plan = {}
-    now = datetime.now()
-    remaining_tasks = [task for task in tasks if task.deadline is None or task.deadline >= now]
+    max_days = PLANNING_HORIZON_DAYS
+    horizon = now + timedelta(days=max_days)
+    remaining_tasks = [task for task in expand_occurrences(tasks, now, horizon)
+                       if task.deadline is None or task.deadline >= now]
+    if corrections:
+        for task in remaining_tasks:
+            task.duration = round(task.duration * correction_factor(task, corrections), 4)
+    if availability is None:
+        availability = Availability(config)
     current_day = now.date()
-    max_days = 30
     day_counter = 0
 
-    while remaining_tasks and day_counter < max_days:
-        day_counter += 1
-        day_str = current_day.strftime("%Y-%m-%d")
-        weekday = current_day.strftime("%A")
-        ws = WorkSchedule(weekday)
+    pending = deque(remaining_tasks)
 
-        if ws.is_day_off:
-            current_day += timedelta(days=1)
-            continue
+    while pending and day_counter < max_days:
+        # Jump straight to the next working day (holidays and days off are skipped in O(1))
+        try:
+            next_day = availability.next_working_day(current_day)
+        except RuntimeError:
+            day_counter = max_days
+            break
+        day_counter += (next_day - current_day).days + 1
+        if day_counter > max_days:
+            break
+        current_day = next_day
 
-        # Start the day from the current time if the day has already started
-        if current_day == now.date():
-            now_float = now.hour + now.minute / 60.0
-            work_start = max(ws.start_hour, now_float)
-        else:
-            work_start = ws.start_hour
-        work_end = ws.end_hour
-
-        available_blocks = []
-        current_time = work_start
-
-        # Form work blocks with breaks
-        while current_time < work_end:
-            block_end = min(current_time + ws.max_concentration_hours, work_end)
-            available_blocks.append((current_time, block_end))
-            
-            # Add a break after each block if there is space
-            break_start = block_end
-            break_end = min(block_end + ws.min_break_minutes / 60.0, work_end)
-            if break_start < break_end:
-                available_blocks.append(("Break", break_start, break_end))
-            
-            current_time = break_end
-
-        daily_schedule = []
-        
-        for block in available_blocks:
-            if block[0] == "Break":
-                daily_schedule.append(("Break", block[1], block[2]))
-                continue
-            
-            block_start, block_end = block
-            current_slot = block_start
-
-            while current_slot < block_end and remaining_tasks:
-                task = remaining_tasks[0]
-                session_time = min(task.duration, block_end - current_slot)
-                
-                scheduled_start = current_slot
-                scheduled_end = current_slot + session_time
-                daily_schedule.append((task, scheduled_start, scheduled_end))
-                
-                current_slot = scheduled_end
-                task.duration -= session_time
-
-                if task.duration <= 0:
-                    remaining_tasks.pop(0)
+        day_str = current_day.strftime("%Y-%m-%d")
+        available_blocks = build_day_blocks(current_day, now, config, availability)
+        daily_schedule = fill_day(available_blocks, pending, quotas=config.get("project_quotas"), day=current_day)
 
         schedule_plan[day_str] = daily_schedule
         current_day += timedelta(days=1)
@@ -169,4 +235,149 @@ def generate_schedule(tasks, initial_schedule):
     if day_counter >= max_days:
         print("Reached maximum day limit while scheduling.")
 
-    return schedule_plan, remaining_tasks
+    return schedule_plan, list(pending)
+
+def expand_occurrences(tasks, start, end):
+    """
+    Lazily replaces recurring series by their open occurrences in [start, end].
+
+    One-off tasks are passed through unchanged. Each occurrence is a copy of
+    its series with the occurrence deadline, the series ID, and `occurrence`
+    and `available_from` set to its day, so it is not worked on ahead of time.
+
+    Args:
+        tasks (iterable[Task]): Tasks, some of which may be recurring series.
+        start (datetime): Earliest occurrence day to include.
+        end (datetime): Latest occurrence day to include (the planning horizon).
+
+    Yields:
+        Task: One-off tasks and occurrences, series occurrences in date order.
+    """
+    for task in tasks:
+        if not task.recurrence or task.deadline is None:
+            yield task
+            continue
+        for deadline in iter_occurrences(task.recurrence, task.deadline, start.date(), end.date()):
+            occurrence = copy.copy(task)
+            occurrence.recurrence = None
+            occurrence.deadline = deadline
+            occurrence.occurrence = deadline.strftime("%Y-%m-%d")
+            occurrence.available_from = deadline.date()
+            yield occurrence
+
+def build_day_blocks(day, now, config, availability):
+    """
+    Splits the free working time of a day into focus blocks and breaks.
+
+    Args:
+        day (date): The working day.
+        now (datetime): Planning start time; time before it is skipped on that day.
+        config (dict): User configuration.
+        availability (Availability): Working hours, date overrides and busy blocks.
+
+    Returns:
+        list[tuple]: (start, end) work blocks and ("Break", start, end) entries, in time order.
+    """
+    day_start_hour, work_end = availability.hours_for(day)
+
+    # Start the day from the current time if the day has already started
+    if day == now.date():
+        now_float = now.hour + now.minute / 60.0
+        work_start = max(day_start_hour, now_float)
+    else:
+        work_start = day_start_hour
+
+    available_blocks = []
+    current_time = work_start
+
+    # Form work blocks with breaks
+    while current_time < work_end:
+        block_end = min(current_time + config["max_concentration_hours"], work_end)
+        available_blocks.append((current_time, block_end))
+
+        # Add a break after each block if there is space
+        break_start = block_end
+        break_end = min(block_end + config["min_break_minutes"] / 60.0, work_end)
+        if break_start < break_end:
+            available_blocks.append(("Break", break_start, break_end))
+
+        current_time = break_end
+
+    # Cut busy calendar blocks out of the work blocks
+    if work_start < work_end:
+        day_busy = availability.busy_hours(day, work_start, work_end)
+        if day_busy:
+            available_blocks = [
+                piece
+                for block in available_blocks
+                for piece in ([block] if block[0] == "Break" else subtract_intervals(block[0], block[1], day_busy))
+            ]
+    return available_blocks
+
+def fill_day(available_blocks, pending, source=None, window_size=None, quotas=None, day=None):
+    """
+    Fills the work blocks of one day with tasks, front of the queue first.
+
+    Task durations are consumed in place; finished tasks leave the queue.
+    A task whose project has used up its daily quota, or that is not
+    available before a later day, is held back for the rest of the day and
+    returns to the front of the queue afterwards, so each check is one
+    lookup however many projects exist.
+
+    Args:
+        available_blocks (list[tuple]): Output of build_day_blocks.
+        pending (deque[Task]): Tasks waiting to be scheduled.
+        source (iterator[Task], optional): Further tasks, pulled into `pending`
+            whenever it runs empty.
+        window_size (int, optional): Tasks held in memory at most, counting the
+            ones held back today; refills stop once the window is full.
+        quotas (dict, optional): {project: maximum hours per day}.
+        day (date, optional): The day being filled, checked against `available_from`.
+
+    Returns:
+        list[tuple]: (item, start, end) entries of the day.
+    """
+    daily_schedule = []
+    used = {}  # Hours scheduled per quota-limited project today
+    held = []  # Tasks whose project quota is used up today, or not available yet
+
+    for block in available_blocks:
+        if block[0] == "Break":
+            daily_schedule.append(("Break", block[1], block[2]))
+            continue
+
+        block_start, block_end = block
+        current_slot = block_start
+
+        while current_slot < block_end:
+            if not pending:
+                if source is None:
+                    break
+                pending.extend(islice(source, max(0, window_size - len(held))))
+                if not pending:
+                    break
+            task = pending[0]
+            if day is not None and task.available_from is not None and task.available_from > day:
+                held.append(pending.popleft())
+                continue
+            session_time = min(task.duration, block_end - current_slot)
+            if quotas and task.project in quotas:
+                quota_left = quotas[task.project] - used.get(task.project, 0.0)
+                if quota_left <= 1e-9:
+                    held.append(pending.popleft())
+                    continue
+                session_time = min(session_time, quota_left)
+                used[task.project] = used.get(task.project, 0.0) + session_time
+
+            scheduled_start = current_slot
+            scheduled_end = current_slot + session_time
+            daily_schedule.append((task, scheduled_start, scheduled_end))
+
+            current_slot = scheduled_end
+            task.duration -= session_time
+
+            if task.duration <= 0:
+                pending.popleft()
+
+    pending.extendleft(reversed(held))
+    return daily_schedule
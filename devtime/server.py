@@ -0,0 +1,257 @@
+import hashlib
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from devtime.config import CONFIG_FILE
+from devtime.scheduler import Task
+from devtime.storage import TASKS_FILE, BUSY_FILE, load_tasks, task_to_dict
+from devtime.watch import file_stamps, next_boundary
+
+DEFAULT_HOST = "127.0.0.1"  # Local only: the endpoints are not authenticated
+DEFAULT_PORT = 8765
+REQUEST_QUEUE_SIZE = 512  # Pending connections, so bursts of pollers are not refused
+STATUS_FILES = (TASKS_FILE, CONFIG_FILE, BUSY_FILE)  # Files whose changes invalidate the responses
+
+def _clock_time(hour):
+    return f"{int(hour):02}:{int(round((hour % 1) * 60)):02}"
+
+def _task_json(task, now):
+    data = task_to_dict(task)
+    data["overdue"] = task.deadline is not None and task.deadline < now
+    return data
+
+def _next_deadline(tasks, now):
+    return min((task.deadline for task in tasks if task.deadline is not None and task.deadline > now), default=None)
+
+def tasks_status(tasks, now, overdue_only=False):
+    """
+    Builds the /tasks (or /overdue) response.
+
+    Args:
+        tasks (list[Task]): Active tasks.
+        now (datetime): Current time.
+        overdue_only (bool): Only include tasks past their deadline.
+
+    Returns:
+        tuple: (body dict, datetime when a task becomes overdue or None).
+    """
+    listed = [_task_json(task, now) for task in tasks]
+    if overdue_only:
+        listed = [task for task in listed if task["overdue"]]
+    return {"tasks": listed}, _next_deadline(tasks, now)
+
+def plan_status(schedule_plan, remaining_tasks, now):
+    """
+    Builds the /plan response: today's sessions and breaks.
+
+    Args:
+        schedule_plan (dict): Mapping of "YYYY-MM-DD" to (item, start, end) entries.
+        remaining_tasks (list[Task]): Tasks that did not fit into the plan.
+        now (datetime): Current time.
+
+    Returns:
+        tuple: (body dict, datetime of the next slot boundary).
+    """
+    today = now.strftime("%Y-%m-%d")
+    entries = schedule_plan.get(today, [])
+    hour = now.hour + now.minute / 60.0
+    items = []
+    for item, start, end in entries:
+        entry = {"start": _clock_time(start), "end": _clock_time(end), "current": start <= hour < end}
+        if isinstance(item, Task):
+            entry.update(id=item.id, name=item.name, occurrence=item.occurrence)
+        else:
+            entry["break"] = True
+        items.append(entry)
+    unscheduled = [task.id for task in remaining_tasks]
+    return {"date": today, "entries": items, "unscheduled": unscheduled}, next_boundary(entries, now)
+
+def forecast_status(schedule_plan, remaining_tasks, now):
+    """
+    Builds the /forecast response: planned hours per day and when each task is expected to finish.
+
+    Args:
+        schedule_plan (dict): Mapping of "YYYY-MM-DD" to (item, start, end) entries.
+        remaining_tasks (list[Task]): Tasks that did not fit into the plan.
+        now (datetime): Current time.
+
+    Returns:
+        tuple: (body dict, datetime of the next slot boundary).
+    """
+    days, finishes = [], {}
+    for day in sorted(schedule_plan):
+        hours = 0.0
+        for item, start, end in schedule_plan[day]:
+            if isinstance(item, Task):
+                hours += end - start
+                finishes[(item.id, item.occurrence)] = (item, f"{day} {_clock_time(end)}")
+        days.append({"date": day, "hours": round(hours, 2)})
+
+    tasks = []
+    for item, finish in finishes.values():
+        deadline = item.deadline.strftime("%Y-%m-%d %H:%M") if item.deadline else None
+        tasks.append({"id": item.id, "name": item.name, "occurrence": item.occurrence, "deadline": deadline,
+                      "finish": finish, "late": deadline is not None and finish > deadline})
+    body = {"days": days, "tasks": tasks, "unscheduled": [_task_json(task, now) for task in remaining_tasks]}
+    return body, next_boundary(schedule_plan.get(now.strftime("%Y-%m-%d"), []), now)
+
+class StatusCache:
+    """
+    Computed responses with their ETags.
+
+    A response stays valid while the stamps of the status files are the
+    same and the time is before its expiry (next slot boundary or deadline).
+    Checking that costs a few stat calls, so an unchanged poll is answered
+    without loading tasks or planning. Rebuilds are serialized, so a burst
+    of pollers after a change computes each response once.
+    """
+
+    def __init__(self, builders, paths=STATUS_FILES, clock=datetime.now):
+        """
+        Initialize a StatusCache instance.
+
+        Args:
+            builders (dict): Path to a callable build(now) returning (body, expiry or None).
+            paths (tuple[str]): Files whose changes invalidate the responses.
+            clock (callable): Returns the current datetime.
+        """
+        self.builders = builders
+        self.paths = paths
+        self.clock = clock
+        self.builds = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """
+        Returns the current response for a path.
+
+        Args:
+            name (str): Endpoint path, a key of `builders`.
+
+        Returns:
+            tuple: (etag, body bytes).
+        """
+        stamps = file_stamps(self.paths)
+        entry = self._entries.get(name)
+        if self._valid(entry, stamps):
+            return entry[2], entry[3]
+        with self._lock:
+            stamps = file_stamps(self.paths)
+            entry = self._entries.get(name)
+            if self._valid(entry, stamps):
+                return entry[2], entry[3]
+            now = self.clock()
+            body, expiry = self.builders[name](now)
+            self.builds += 1
+            payload = json.dumps(dict(body, generated_at=now.strftime("%Y-%m-%d %H:%M:%S"))).encode("utf-8")
+            version = repr((name, stamps, expiry)).encode("utf-8")
+            etag = '"' + hashlib.sha1(version).hexdigest()[:20] + '"'
+            self._entries[name] = (stamps, expiry, etag, payload)
+            return etag, payload
+
+    def _valid(self, entry, stamps):
+        return entry is not None and entry[0] == stamps and (entry[1] is None or self.clock() < entry[1])
+
+def build_status_cache(load_plan, clock=datetime.now, paths=STATUS_FILES):
+    """
+    Creates the cache behind the status endpoints.
+
+    Args:
+        load_plan (callable): Returns (schedule_plan, remaining_tasks) for the given active tasks.
+        clock (callable): Returns the current datetime.
+        paths (tuple[str]): Files whose changes invalidate the responses.
+
+    Returns:
+        StatusCache: Cache for "/tasks", "/overdue", "/plan" and "/forecast".
+    """
+    def with_plan(build):
+        def run(now):
+            tasks = load_tasks()
+            schedule_plan, remaining_tasks = load_plan(tasks) if tasks else ({}, [])
+            return build(schedule_plan, remaining_tasks, now)
+        return run
+
+    return StatusCache({
+        "/tasks": lambda now: tasks_status(load_tasks(), now),
+        "/overdue": lambda now: tasks_status(load_tasks(), now, overdue_only=True),
+        "/plan": with_plan(plan_status),
+        "/forecast": with_plan(forecast_status),
+    }, paths, clock)
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Read-only JSON endpoints backed by a StatusCache (set on the server as `status_cache`)."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so pollers reuse their connection
+    server_version = "DevTime"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        cache = self.server.status_cache
+        path = urlsplit(self.path).path.rstrip("/") or "/"
+        if path == "/":
+            self._send(200, json.dumps({"endpoints": sorted(cache.builders)}).encode("utf-8"), None, send_body)
+            return
+        if path not in cache.builders:
+            self._send(404, b'{"error": "not found"}', None, send_body)
+            return
+        etag, payload = cache.get(path)
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self._send(304, b"", etag, False)
+            return
+        self._send(200, payload, etag, send_body)
+
+    def _send(self, status, payload, etag, send_body):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(payload)
+
+    def _read_only(self):
+        self.close_connection = True  # The request body is not read
+        self._send(405, b'{"error": "read-only"}', None, True)
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = _read_only
+
+    def log_message(self, format, *args):
+        pass  # Pollers would flood the terminal
+
+class StatusServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the shared StatusCache."""
+
+    daemon_threads = True
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+    def __init__(self, address, status_cache):
+        self.status_cache = status_cache
+        super().__init__(address, StatusHandler)
+
+def make_server(load_plan, host=DEFAULT_HOST, port=DEFAULT_PORT, clock=datetime.now, paths=STATUS_FILES):
+    """
+    Creates the status server; call serve_forever() on it to run.
+
+    Args:
+        load_plan (callable): Returns (schedule_plan, remaining_tasks) for the given active tasks.
+        host (str): Address to bind.
+        port (int): Port to bind (0 picks a free one).
+        clock (callable): Returns the current datetime.
+        paths (tuple[str]): Files whose changes invalidate the responses.
+
+    Returns:
+        StatusServer: The bound server.
+    """
+    return StatusServer((host, port), build_status_cache(load_plan, clock, paths))
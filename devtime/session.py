@@ -0,0 +1,372 @@
+import copy
+import json
+import os
+import select
+import time
+from datetime import datetime
+
+from devtime.history import write_archive, journal_tags_in
+from devtime.changelog import ensure_started, build_event, append_event, append_events
+from devtime.storage import (
+    task_to_dict, dict_to_task, read_tasks_file, write_tasks_file, set_active_session, TASKS_FILE
+)
+from devtime.watch import file_stamps
+
+JOURNAL_FILE = "session.journal"  # Write-ahead journal of unflushed session changes
+DEFAULT_FLUSH_SECONDS = 5.0  # Debounce interval between a change and the write to disk
+
+class TaskSession:
+    """
+    Session-scoped in-memory task store with write-behind persistence.
+
+    While the session is active, storage.load_tasks/save_tasks and
+    history.archive_completed operate on memory. Every change is appended to
+    a journal first, and the journal is synced once per command (see sync),
+    so a crashed process loses nothing and a power loss at most the command
+    in progress: the next session replays the journal before loading. The
+    JSON files are rewritten only on flush(), which happens after the debounce
+    interval (also while waiting for input, see wait_for_input), on an
+    explicit save and on close. If another process rewrote tasks.json in the
+    meantime, flush() merges the unflushed changes into its version.
+
+    Without a journal the session is transactional instead: changes exist
+    only in memory until flush(), and rollback() drops them.
+    """
+
+    def __init__(self, flush_interval=DEFAULT_FLUSH_SECONDS, journal_path=JOURNAL_FILE):
+        """
+        Initialize a TaskSession instance.
+
+        Args:
+            flush_interval (float): Seconds a change may stay unflushed.
+            journal_path (str or None): Path of the session journal. None makes the session transactional.
+        """
+        self.flush_interval = flush_interval
+        self.journal_path = journal_path
+        self._tasks = {}  # id -> Task, in list order
+        self._snapshot = {}  # id -> task_to_dict(Task), used to diff saves
+        self._pending_archive = []  # (tasks, completed_at, compress, journal tags or None)
+        self._unflushed = []  # Task journal entries since the last flush, re-applied on an external write
+        self._deferred = []  # Side effects run after a successful flush (transactional sessions only)
+        self._pending_events = []  # Change log events held until flush (transactional sessions only)
+        self._dirty_since = None
+        self._journal = None
+        self._unsynced = False
+        self._file_stamps = None  # Stamps of tasks.json as last read or written by this session
+        self._session_tag = f"{time.time_ns():x}"  # Prefix of the journal tags of archive entries
+        self._archive_seq = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def dirty(self):
+        """Whether there are changes that have not been written to the JSON files."""
+        return self._dirty_since is not None
+
+    def open(self):
+        """Recovers any crashed session, loads the store and activates the session."""
+        if self.journal_path is not None:
+            self.recover()
+        self._load_store()
+        ensure_started(lambda: list(self._snapshot.values()))
+        if self.journal_path is not None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        set_active_session(self)
+
+    def close(self):
+        """Flushes pending changes, removes the journal and deactivates the session."""
+        try:
+            self.flush()
+        finally:
+            set_active_session(None)
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self.journal_path is not None and os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
+    def rollback(self):
+        """Drops all unflushed changes and deferred side effects, then deactivates the session."""
+        self._pending_archive = []
+        self._unflushed = []
+        self._deferred = []
+        self._pending_events = []
+        self._dirty_since = None
+        self.close()
+
+    def defer(self, callback, *args):
+        """
+        Runs a side effect that lives outside the task store (e.g. the time log).
+
+        Journaled sessions run it immediately; transactional sessions run it
+        after the next successful flush and drop it on rollback.
+        """
+        if self.journal_path is None:
+            self._deferred.append((callback, args))
+        else:
+            callback(*args)
+
+    def load_tasks(self):
+        """Returns copies of the in-memory tasks, so callers cannot change state without saving."""
+        return [copy.copy(task) for task in self._tasks.values()]
+
+    def has_task(self, task_id):
+        """Checks whether an active task with the given ID exists."""
+        return task_id in self._tasks
+
+    def get_tasks(self, task_ids):
+        """Returns copies of the tasks with the given IDs, in the requested order."""
+        return [copy.copy(self._tasks[task_id]) for task_id in dict.fromkeys(task_ids) if task_id in self._tasks]
+
+    def upsert_tasks(self, tasks):
+        """
+        Adds or replaces tasks in O(len(tasks)).
+
+        Args:
+            tasks (list[Task]): Tasks to add or replace.
+        """
+        upsert = [d for d in (task_to_dict(task) for task in tasks) if self._snapshot.get(d["id"]) != d]
+        if upsert:
+            entry = {"op": "tasks", "upsert": upsert, "delete": []}
+            self._record(build_event([(d["id"], self._snapshot.get(d["id"]), d) for d in upsert]))
+            self._journal_write(entry)
+            self._apply_tasks(entry, {task.id: task for task in tasks})
+
+    def remove_tasks(self, task_ids):
+        """
+        Removes tasks in O(len(task_ids)).
+
+        Args:
+            task_ids (set[int]): IDs to remove.
+
+        Returns:
+            list[Task]: The removed tasks.
+        """
+        removed = [self._tasks[task_id] for task_id in dict.fromkeys(task_ids) if task_id in self._tasks]
+        if removed:
+            entry = {"op": "tasks", "upsert": [], "delete": [task.id for task in removed]}
+            self._record(build_event([(task.id, self._snapshot[task.id], None) for task in removed]))
+            self._journal_write(entry)
+            self._apply_tasks(entry)
+        return removed
+
+    def save_tasks(self, tasks):
+        """
+        Records a new task list as a diff against the current state.
+
+        Args:
+            tasks (list[Task]): The full task list, as passed to storage.save_tasks.
+        """
+        new = {task.id: task_to_dict(task) for task in tasks}
+        upsert = [d for task_id, d in new.items() if self._snapshot.get(task_id) != d]
+        delete = [task_id for task_id in self._snapshot if task_id not in new]
+
+        kept = [task_id for task_id in self._snapshot if task_id in new]
+        expected_order = kept + [task_id for task_id in new if task_id not in self._snapshot]
+        order = list(new) if expected_order != list(new) else None
+        if not upsert and not delete and order is None:
+            return
+
+        entry = {"op": "tasks", "upsert": upsert, "delete": delete}
+        if order is not None:
+            entry["order"] = order
+        self._record(build_event([(d["id"], self._snapshot.get(d["id"]), d) for d in upsert] +
+                                 [(task_id, self._snapshot[task_id], None) for task_id in delete]))
+        self._journal_write(entry)
+        self._apply_tasks(entry, {task.id: task for task in tasks})
+
+    def archive(self, tasks, completed_at, compress=False):
+        """
+        Buffers completed tasks until the next flush.
+
+        Args:
+            tasks (list[Task]): Tasks that were completed.
+            completed_at (datetime): Completion time.
+            compress (bool): Create new partitions gzip-compressed.
+        """
+        entry = {
+            "op": "archive",
+            "tasks": [task_to_dict(task) for task in tasks],
+            "completed_at": completed_at.strftime("%Y-%m-%d %H:%M"),
+            "compress": compress,
+        }
+        if self.journal_path is not None:
+            self._archive_seq += 1
+            entry["tag"] = f"{self._session_tag}-{self._archive_seq}"
+        self._record(build_event([], entry["tasks"], completed_at))
+        self._journal_write(entry)
+        self._apply_archive(entry)
+
+    def maybe_flush(self):
+        """Flushes if the oldest unflushed change is older than the debounce interval."""
+        if self._dirty_since is not None and time.monotonic() - self._dirty_since >= self.flush_interval:
+            self.flush()
+
+    def sync(self):
+        """
+        Forces the journal entries written since the last sync to disk.
+
+        Called once per interactive command rather than per change, so a
+        change costs a buffered write instead of an fsync.
+        """
+        if self._journal is not None and self._unsynced:
+            os.fsync(self._journal.fileno())
+        self._unsynced = False
+
+    def wait_for_input(self, stream):
+        """
+        Blocks until `stream` has input, flushing pending changes once they are due meanwhile.
+
+        This lets an idle prompt write its changes after the debounce interval
+        instead of holding them until the next command. Where the stream cannot
+        be polled (e.g. a Windows console), pending changes are flushed right away.
+
+        Args:
+            stream (file): The input stream, e.g. sys.stdin.
+        """
+        if self._dirty_since is None:
+            return
+        remaining = max(0.0, self.flush_interval - (time.monotonic() - self._dirty_since))
+        try:
+            ready, _, _ = select.select([stream], [], [], remaining)
+        except (OSError, ValueError):
+            ready = []
+        if not ready:
+            self.flush()
+
+    def flush(self):
+        """Writes the in-memory state to the JSON files and truncates the journal."""
+        if self._dirty_since is None:
+            return
+        if self._file_stamps is not None and file_stamps([TASKS_FILE]) != self._file_stamps:
+            self._merge_external()
+        events, self._pending_events = self._pending_events, []
+        append_events(events)
+        write_tasks_file(list(self._tasks.values()))
+        self._file_stamps = file_stamps([TASKS_FILE])
+        self._unflushed = []
+
+        # One append (and one rollup update) per distinct completion minute
+        grouped = {}
+        for tasks, completed_at, compress, tags in self._pending_archive:
+            group_tasks, group_tags = grouped.setdefault((completed_at, compress), ([], []))
+            group_tasks.extend(tasks)
+            group_tags.extend(tags or [None] * len(tasks))
+        self._pending_archive = []
+        for (completed_at, compress), (tasks, tags) in grouped.items():
+            write_archive(tasks, completed_at, compress, journal_tags=tags)
+
+        if self._journal is not None:
+            self._journal.seek(0)
+            self._journal.truncate()
+            self._unsynced = False
+        self._dirty_since = None
+
+        deferred, self._deferred = self._deferred, []
+        for callback, args in deferred:
+            callback(*args)
+
+    def recover(self):
+        """
+        Replays a journal left behind by a crashed session and writes the result.
+
+        Returns:
+            int: Number of replayed journal entries.
+        """
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return 0
+
+        self._load_store()
+        replayed = 0
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break  # Torn final write
+            if entry["op"] == "tasks":
+                self._unflushed.append(entry)
+                self._apply_tasks(entry)
+            elif entry["op"] == "archive":
+                self._apply_archive(entry, replay=True)
+            replayed += 1
+
+        if replayed:
+            print(f"⚠ Recovered {replayed} unsaved change(s) from the previous session.")
+        self.flush()
+        os.remove(self.journal_path)
+        return replayed
+
+    def _load_store(self):
+        # Stamp before reading, so a write racing with the read is seen as a change
+        self._file_stamps = file_stamps([TASKS_FILE])
+        self._set_tasks(read_tasks_file())
+
+    def _merge_external(self):
+        # Another process rewrote tasks.json: replay this session's unflushed changes onto its version
+        self._load_store()
+        for entry in self._unflushed:
+            self._apply_tasks(entry)
+        print(f"⚠ tasks.json was changed by another process; merged {len(self._unflushed)} unsaved change(s).")
+
+    def _set_tasks(self, tasks):
+        self._tasks = {task.id: task for task in tasks}
+        self._snapshot = {task.id: task_to_dict(task) for task in tasks}
+
+    def _record(self, event):
+        # Journaled sessions log changes as they happen; transactional ones on flush
+        if self.journal_path is None:
+            if event is not None:
+                self._pending_events.append(event)
+        else:
+            append_event(event)
+
+    def _journal_write(self, entry):
+        if entry["op"] == "tasks":
+            self._unflushed.append(entry)
+        if self._journal is not None:
+            self._journal.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._journal.flush()  # Survives a process crash; sync() covers a power loss
+            self._unsynced = True
+
+    def _apply_tasks(self, entry, objects=None):
+        # `objects` holds the caller's Task objects, which saves re-parsing the dicts
+        for task_id in entry["delete"]:
+            self._tasks.pop(task_id, None)
+            self._snapshot.pop(task_id, None)
+        for d in entry["upsert"]:
+            task = objects.get(d["id"]) if objects else None
+            self._tasks[d["id"]] = copy.copy(task) if task is not None else dict_to_task(d)
+            self._snapshot[d["id"]] = d
+        if "order" in entry:
+            # Ordered IDs first; tasks the order does not know (e.g. merged external ones) keep their place after them
+            ordered = dict.fromkeys(task_id for task_id in entry["order"] if task_id in self._tasks)
+            order = list(ordered) + [task_id for task_id in self._tasks if task_id not in ordered]
+            self._tasks = {task_id: self._tasks[task_id] for task_id in order}
+            self._snapshot = {task_id: self._snapshot[task_id] for task_id in order}
+        self._mark_dirty()
+
+    def _apply_archive(self, entry, replay=False):
+        tasks = [dict_to_task(d) for d in entry["tasks"]]
+        completed_at = datetime.strptime(entry["completed_at"], "%Y-%m-%d %H:%M")
+        tags = [f"{entry['tag']}.{i}" for i in range(len(tasks))] if "tag" in entry else None
+        if replay and tags:
+            # The crashed flush may have archived some of them before the journal was truncated
+            present = journal_tags_in(completed_at)
+            kept = [(task, tag) for task, tag in zip(tasks, tags) if tag not in present]
+            if not kept:
+                return
+            tasks, tags = [task for task, _ in kept], [tag for _, tag in kept]
+        self._pending_archive.append((tasks, completed_at, entry.get("compress", False), tags))
+        self._mark_dirty()
+
+    def _mark_dirty(self):
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
@@ -0,0 +1,262 @@
+import json
+import os
+from datetime import date, datetime, timedelta
+
+from devtime.cache import PLAN_CACHE_DIR
+from devtime.config import CONFIG_FILE
+from devtime.intervals import subtract_intervals
+from devtime.scheduler import Task, build_day_blocks
+from devtime.storage import TASKS_FILE, BUSY_FILE
+from devtime.watch import file_stamps
+
+SLOT_HORIZON_DAYS = 30  # Days searched when no --before date is given (same horizon as the planner)
+SLOT_INDEX_FILE = os.path.join(PLAN_CACHE_DIR, "slots.json")  # Index of the planned calendar, updated as tasks are added
+SLOT_INPUT_FILES = (TASKS_FILE, CONFIG_FILE, BUSY_FILE)  # Files the index is built from
+
+def slot_horizon(now):
+    """Returns the end of the default search horizon (midnight SLOT_HORIZON_DAYS days from now)."""
+    return datetime.combine(now.date() + timedelta(days=SLOT_HORIZON_DAYS), datetime.min.time())
+
+class SlotIndex:
+    """
+    Free time left in the focus blocks of the planned calendar.
+
+    Each leaf is one free piece of a focus block (in whole minutes), in time
+    order. A segment tree keeps the sum and the maximum of free minutes per
+    node, so the earliest placement of a duration (split across blocks, the
+    way the planner splits tasks, or in one contiguous block) is found by a
+    single O(log n) descent, and reserving time updates it in O(log n) per
+    touched block.
+    """
+
+    def __init__(self, pieces):
+        """
+        Initialize a SlotIndex instance.
+
+        Args:
+            pieces (list[tuple]): (date, start_minute, end_minute) free pieces in time order.
+        """
+        self._days = [day for day, _, _ in pieces]
+        self._starts = [start for _, start, _ in pieces]
+        self._ends = [end for _, _, end in pieces]
+        self._size = 1
+        while self._size < max(len(pieces), 1):
+            self._size *= 2
+        self._sum = [0] * (2 * self._size)
+        self._max = [0] * (2 * self._size)
+        for i, (_, start, end) in enumerate(pieces):
+            self._sum[self._size + i] = self._max[self._size + i] = end - start
+        for node in range(self._size - 1, 0, -1):
+            self._pull(node)
+
+    @classmethod
+    def from_plan(cls, schedule_plan, config, availability, now, until=None):
+        """
+        Builds the index from a plan: focus blocks of every working day minus scheduled tasks.
+
+        Args:
+            schedule_plan (dict): Mapping of "YYYY-MM-DD" to (item, start, end) entries.
+            config (dict): User configuration.
+            availability (Availability): Working hours, date overrides and busy blocks.
+            now (datetime): Free time before this moment is ignored.
+            until (datetime, optional): Free time after this moment is ignored.
+                Defaults to SLOT_HORIZON_DAYS days from now.
+
+        Returns:
+            SlotIndex: The index.
+        """
+        if until is None:
+            until = slot_horizon(now)
+        pieces = []
+        day = now.date()
+        while day <= until.date():
+            try:
+                day = availability.next_working_day(day)
+            except RuntimeError:
+                break
+            if day > until.date():
+                break
+            limit = (until - datetime.combine(day, datetime.min.time())).total_seconds() / 3600.0
+            scheduled = sorted((start, end) for item, start, end in schedule_plan.get(day.strftime("%Y-%m-%d"), [])
+                               if isinstance(item, Task))
+            for block in build_day_blocks(day, now, config, availability):
+                if block[0] == "Break":
+                    continue
+                for start, end in subtract_intervals(block[0], min(block[1], limit), scheduled):
+                    start_minute, end_minute = round(start * 60), round(end * 60)
+                    if start_minute < end_minute:
+                        pieces.append((day, start_minute, end_minute))
+            day += timedelta(days=1)
+        return cls(pieces)
+
+    def to_dict(self):
+        """Converts the index to a JSON-serializable dictionary of its free pieces."""
+        return {"pieces": [[day.isoformat(), start, end]
+                           for day, start, end in zip(self._days, self._starts, self._ends) if start < end]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restores an index produced by to_dict."""
+        return cls([(date.fromisoformat(day), start, end) for day, start, end in data["pieces"]])
+
+    def _pull(self, node):
+        left, right = 2 * node, 2 * node + 1
+        self._sum[node] = self._sum[left] + self._sum[right]
+        self._max[node] = max(self._max[left], self._max[right])
+
+    def _set(self, i, free):
+        node = self._size + i
+        self._sum[node] = self._max[node] = free
+        node //= 2
+        while node:
+            self._pull(node)
+            node //= 2
+
+    def free_minutes(self):
+        """Returns the total free minutes in the index."""
+        return self._sum[1]
+
+    def _prefix_leaf(self, minutes):
+        # Leftmost leaf at which the running total of free minutes reaches `minutes`
+        node = 1
+        while node < self._size:
+            if self._sum[2 * node] >= minutes:
+                node = 2 * node
+            else:
+                minutes -= self._sum[2 * node]
+                node = 2 * node + 1
+        return node - self._size
+
+    def _first_fitting_leaf(self, minutes):
+        # Leftmost leaf with at least `minutes` free
+        node = 1
+        while node < self._size:
+            node = 2 * node if self._max[2 * node] >= minutes else 2 * node + 1
+        return node - self._size
+
+    def earliest(self, hours, contiguous=False):
+        """
+        Finds the earliest placement of a duration without reserving it.
+
+        Args:
+            hours (float): Duration to place.
+            contiguous (bool): Require one uninterrupted focus block instead of
+                splitting the duration across blocks like the planner does.
+
+        Returns:
+            list[tuple] or None: (date, start_hour, end_hour) pieces, or None if it does not fit.
+        """
+        return self._place(hours, contiguous, reserve=False)
+
+    def reserve(self, hours, contiguous=False):
+        """
+        Places a duration at the earliest feasible time and removes it from the free time.
+
+        Args:
+            hours (float): Duration to place.
+            contiguous (bool): Require one uninterrupted focus block.
+
+        Returns:
+            list[tuple] or None: (date, start_hour, end_hour) pieces, or None if it does not fit.
+        """
+        return self._place(hours, contiguous, reserve=True)
+
+    def _place(self, hours, contiguous, reserve):
+        minutes = max(1, round(hours * 60))
+        if contiguous:
+            if self._max[1] < minutes:
+                return None
+            first = last = self._first_fitting_leaf(minutes)
+        else:
+            if self._sum[1] < minutes:
+                return None
+            first = self._first_fitting_leaf(1)
+            last = self._prefix_leaf(minutes)
+
+        pieces = []
+        left = minutes
+        for i in range(first, last + 1):
+            free = self._ends[i] - self._starts[i]
+            if not free:
+                continue
+            used = min(free, left)
+            start = self._starts[i]
+            pieces.append((self._days[i], start / 60.0, (start + used) / 60.0))
+            left -= used
+            if reserve:
+                self._starts[i] += used
+                self._set(i, free - used)
+        return pieces
+
+def slot_state(now):
+    """
+    Identifies what a stored index was built from.
+
+    Args:
+        now (datetime): Planning start, truncated to the minute like the plan cache key.
+
+    Returns:
+        list: [planning minute, stamps of the task, config and busy files] in JSON form.
+    """
+    return json.loads(json.dumps([now.strftime("%Y-%m-%d %H:%M"), file_stamps(SLOT_INPUT_FILES)]))
+
+def load_slot_index(state):
+    """
+    Loads the stored index if it was built for the given state.
+
+    Args:
+        state (list): Output of slot_state.
+
+    Returns:
+        SlotIndex or None: The index, or None if it is missing or stale.
+    """
+    try:
+        with open(SLOT_INDEX_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return SlotIndex.from_dict(data) if data.get("state") == state else None
+
+def save_slot_index(index, state):
+    """
+    Stores an index next to the plan cache.
+
+    Args:
+        index (SlotIndex): The index.
+        state (list): Output of slot_state for the inputs the index reflects.
+    """
+    try:
+        os.makedirs(PLAN_CACHE_DIR, exist_ok=True)
+        with open(SLOT_INDEX_FILE + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(dict(index.to_dict(), state=state), f, separators=(",", ":"))
+        os.replace(SLOT_INDEX_FILE + ".tmp", SLOT_INDEX_FILE)
+    except OSError as e:
+        print(f"⚠ Error writing slot index: {e}")
+
+def reserve_added_task(task, state, now, config):
+    """
+    Updates the stored index after a task was added, instead of rebuilding it.
+
+    The planner fills free time from the front, so a new task takes the
+    next `duration` hours of free time whatever its priority; that time is
+    reserved and the index is stored under the new state. A recurring task,
+    a task of a quota-limited project or one that does not fit places time
+    differently, so the index is dropped and rebuilt on the next query.
+
+    Args:
+        task (Task): The task that was just added.
+        state (list): slot_state from before the task was added.
+        now (datetime): Planning start used for `state`.
+        config (dict): User configuration.
+    """
+    index = load_slot_index(state)
+    if index is None:
+        return
+    if task.recurrence or task.project in (config.get("project_quotas") or {}):
+        os.remove(SLOT_INDEX_FILE)
+        return
+    if task.deadline is None or task.deadline >= now:  # Overdue tasks are not planned
+        if index.reserve(task.duration) is None:
+            os.remove(SLOT_INDEX_FILE)
+            return
+    save_slot_index(index, slot_state(now))
@@ -0,0 +1,231 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from devtime.scheduler import Task
+
+MAGIC = b"DTSNAP\x00\x01"
+VERSION = 3
+PRIORITY_CODES = ("high", "medium", "low")
+NO_DEADLINE = -(1 << 63)
+EPOCH = datetime(1970, 1, 1)
+
+# magic, version, record count, index offset, heap offset, source mtime (ns), source size
+HEADER = struct.Struct("<8sIQQQqq")
+# id, duration, deadline (minutes since EPOCH), heap offset, name length, extras length, priority code, flags
+RECORD = struct.Struct("<qdqQIIBB6x")
+# id, record position
+INDEX_ENTRY = struct.Struct("<qQ")
+
+FLAG_INT_DURATION = 1  # Duration was stored as an integer in JSON
+EXTRA_FIELDS = ("recurrence", "assignee", "tags", "project")  # Optional Task attributes, stored as one JSON object in the heap
+
+@lru_cache(maxsize=4096)
+def _parse_deadline(value):
+    # Deadlines repeat a lot across a store, so parsed strings are memoized
+    return datetime.strptime(value.replace("T", " ")[:16], "%Y-%m-%d %H:%M")
+
+def _deadline_minutes(value):
+    if value is None:
+        return NO_DEADLINE
+    if not isinstance(value, datetime):
+        value = _parse_deadline(value)
+    return (value - EPOCH) // timedelta(minutes=1)
+
+def _source_stamp(source_path):
+    stat = os.stat(source_path)
+    return stat.st_mtime_ns, stat.st_size
+
+def write_snapshot(records, snapshot_path, source_path):
+    """
+    Writes a binary snapshot of task records.
+
+    Layout: a fixed-size header, a table of fixed-width records in list
+    order, an index of (id, position) pairs sorted by ID, and a heap with
+    the UTF-8 task names, each followed by the task's optional fields
+    (EXTRA_FIELDS) as a JSON object, if it has any. The header stores the size and modification time
+    of the JSON file the snapshot was built from, to detect staleness.
+
+    Args:
+        records (iterable): Task objects or task dictionaries (as in tasks.json).
+        snapshot_path (str): Path of the snapshot file.
+        source_path (str): The JSON file the records come from.
+    """
+    table = bytearray()
+    heap = bytearray()
+    ids = []
+    for position, record in enumerate(records):
+        if isinstance(record, Task):
+            task = record
+            record = {"id": task.id, "name": task.name, "duration": task.duration,
+                      "deadline": task.deadline, "priority": task.priority}
+            record.update((field, getattr(task, field)) for field in EXTRA_FIELDS)
+        name = record["name"].encode("utf-8")
+        extras = {field: record[field] for field in EXTRA_FIELDS if record.get(field)}
+        extras = json.dumps(extras, separators=(",", ":")).encode("utf-8") if extras else b""
+        duration = record["duration"]
+        flags = FLAG_INT_DURATION if isinstance(duration, int) else 0
+        table += RECORD.pack(record["id"], float(duration), _deadline_minutes(record.get("deadline")),
+                             len(heap), len(name), len(extras), PRIORITY_CODES.index(record["priority"]), flags)
+        heap += name
+        heap += extras
+        ids.append((record["id"], position))
+
+    ids.sort()
+    index = b"".join(INDEX_ENTRY.pack(task_id, position) for task_id, position in ids)
+    index_offset = HEADER.size + len(table)
+    heap_offset = index_offset + len(index)
+    mtime_ns, size = _source_stamp(source_path)
+
+    with open(snapshot_path + ".tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(ids), index_offset, heap_offset, mtime_ns, size))
+        f.write(table)
+        f.write(index)
+        f.write(heap)
+    os.replace(snapshot_path + ".tmp", snapshot_path)
+
+class TaskSnapshot:
+    """
+    Read-only, memory-mapped view of a binary task snapshot.
+
+    Opening maps the file and reads the header only. Tasks are decoded on
+    access, and get() finds a task by ID with a binary search over the
+    embedded sorted index, so its cost does not depend on the store size.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize a TaskSnapshot instance.
+
+        Args:
+            path (str): Path of the snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version.
+        """
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self._count, self._index_offset, self._heap_offset, mtime_ns, size = \
+                HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            self._map.close()
+            raise ValueError(f"'{path}' is not a task snapshot.")
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"'{path}' is not a task snapshot.")
+        self.source_stamp = (mtime_ns, size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Unmaps the file."""
+        self._map.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position):
+        """Decodes the task at a list position."""
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("Snapshot position out of range.")
+        task_id, duration, deadline, heap_offset, name_length, extras_length, priority, flags = \
+            RECORD.unpack_from(self._map, HEADER.size + position * RECORD.size)
+        start = self._heap_offset + heap_offset
+        extras_start = start + name_length
+        task = Task(
+            name=self._map[start:extras_start].decode("utf-8"),
+            duration=int(duration) if flags & FLAG_INT_DURATION else duration,
+            deadline=None if deadline == NO_DEADLINE else EPOCH + timedelta(minutes=deadline),
+            priority=PRIORITY_CODES[priority],
+            task_id=task_id
+        )
+        if extras_length:
+            for field, value in json.loads(self._map[extras_start:extras_start + extras_length]).items():
+                setattr(task, field, value)
+        return task
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self[position]
+
+    def _find(self, task_id):
+        slot = bisect.bisect_left(_IndexView(self), task_id)
+        if slot == self._count:
+            return None
+        found_id, position = INDEX_ENTRY.unpack_from(self._map, self._index_offset + slot * INDEX_ENTRY.size)
+        return position if found_id == task_id else None
+
+    def __contains__(self, task_id):
+        return self._find(task_id) is not None
+
+    def get(self, task_id):
+        """
+        Looks up a task by ID in O(log n).
+
+        Args:
+            task_id (int): The task ID.
+
+        Returns:
+            Task or None: The decoded task, or None if there is no such ID.
+        """
+        position = self._find(task_id)
+        return None if position is None else self[position]
+
+class _IndexView:
+    # Sequence over the sorted IDs of the index, so bisect can search the mapped file directly
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def __len__(self):
+        return self._snapshot._count
+
+    def __getitem__(self, slot):
+        snapshot = self._snapshot
+        return INDEX_ENTRY.unpack_from(snapshot._map, snapshot._index_offset + slot * INDEX_ENTRY.size)[0]
+
+def open_snapshot(source_path, snapshot_path):
+    """
+    Opens the snapshot of a JSON task file, rebuilding it first if it is stale.
+
+    Args:
+        source_path (str): The JSON task file (the interchange format).
+        snapshot_path (str): Path of the snapshot file.
+
+    Returns:
+        TaskSnapshot or None: The snapshot, or None if the JSON file is missing,
+        unreadable or has tasks without IDs.
+    """
+    try:
+        stamp = _source_stamp(source_path)
+    except FileNotFoundError:
+        return None
+
+    try:
+        snapshot = TaskSnapshot(snapshot_path)
+    except (FileNotFoundError, ValueError):
+        snapshot = None
+    if snapshot is not None:
+        if snapshot.source_stamp == stamp:
+            return snapshot
+        snapshot.close()
+
+    try:
+        with open(source_path, "r") as f:
+            records = json.load(f)
+    except json.JSONDecodeError:
+        return None
+    if any(record.get("id") is None for record in records):
+        return None  # IDs are assigned by storage.read_tasks_file on the next regular load
+    write_snapshot(records, snapshot_path, source_path)
+    return TaskSnapshot(snapshot_path)
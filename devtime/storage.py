@@ -1,10 +1,50 @@
+import copy
 import json
+import os
 from datetime import datetime
 from devtime.scheduler import Task
+from devtime.snapshot import open_snapshot, write_snapshot
+from devtime.jsonstream import iter_json_array, select_records
+from devtime.tags import TagIndex
+from devtime.completion import COMPLETION_FILE, write_completion_index
+from devtime.changelog import ensure_started, record
 
 TASKS_FILE = "tasks.json"  # File to store tasks
 SCHEDULES_FILE = "schedules.json"  # File to store schedule history
 COMPLETED_TASKS_FILE = "completed_tasks.json"  # File to store completed tasks
+BUSY_FILE = "busy.json"  # File to store busy blocks imported from calendars
+SNAPSHOT_FILE = "tasks.snap"  # Optional memory-mapped binary snapshot of TASKS_FILE
+TAG_INDEX_FILE = "tags.index"  # Bitset tag/project index of TASKS_FILE, rebuilt when stale
+
+_active_session = None  # In-memory session (see devtime.session) that load/save calls go through
+_written = None  # (TASKS_FILE stamp, {id: task dict}) as last written by this process
+
+def set_active_session(session):
+    """
+    Routes load_tasks/save_tasks through an in-memory session, or back to disk.
+
+    Args:
+        session (TaskSession or None): The session to activate, or None to deactivate.
+    """
+    global _active_session
+    _active_session = session
+
+def get_active_session():
+    """Returns the active in-memory session, if any."""
+    return _active_session
+
+def after_commit(callback, *args):
+    """
+    Runs a side effect now, or after the active transactional session commits.
+
+    Args:
+        callback (callable): The side effect.
+        *args: Arguments passed to the callback.
+    """
+    if _active_session is not None:
+        _active_session.defer(callback, *args)
+    else:
+        callback(*args)
 
 def task_to_dict(task):
     """
@@ -16,13 +56,25 @@ def task_to_dict(task):
     Returns:
         dict: Dictionary representation of the task.
     """
-    return {
+    data = {
         "name": task.name,
         "duration": task.duration,
         "deadline": task.deadline.strftime("%Y-%m-%d %H:%M") if isinstance(task.deadline, datetime) else task.deadline,
         "priority": task.priority,
         "id": task.id
     }
+    # Optional keys are only written when set, so one-off tasks keep the original format
+    if task.recurrence:
+        data["recurrence"] = copy.deepcopy(task.recurrence)
+    if task.occurrence:
+        data["occurrence"] = task.occurrence
+    if task.assignee:
+        data["assignee"] = task.assignee
+    if task.tags:
+        data["tags"] = list(task.tags)
+    if task.project:
+        data["project"] = task.project
+    return data
 
 def schedule_to_dict(schedule_date, tasks):
     """
@@ -63,27 +115,226 @@ def dict_to_task(data):
         except ValueError:
             deadline_dt = datetime.strptime(deadline_str, "%Y-%m-%d %H:%M")
 
-    return Task(
+    task = Task(
         name=data["name"],
         duration=data["duration"],
         deadline=deadline_dt.strftime("%Y-%m-%d %H:%M") if deadline_dt else None,
         priority=data["priority"],
-        task_id=data.get("id")
+        task_id=data.get("id"),
+        recurrence=data.get("recurrence"),
+        tags=data.get("tags"),
+        project=data.get("project")
     )
+    task.occurrence = data.get("occurrence")
+    task.assignee = data.get("assignee")
+    return task
 
 def save_tasks(tasks):
     """
     Saves a list of tasks to the tasks JSON file.
 
+    While a session is active, the change is recorded in memory and in the
+    session journal instead; the file is written when the session flushes.
+    The difference to the stored tasks is appended to the change log.
+
     Args:
         tasks (list[Task]): The tasks to save.
     """
+    if _active_session is not None:
+        _active_session.save_tasks(tasks)
+        return
+    before = _written[1] if _written is not None and _written[0] == _tasks_file_stamp() else \
+        {task.id: task_to_dict(task) for task in read_tasks_file()}
+    after = {task.id: task_to_dict(task) for task in tasks}
+    ensure_started(lambda: list(before.values()))
+    record([(task_id, before.get(task_id), task) for task_id, task in after.items()] +
+           [(task_id, task, None) for task_id, task in before.items() if task_id not in after])
+    write_tasks_file(tasks)
+
+def _tasks_file_stamp():
     try:
-        with open(TASKS_FILE, "w") as f:
-            json.dump([task_to_dict(task) for task in tasks], f, indent=4)
+        stat = os.stat(TASKS_FILE)
+        return os.path.abspath(TASKS_FILE), stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        return None
+
+def write_tasks_file(tasks):
+    """
+    Writes a list of tasks to the tasks JSON file, bypassing any active session.
+
+    The file is written under a temporary name, synced and swapped in, so a
+    crash leaves either the old or the new file, never a torn one.
+
+    Args:
+        tasks (list[Task]): The tasks to save.
+    """
+    global _written
+    _written = None
+    try:
+        data = [task_to_dict(task) for task in tasks]
+        with open(TASKS_FILE + ".tmp", "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(TASKS_FILE + ".tmp", TASKS_FILE)
+        if all(task.id is not None for task in tasks):
+            _written = (_tasks_file_stamp(), {d["id"]: d for d in data})
+        if os.path.exists(SNAPSHOT_FILE) and all(task.id is not None for task in tasks):
+            write_snapshot(tasks, SNAPSHOT_FILE, TASKS_FILE)
+        if os.path.exists(TAG_INDEX_FILE):
+            os.remove(TAG_INDEX_FILE)  # Rebuilt on the next tag query
+        write_completion_index(tasks, COMPLETION_FILE)
     except IOError as e:
         print(f"Error saving tasks: {e}")
 
+def load_snapshot():
+    """
+    Opens the binary snapshot of the task store, if snapshots are enabled.
+
+    Snapshots are enabled while SNAPSHOT_FILE exists (see build_snapshot).
+    A snapshot older than tasks.json is rebuilt before it is returned.
+
+    Returns:
+        TaskSnapshot or None: The open snapshot (close it after use), or None.
+    """
+    if not os.path.exists(SNAPSHOT_FILE):
+        return None
+    return open_snapshot(TASKS_FILE, SNAPSHOT_FILE)
+
+def build_snapshot():
+    """
+    Enables snapshots by building SNAPSHOT_FILE from the tasks JSON file.
+
+    Returns:
+        int: Number of tasks in the snapshot.
+    """
+    snapshot = open_snapshot(TASKS_FILE, SNAPSHOT_FILE)
+    if snapshot is None:
+        # Missing file or tasks without IDs: take the regular path, which assigns them
+        remove_snapshot()
+        tasks = read_tasks_file()
+        write_tasks_file(tasks)
+        write_snapshot(tasks, SNAPSHOT_FILE, TASKS_FILE)
+        return len(tasks)
+    with snapshot:
+        return len(snapshot)
+
+def remove_snapshot():
+    """Disables snapshots by deleting SNAPSHOT_FILE."""
+    if os.path.exists(SNAPSHOT_FILE):
+        os.remove(SNAPSHOT_FILE)
+
+def get_tasks(task_ids):
+    """
+    Returns the active tasks with the given IDs, in the requested order.
+
+    Args:
+        task_ids (iterable[int]): IDs to look up.
+
+    Returns:
+        list[Task]: Matching tasks (copies while a session is active).
+    """
+    if _active_session is not None:
+        return _active_session.get_tasks(task_ids)
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        with snapshot:
+            found = (snapshot.get(task_id) for task_id in dict.fromkeys(task_ids))
+            return [task for task in found if task is not None]
+    by_id = {task.id: task for task in load_tasks()}
+    return [by_id[task_id] for task_id in dict.fromkeys(task_ids) if task_id in by_id]
+
+def load_tag_index():
+    """
+    Returns the bitset tag index of the active tasks.
+
+    The index is kept in TAG_INDEX_FILE together with the size and
+    modification time of the tasks file, and rebuilt in one streaming pass
+    when the tasks file has changed since. While a session is active it is
+    built from the in-memory tasks instead.
+
+    Returns:
+        TagIndex: The index.
+    """
+    if _active_session is not None:
+        return TagIndex.from_records(_active_session.load_tasks())
+    try:
+        stat = os.stat(TASKS_FILE)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+    except FileNotFoundError:
+        return TagIndex()
+    try:
+        with open(TAG_INDEX_FILE, "r") as f:
+            data = json.load(f)
+        if data.get("stamp") == stamp:
+            return TagIndex.from_dict(data)
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
+        pass
+
+    index = TagIndex.from_records(iter_tasks(fields=["id", "tags", "project"]))
+    try:
+        with open(TAG_INDEX_FILE, "w") as f:
+            json.dump(dict(index.to_dict(), stamp=stamp), f)
+    except IOError as e:
+        print(f"Error saving tag index: {e}")
+    return index
+
+def filter_tasks(all_tags=(), any_tags=(), project=None):
+    """
+    Returns the active tasks matching a tag/project filter, through the tag index.
+
+    Args:
+        all_tags (iterable[str]): Tags a task must all carry.
+        any_tags (iterable[str]): Tags of which a task must carry at least one (ignored if empty).
+        project (str, optional): Project the task must belong to.
+
+    Returns:
+        list[Task]: Matching tasks, in store order.
+    """
+    return get_tasks(load_tag_index().find(all_tags, any_tags, project))
+
+def upsert_tasks(tasks):
+    """
+    Adds new tasks or replaces existing ones with the same ID.
+
+    With an active session this costs O(len(tasks)); otherwise the file is
+    loaded and rewritten once.
+
+    Args:
+        tasks (list[Task]): Tasks to add or replace.
+    """
+    if _active_session is not None:
+        _active_session.upsert_tasks(tasks)
+        return
+    by_id = {task.id: task for task in tasks}
+    current = load_tasks()
+    before = {task.id: task_to_dict(task) for task in current if task.id in by_id}
+    ensure_started(lambda: [task_to_dict(task) for task in current])
+    record([(task_id, before.get(task_id), task_to_dict(task)) for task_id, task in by_id.items()])
+    merged = [by_id.pop(task.id, task) for task in current]
+    write_tasks_file(merged + list(by_id.values()))
+
+def remove_tasks(task_ids):
+    """
+    Removes active tasks by ID.
+
+    Args:
+        task_ids (iterable[int]): IDs to remove.
+
+    Returns:
+        list[Task]: The removed tasks.
+    """
+    task_ids = set(task_ids)
+    if _active_session is not None:
+        return _active_session.remove_tasks(task_ids)
+    tasks = load_tasks()
+    removed = [task for task in tasks if task.id in task_ids]
+    if removed:
+        ensure_started(lambda: [task_to_dict(task) for task in tasks])
+        record([(task.id, task_to_dict(task), None) for task in removed])
+        write_tasks_file([task for task in tasks if task.id not in task_ids])
+    return removed
+
 def save_schedule(schedule_date, tasks):
     """
     Saves a schedule by appending a new entry to the schedule history.
@@ -121,9 +372,28 @@ def load_tasks():
     """
     Loads tasks from the tasks JSON file and converts them into Task objects.
 
+    While a session is active, the in-memory tasks are returned instead.
+
+    Returns:
+        list[Task]: List of tasks.
+    """
+    if _active_session is not None:
+        return _active_session.load_tasks()
+    return read_tasks_file()
+
+def read_tasks_file():
+    """
+    Reads tasks from the tasks JSON file, bypassing any active session.
+
+    When snapshots are enabled, the tasks are decoded from the snapshot instead.
+
     Returns:
         list[Task]: List of tasks.
     """
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        with snapshot:
+            return list(snapshot)
     try:
         with open(TASKS_FILE, "r") as f:
             data = json.load(f)
@@ -134,6 +404,37 @@ def load_tasks():
         print("⚠ Warning: tasks.json is empty or corrupted. Resetting task list.")
         return []
 
+def _iter_json_file(path):
+    try:
+        f = open(path, "r")
+    except FileNotFoundError:
+        return
+    with f:
+        yield from iter_json_array(f)
+
+def iter_tasks(where=None, fields=None):
+    """
+    Yields active tasks one at a time, in constant memory.
+
+    Args:
+        where (callable, optional): Predicate on the raw task dictionary.
+            Tasks it rejects are never turned into Task objects.
+        fields (list[str], optional): Yield dictionaries with only these keys instead of Task objects.
+
+    Yields:
+        Task or dict: Matching tasks.
+    """
+    if _active_session is not None:
+        records = (task_to_dict(task) for task in _active_session.load_tasks())
+        yield from select_records(records, where, fields, dict_to_task)
+        return
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        with snapshot:
+            yield from select_records((task_to_dict(task) for task in snapshot), where, fields, dict_to_task)
+        return
+    yield from select_records(_iter_json_file(TASKS_FILE), where, fields, dict_to_task)
+
 def load_schedules():
     """
     Loads the list of saved schedules from the schedules JSON file.
@@ -151,6 +452,19 @@ def load_schedules():
         print("Warning: JSON file is corrupted. Resetting schedule list.")
         return []
 
+def iter_schedules(where=None, fields=None):
+    """
+    Yields saved schedules one at a time, in constant memory.
+
+    Args:
+        where (callable, optional): Predicate on the schedule dictionary.
+        fields (list[str], optional): Yield dictionaries with only these keys.
+
+    Yields:
+        dict: Matching schedules.
+    """
+    yield from select_records(_iter_json_file(SCHEDULES_FILE), where, fields)
+
 def load_completed_tasks():
     """
     Loads completed tasks from the completed tasks JSON file.
@@ -165,6 +479,40 @@ def load_completed_tasks():
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
+def save_busy_blocks(blocks):
+    """
+    Saves busy calendar blocks to the busy JSON file.
+
+    Args:
+        blocks (iterable[tuple]): (start datetime, end datetime, summary) tuples.
+    """
+    data = [
+        {"start": start.strftime("%Y-%m-%d %H:%M"), "end": end.strftime("%Y-%m-%d %H:%M"), "summary": summary}
+        for start, end, summary in blocks
+    ]
+    try:
+        with open(BUSY_FILE, "w") as f:
+            json.dump(data, f, indent=4)
+    except IOError as e:
+        print(f"⚠ Error saving busy blocks: {e}")
+
+def load_busy_blocks():
+    """
+    Loads busy calendar blocks from the busy JSON file.
+
+    Returns:
+        list[tuple]: (start datetime, end datetime, summary) tuples.
+    """
+    try:
+        with open(BUSY_FILE, "r") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+    return [
+        (datetime.strptime(d["start"], "%Y-%m-%d %H:%M"), datetime.strptime(d["end"], "%Y-%m-%d %H:%M"), d.get("summary", ""))
+        for d in data
+    ]
+
 import random
 
 def generate_task_id():
@@ -173,10 +521,19 @@ def generate_task_id():
     Returns:
         int: A unique 5-digit task ID.
     """
+    if _active_session is not None:
+        return _random_free_id(_active_session.has_task)
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        with snapshot:
+            return _random_free_id(snapshot.__contains__)
     existing_ids = {task.id for task in load_tasks()}  # All existing task IDs
+    return _random_free_id(existing_ids.__contains__)
+
+def _random_free_id(id_exists):
     while True:
         new_id = random.randint(10000, 99999)  # Generate a 5-digit ID
-        if new_id not in existing_ids:
+        if not id_exists(new_id):
             return new_id
 
 def assign_task_ids(tasks):
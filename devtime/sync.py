@@ -0,0 +1,233 @@
+import gzip
+import json
+import os
+import uuid
+from datetime import datetime
+
+from devtime.config import load_config
+from devtime.changelog import change_group, ensure_started, initial_state, iter_events, last_seq
+from devtime.history import archive_completed, iter_completed
+from devtime.storage import get_tasks, load_tasks, upsert_tasks, remove_tasks, task_to_dict, dict_to_task
+
+SYNC_FILE = "sync.json"  # This store's replica ID and the sync position of each peer
+BUNDLE_FORMAT = 1  # Version of the delta bundle layout
+
+def load_sync_state():
+    """
+    Loads the sync state, creating a replica ID for this store on first use.
+
+    Returns:
+        dict: {"replica": str, "peers": {replica: {"sent": int, "received": int}}}.
+            "sent" is the last change of this store the peer has confirmed;
+            "received" is the last change of the peer applied here.
+    """
+    try:
+        with open(SYNC_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        state = {"replica": uuid.uuid4().hex[:12], "peers": {}}
+        save_sync_state(state)
+        return state
+
+def save_sync_state(state):
+    """Saves the sync state."""
+    with open(SYNC_FILE + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4)
+    os.replace(SYNC_FILE + ".tmp", SYNC_FILE)
+
+def _changes_since(seq):
+    # Change log events after seq; from the start, the first snapshot counts as creating its tasks
+    if seq == 0:
+        snapshot = initial_state()
+        yield {"at": snapshot["at"], "changes": [[task["id"], None, task] for task in snapshot["tasks"]]}
+    yield from iter_events(seq)
+
+def _fold(events, replica):
+    """
+    Folds change log events into the net change of each task, with per-field stamps.
+
+    A stamp is [time, replica] of the edit that set the value; changes
+    applied by an earlier sync keep the stamp they arrived with.
+
+    Returns:
+        tuple: ({task_id: {"fields": {field: [value, time, replica]}, "created": stamp,
+                 "deleted": stamp, "before": dict}}, [archived batches]).
+    """
+    tasks = {}
+    archived = []
+    for event in events:
+        local = [event["at"], replica]
+        stamps = event.get("stamps", {})
+        for task_id, before, after in event["changes"]:
+            key = str(task_id)
+            entry = tasks.setdefault(key, {"fields": {}})
+            field_stamps = stamps.get(key, {})
+            if after is None:
+                entry["fields"] = {}
+                entry.pop("created", None)
+                entry["deleted"] = event.get("deleted", {}).get(key, local)
+                entry["before"] = before
+                continue
+            entry.pop("deleted", None)
+            if before is None:
+                entry["created"] = field_stamps.get("name", local)
+                changed = after.keys()
+            else:
+                changed = [field for field in before.keys() | after.keys() if before.get(field) != after.get(field)]
+            for field in changed:
+                if field != "id":
+                    entry["fields"][field] = [after.get(field), *field_stamps.get(field, local)]
+        if event.get("archived"):
+            archived.append({"completed_at": event["completed_at"], "tasks": event["archived"],
+                             "origin": event.get("origin", replica)})
+    return tasks, archived
+
+def export_bundle(peer=None):
+    """
+    Builds a delta bundle with the changes a peer has not confirmed yet.
+
+    Only the change log after the peer's last confirmed change is read, and
+    values the peer itself sent are left out, so the bundle grows with what
+    changed rather than with the store.
+
+    Args:
+        peer (str, optional): Replica ID of the receiving store. Without it, every change is exported.
+
+    Returns:
+        dict: The bundle.
+    """
+    state = load_sync_state()
+    ensure_started(lambda: [task_to_dict(task) for task in load_tasks()])
+    since = state["peers"].get(peer, {}).get("sent", 0) if peer else 0
+    upto = last_seq()
+    tasks, archived = _fold(_changes_since(since), state["replica"])
+
+    if peer:
+        for key, entry in list(tasks.items()):
+            entry["fields"] = {field: value for field, value in entry["fields"].items() if value[2] != peer}
+            if entry.get("created", [None, None])[1] == peer:
+                del entry["created"]
+            if entry.get("deleted", [None, None])[1] == peer:
+                del entry["deleted"]
+            if not entry["fields"] and "deleted" not in entry:
+                del tasks[key]
+        archived = [batch for batch in archived if batch["origin"] != peer]
+
+    for entry in tasks.values():
+        entry.pop("before", None)
+    return {
+        "format": BUNDLE_FORMAT,
+        "replica": state["replica"],
+        "since": since,
+        "upto": upto,
+        "ack": {replica: position["received"] for replica, position in state["peers"].items()},
+        "tasks": tasks,
+        "completed": [{"completed_at": batch["completed_at"], "tasks": batch["tasks"]} for batch in archived],
+    }
+
+def write_bundle(bundle, path):
+    """Writes a bundle as gzip-compressed JSON."""
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(bundle, f, separators=(",", ":"))
+
+def read_bundle(path):
+    """Reads a bundle written by write_bundle."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+def _resolve(key, change, mine, task):
+    # Merges one incoming task change into the local task dict; returns (task or None, winning stamps)
+    local_fields = mine.get("fields", {})
+    if "deleted" in change:
+        if task is not None and all(change["deleted"] > value[1:] for value in local_fields.values()):
+            return None, {}
+        return task, {}
+
+    if task is None:
+        newest = max((value[1:] for value in change["fields"].values()), default=None)
+        if "deleted" in mine and (newest is None or newest <= mine["deleted"]):
+            return None, {}  # Deleted here after the peer's edits
+        if "deleted" in mine:
+            task = dict(mine["before"])  # An edit made after the deletion brings the task back
+        elif "created" in change:
+            task = {"id": int(key)}
+        else:
+            return None, {}
+
+    winners = {}
+    for field, (value, *stamp) in change["fields"].items():
+        ours = local_fields.get(field)
+        if ours is not None and ours[1:] >= stamp:
+            continue  # The later edit wins; ties go to the higher replica ID
+        winners[field] = stamp
+        if value is None:
+            task.pop(field, None)
+        else:
+            task[field] = value
+    return task, winners
+
+def apply_bundle(bundle):
+    """
+    Applies a peer's delta bundle to this store.
+
+    Each field is resolved on its own: the value with the later stamp wins
+    and equal times are decided by the replica ID, so both stores reach the
+    same state whichever syncs first. A deletion wins over edits made before
+    it; an edit made after a deletion restores the task. Only this store's
+    changes the peer has not confirmed are read to find conflicts.
+
+    Args:
+        bundle (dict): Output of export_bundle on the peer.
+
+    Returns:
+        dict: Counts of "updated", "deleted" and "completed" tasks and "kept" local values.
+
+    Raises:
+        ValueError: If the bundle comes from this store, has another format or skips changes not received yet.
+    """
+    state = load_sync_state()
+    peer = bundle.get("replica")
+    if bundle.get("format") != BUNDLE_FORMAT:
+        raise ValueError("Unsupported bundle format.")
+    if peer == state["replica"]:
+        raise ValueError("This bundle was exported by this store.")
+    position = state["peers"].setdefault(peer, {"sent": 0, "received": 0})
+    if bundle["since"] > position["received"]:
+        raise ValueError(f"The bundle starts after change {bundle['since']} of the peer, but only "
+                         f"{position['received']} were received here. Export a full bundle on the peer.")
+    ensure_started(lambda: [task_to_dict(task) for task in load_tasks()])
+    position["sent"] = max(position["sent"], bundle["ack"].get(state["replica"], 0))
+
+    local, _ = _fold(_changes_since(position["sent"]), state["replica"])
+    current = {str(task.id): task_to_dict(task) for task in get_tasks(int(key) for key in bundle["tasks"])}
+    put, delete, stamps, deleted = [], [], {}, {}
+    kept = 0
+    for key, change in bundle["tasks"].items():
+        task, winners = _resolve(key, change, local.get(key, {}), current.get(key))
+        kept += len(change["fields"]) - len(winners)
+        if task is None and key in current:
+            delete.append(int(key))
+            deleted[key] = change["deleted"]
+        elif winners:
+            put.append(task)
+            stamps[key] = winners
+
+    completed = 0
+    with change_group("sync", origin=peer, stamps=stamps, deleted=deleted):
+        if put:
+            upsert_tasks([dict_to_task(task) for task in put])
+        if delete:
+            remove_tasks(delete)
+        for batch in bundle["completed"]:
+            completed_at = datetime.strptime(batch["completed_at"], "%Y-%m-%d %H:%M")
+            day = completed_at.date()
+            archived = {record["id"] for record in iter_completed(
+                day, day, where=lambda record: record["completed_at"] == batch["completed_at"], fields=["id"])}
+            new = [dict_to_task(task) for task in batch["tasks"] if task["id"] not in archived]
+            if new:
+                archive_completed(new, completed_at, compress=load_config().get("compress_history", False))
+                completed += len(new)
+
+    position["received"] = max(position["received"], bundle["upto"])
+    save_sync_state(state)
+    return {"updated": len(put), "deleted": len(delete), "completed": completed, "kept": kept}
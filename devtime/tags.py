@@ -0,0 +1,163 @@
+import re
+
+_TAG_SPLIT = re.compile(r"[,\s]+")
+
+def normalize_tags(tags):
+    """
+    Normalizes tags given as a comma-separated string or a list.
+
+    Args:
+        tags (str or iterable[str] or None): Raw tags.
+
+    Returns:
+        list[str]: Sorted, lowercase, de-duplicated tags.
+    """
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = _TAG_SPLIT.split(tags)
+    return sorted({tag.strip().lower().lstrip("#") for tag in tags if tag.strip().lstrip("#")})
+
+def _iter_bits(bits):
+    # Positions of the set bits, lowest first, in O(set bits)
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+def _to_bitset(rows):
+    # Bitset of ascending row numbers, built once from a byte array instead of one big OR per row
+    if not rows:
+        return 0
+    bits = bytearray((rows[-1] >> 3) + 1)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, "little")
+
+class TagIndex:
+    """
+    Bitset index of task tags and projects.
+
+    Every task gets a row; each tag and each project maps to an integer
+    whose bit i is set when row i carries it. AND/OR filters are then a few
+    big-integer operations over the whole store instead of a scan of every
+    task, and only matching rows are turned back into IDs.
+    """
+
+    def __init__(self, ids=None, tags=None, projects=None):
+        """
+        Initialize a TagIndex instance.
+
+        Args:
+            ids (list[int], optional): Task ID of every row.
+            tags (dict, optional): {tag: bitset of rows}.
+            projects (dict, optional): {project: bitset of rows}.
+        """
+        self.ids = ids if ids is not None else []
+        self.tags = tags if tags is not None else {}
+        self.projects = projects if projects is not None else {}
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds the index from raw task dictionaries or Task objects.
+
+        Row numbers are collected per tag and project first and each bitset
+        is built once at the end, so the build is linear in the store size.
+
+        Args:
+            records (iterable): Items with "id", "tags" and "project" keys or attributes.
+
+        Returns:
+            TagIndex: The index.
+        """
+        ids, tag_rows, project_rows = [], {}, {}
+        for row, record in enumerate(records):
+            if isinstance(record, dict):
+                task_id, tags, project = record.get("id"), record.get("tags"), record.get("project")
+            else:
+                task_id, tags, project = record.id, record.tags, record.project
+            ids.append(task_id)
+            for tag in tags or ():
+                tag_rows.setdefault(tag, []).append(row)
+            if project:
+                project_rows.setdefault(project, []).append(row)
+        return cls(ids,
+                   {tag: _to_bitset(rows) for tag, rows in tag_rows.items()},
+                   {project: _to_bitset(rows) for project, rows in project_rows.items()})
+
+    def add(self, task_id, tags=None, project=None):
+        """
+        Adds a task as the next row.
+
+        Each call rewrites the bitsets of the task's tags; use from_records
+        to build an index of many tasks.
+
+        Args:
+            task_id (int): The task ID.
+            tags (list[str], optional): The task's tags.
+            project (str, optional): The task's project.
+        """
+        bit = 1 << len(self.ids)
+        self.ids.append(task_id)
+        for tag in tags or ():
+            self.tags[tag] = self.tags.get(tag, 0) | bit
+        if project:
+            self.projects[project] = self.projects.get(project, 0) | bit
+
+    def match(self, all_tags=(), any_tags=(), project=None):
+        """
+        Returns the bitset of rows matching a filter.
+
+        Args:
+            all_tags (iterable[str]): Tags a task must all carry.
+            any_tags (iterable[str]): Tags of which a task must carry at least one (ignored if empty).
+            project (str, optional): Project the task must belong to.
+
+        Returns:
+            int: Bitset of matching rows.
+        """
+        bits = (1 << len(self.ids)) - 1
+        for tag in all_tags:
+            bits &= self.tags.get(tag, 0)
+        if any_tags:
+            either = 0
+            for tag in any_tags:
+                either |= self.tags.get(tag, 0)
+            bits &= either
+        if project is not None:
+            bits &= self.projects.get(project, 0)
+        return bits
+
+    def find(self, all_tags=(), any_tags=(), project=None):
+        """
+        Returns the IDs of the tasks matching a filter (see match), in store order.
+        """
+        return [self.ids[row] for row in _iter_bits(self.match(all_tags, any_tags, project))]
+
+    def counts(self):
+        """
+        Returns the number of tasks per tag and per project.
+
+        Returns:
+            tuple: ({tag: count}, {project: count})
+        """
+        return ({tag: bin(bits).count("1") for tag, bits in self.tags.items()},
+                {project: bin(bits).count("1") for project, bits in self.projects.items()})
+
+    def to_dict(self):
+        """Converts the index to a JSON-serializable dictionary (bitsets as hex strings)."""
+        return {
+            "ids": self.ids,
+            "tags": {tag: format(bits, "x") for tag, bits in self.tags.items()},
+            "projects": {project: format(bits, "x") for project, bits in self.projects.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restores an index produced by to_dict."""
+        return cls(
+            data["ids"],
+            {tag: int(bits, 16) for tag, bits in data["tags"].items()},
+            {project: int(bits, 16) for project, bits in data["projects"].items()},
+        )
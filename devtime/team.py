@@ -0,0 +1,222 @@
+import copy
+import heapq
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from devtime.availability import Availability
+from devtime.scheduler import plan_tasks, expand_occurrences, build_day_blocks
+
+TEAM_FILE = "team.json"  # File to store team members, their skills and work hours
+TEAM_HORIZON_DAYS = 30  # Days of capacity considered when assigning (same horizon as the planner)
+PERSON_SETTINGS = ("work_hours", "date_overrides", "max_concentration_hours", "min_break_minutes")
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+def load_team():
+    """
+    Loads the team members.
+
+    Returns:
+        dict: {name: {"skills": [...], optional work settings}}
+    """
+    try:
+        with open(TEAM_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_team(team):
+    """Saves the team members."""
+    with open(TEAM_FILE, "w") as f:
+        json.dump(team, f, indent=4)
+
+def person_config(config, profile):
+    """
+    Returns the planning configuration of one person.
+
+    Work settings in the person's profile replace the shared configuration.
+
+    Args:
+        config (dict): Shared user configuration.
+        profile (dict): The person's entry in the team file.
+
+    Returns:
+        dict: The person's configuration.
+    """
+    merged = copy.deepcopy(config)
+    for key in PERSON_SETTINGS:
+        if key in profile:
+            merged[key] = profile[key]
+    return merged
+
+def task_skills(task, vocabulary):
+    """
+    Returns the skills a task needs: its tags and the words of its name that are some team member's skill.
+
+    Args:
+        task (Task): The task.
+        vocabulary (set[str]): All skills in the team, lowercase.
+
+    Returns:
+        frozenset[str]: Required skills.
+    """
+    words = set(re.findall(r"[a-zа-яіїєґ0-9+#]+", task.name.lower())).union(task.tags)
+    return frozenset(word for word in words if word in vocabulary)
+
+def edf_key(task):
+    """Earliest deadline first, then priority; tasks without a deadline go last."""
+    return (task.deadline is None, task.deadline or datetime.max, PRIORITY_RANK.get(task.priority, 1), task.id)
+
+class Capacity:
+    """Focus hours a person has between the planning start and any deadline in the horizon."""
+
+    def __init__(self, config, now, horizon_days=TEAM_HORIZON_DAYS):
+        """
+        Initialize a Capacity instance.
+
+        Args:
+            config (dict): The person's configuration.
+            now (datetime): Planning start.
+            horizon_days (int): Days to precompute.
+        """
+        availability = Availability(config)
+        self.start = now.date()
+        self.day_blocks = []
+        self.before_day = [0.0]  # before_day[i]: focus hours on days before start + i
+        for offset in range(horizon_days):
+            day = self.start + timedelta(days=offset)
+            blocks = []
+            if availability.hours_for(day) is not None:
+                blocks = [block for block in build_day_blocks(day, now, config, availability) if block[0] != "Break"]
+            self.day_blocks.append(blocks)
+            self.before_day.append(self.before_day[-1] + sum(end - start for start, end in blocks))
+
+    @property
+    def total(self):
+        """Focus hours in the whole horizon."""
+        return self.before_day[-1]
+
+    def until(self, deadline):
+        """
+        Returns the focus hours available before a deadline, in O(blocks per day).
+
+        Args:
+            deadline (datetime or None): The deadline. None means the whole horizon.
+        """
+        if deadline is None:
+            return self.total
+        offset = (deadline.date() - self.start).days
+        if offset < 0:
+            return 0.0
+        if offset >= len(self.day_blocks):
+            return self.total
+        hour = deadline.hour + deadline.minute / 60.0
+        partial = sum(max(0.0, min(end, hour) - start) for start, end in self.day_blocks[offset])
+        return self.before_day[offset] + partial
+
+def assign_tasks(tasks, team, config, now):
+    """
+    Distributes tasks across the team.
+
+    Tasks are processed earliest-deadline-first. A task that already has an
+    assignee stays with them. Any other task goes to the least-loaded person
+    who has the skills it needs and can still finish it before its deadline.
+    If nobody can, it goes to the least-loaded skilled person and is
+    reported as at risk. A lazy min-heap of (load, name) per distinct skill
+    requirement finds that person in O(log n) amortized.
+
+    Args:
+        tasks (iterable[Task]): Tasks (and recurring occurrences) to distribute.
+        team (dict): Team members (see load_team).
+        config (dict): Shared user configuration.
+        now (datetime): Planning start.
+
+    Returns:
+        dict: {"assignments": {name: [Task]}, "at_risk": [Task], "unassignable": [Task]}
+    """
+    vocabulary = {skill.lower() for profile in team.values() for skill in profile.get("skills", [])}
+    skills = {name: {skill.lower() for skill in profile.get("skills", [])} for name, profile in team.items()}
+    capacity = {name: Capacity(person_config(config, profile), now) for name, profile in team.items()}
+    load = {name: 0.0 for name in team}
+    assignments = {name: [] for name in team}
+    heaps = {}  # required skills -> [(load, name)], refreshed lazily
+    result = {"assignments": assignments, "at_risk": [], "unassignable": []}
+
+    for task in sorted(tasks, key=edf_key):
+        if task.assignee in team:
+            assignments[task.assignee].append(task)
+            load[task.assignee] += task.duration
+            continue
+
+        required = task_skills(task, vocabulary)
+        heap = heaps.get(required)
+        if heap is None:
+            heap = [(load[name], name) for name in team if required <= skills[name]]
+            heapq.heapify(heap)
+            heaps[required] = heap
+        if not heap:
+            result["unassignable"].append(task)
+            continue
+
+        # Pop candidates in load order until one can meet the deadline
+        popped = []
+        chosen = None
+        while heap:
+            entry_load, name = heapq.heappop(heap)
+            if entry_load != load[name]:
+                heapq.heappush(heap, (load[name], name))  # Stale entry
+                continue
+            popped.append(name)
+            if load[name] + task.duration <= capacity[name].until(task.deadline) + 1e-9:
+                chosen = name
+                break
+        if chosen is None:
+            chosen = popped[0]
+            result["at_risk"].append(task)
+
+        assignments[chosen].append(task)
+        load[chosen] += task.duration
+        for name in popped:
+            heapq.heappush(heap, (load[name], name))
+
+    return result
+
+def _plan_person(job):
+    name, tasks, config, now = job
+    return name, plan_tasks(tasks, config, now)
+
+def plan_team(tasks, team, config, now=None, workers=None):
+    """
+    Assigns tasks across the team and plans every person's timeline.
+
+    Recurring series are expanded to their occurrences in the planning
+    horizon before they are distributed. Each person's timeline is
+    independent, so they are planned in parallel worker processes.
+
+    Args:
+        tasks (list[Task]): Active tasks.
+        team (dict): Team members (see load_team).
+        config (dict): Shared user configuration.
+        now (datetime, optional): Planning start. Defaults to the current time.
+        workers (int, optional): Worker processes. 1 plans in this process;
+            None uses one per CPU.
+
+    Returns:
+        tuple: (plans, result) where plans maps a name to (schedule_plan, remaining_tasks)
+        and result is the output of assign_tasks.
+    """
+    if now is None:
+        now = datetime.now()
+    expanded = [task for task in expand_occurrences(tasks, now, now + timedelta(days=TEAM_HORIZON_DAYS))
+                if task.deadline is None or task.deadline >= now]
+    result = assign_tasks(expanded, team, config, now)
+    jobs = [(name, assigned, person_config(config, team[name]), now)
+            for name, assigned in result["assignments"].items()]
+
+    if workers == 1 or len(jobs) <= 1:
+        plans = dict(map(_plan_person, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            plans = dict(executor.map(_plan_person, jobs))
+    return plans, result
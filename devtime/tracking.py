@@ -0,0 +1,215 @@
+import json
+import math
+import os
+from datetime import datetime
+
+from devtime.scheduler import task_keywords
+
+TIMELOG_FILE = "timelog.log"  # Append-only log of start/stop/done events
+TIMESTATS_FILE = "timestats.json"  # Incremental aggregates over TIMELOG_FILE
+MIN_SAMPLES = 3  # Completed tasks needed before a group yields a correction factor
+ERROR_BUCKETS = [-0.5, -0.25, -0.1, 0.1, 0.25, 0.5, 1.0]  # Upper bounds of relative-error histogram buckets
+
+# Log lines are space-separated and never rewritten:
+#   s <task_id> <epoch>                              timer started
+#   p <task_id> <epoch>                              timer stopped
+#   d <task_id> <epoch> <estimate_h> <priority> <name>   task completed
+
+def _append_event(*fields):
+    with open(TIMELOG_FILE, "a", encoding="utf-8") as f:
+        f.write(" ".join(str(field) for field in fields) + "\n")
+
+def _timestamp(now=None):
+    return int((now or datetime.now()).timestamp())
+
+def running_timer():
+    """
+    Finds the currently running timer by reading only the tail of the log.
+
+    Returns:
+        tuple or None: (task_id, started_at datetime) or None if no timer runs.
+    """
+    try:
+        with open(TIMELOG_FILE, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            block = 4096
+            while True:
+                f.seek(max(0, size - block))
+                lines = f.read().decode("utf-8").splitlines()
+                if size <= block:
+                    break
+                lines = lines[1:]  # First line may be partial
+                if any(line[:1] in ("s", "p") for line in lines):
+                    break
+                block *= 2
+    except FileNotFoundError:
+        return None
+
+    for line in reversed(lines):
+        parts = line.split(" ")
+        if parts[0] == "p":
+            return None
+        if parts[0] == "s":
+            return int(parts[1]), datetime.fromtimestamp(int(parts[2]))
+    return None
+
+def start_timer(task_id, now=None):
+    """
+    Starts tracking time for a task, stopping any timer that is already running.
+
+    Args:
+        task_id (int): The task being worked on.
+        now (datetime, optional): Start time. Defaults to now.
+
+    Returns:
+        tuple or None: The (task_id, started_at) of the timer that was stopped, if any.
+    """
+    stopped = stop_timer(now)
+    _append_event("s", task_id, _timestamp(now))
+    return stopped
+
+def stop_timer(now=None):
+    """
+    Stops the running timer.
+
+    Args:
+        now (datetime, optional): Stop time. Defaults to now.
+
+    Returns:
+        tuple or None: (task_id, started_at) of the stopped timer, or None.
+    """
+    running = running_timer()
+    if running is not None:
+        _append_event("p", running[0], _timestamp(now))
+    return running
+
+def record_completion(task, now=None):
+    """
+    Logs the completion of a task together with its estimate.
+
+    A running timer on the task is stopped first.
+
+    Args:
+        task (Task): The completed task.
+        now (datetime, optional): Completion time. Defaults to now.
+    """
+    running = running_timer()
+    if running is not None and running[0] == task.id:
+        stop_timer(now)
+    name = " ".join(task.name.split())
+    _append_event("d", task.id, _timestamp(now), task.duration, task.priority, name)
+
+def _empty_group():
+    return {"count": 0, "log_sum": 0.0, "log_sq_sum": 0.0, "histogram": [0] * (len(ERROR_BUCKETS) + 1)}
+
+def _add_sample(group, ratio):
+    error = ratio - 1.0
+    group["count"] += 1
+    group["log_sum"] += math.log(ratio)
+    group["log_sq_sum"] += math.log(ratio) ** 2
+    bucket = next((i for i, bound in enumerate(ERROR_BUCKETS) if error <= bound), len(ERROR_BUCKETS))
+    group["histogram"][bucket] += 1
+
+def load_stats():
+    """
+    Loads the incremental aggregates.
+
+    Returns:
+        dict: Aggregation state including the log offset already processed.
+    """
+    try:
+        with open(TIMESTATS_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"offset": 0, "open": {}, "actual": {}, "priority": {}, "keyword": {}}
+
+def save_stats(stats):
+    """Saves the incremental aggregates atomically."""
+    with open(TIMESTATS_FILE + ".tmp", "w") as f:
+        json.dump(stats, f)
+    os.replace(TIMESTATS_FILE + ".tmp", TIMESTATS_FILE)
+
+def update_stats():
+    """
+    Folds log events appended since the last run into the aggregates.
+
+    Only the unread tail of the log is streamed, so each run costs
+    O(new events) regardless of how long the log has grown.
+
+    Returns:
+        dict: Updated aggregation state.
+    """
+    stats = load_stats()
+    try:
+        f = open(TIMELOG_FILE, "rb")
+    except FileNotFoundError:
+        return stats
+
+    with f:
+        if os.fstat(f.fileno()).st_size < stats["offset"]:
+            stats = {"offset": 0, "open": {}, "actual": {}, "priority": {}, "keyword": {}}  # Log was replaced
+        f.seek(stats["offset"])
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # Partially written line; pick it up next run
+            stats["offset"] += len(raw)
+            parts = raw.decode("utf-8").rstrip("\n").split(" ", 5)
+            kind, task_id, ts = parts[0], parts[1], int(parts[2])
+
+            if kind == "s":
+                stats["open"][task_id] = ts
+            elif kind == "p" and task_id in stats["open"]:
+                started = stats["open"].pop(task_id)
+                stats["actual"][task_id] = stats["actual"].get(task_id, 0) + (ts - started) / 3600.0
+            elif kind == "d":
+                actual = stats["actual"].pop(task_id, 0)
+                estimate = float(parts[3])
+                if actual <= 0 or estimate <= 0:
+                    continue
+                ratio = actual / estimate
+                _add_sample(stats["priority"].setdefault(parts[4], _empty_group()), ratio)
+                for word in task_keywords(parts[5] if len(parts) > 5 else ""):
+                    _add_sample(stats["keyword"].setdefault(word, _empty_group()), ratio)
+
+    save_stats(stats)
+    return stats
+
+def group_summary(group):
+    """
+    Summarizes an aggregated group.
+
+    Returns:
+        dict: count, factor (geometric mean of actual/estimate), spread and histogram.
+    """
+    count = group["count"]
+    mean = group["log_sum"] / count
+    variance = max(group["log_sq_sum"] / count - mean ** 2, 0.0)
+    return {
+        "count": count,
+        "factor": math.exp(mean),
+        "spread": math.exp(math.sqrt(variance)),
+        "histogram": group["histogram"],
+    }
+
+def correction_factors(stats=None, min_samples=MIN_SAMPLES):
+    """
+    Builds the correction factors understood by the scheduler.
+
+    Args:
+        stats (dict, optional): Aggregation state. Updated from the log if omitted.
+        min_samples (int): Minimum completed tasks for a group to be used.
+
+    Returns:
+        dict: {"priority": {priority: factor}, "keyword": {word: factor}}
+    """
+    if stats is None:
+        stats = update_stats()
+    return {
+        kind: {
+            key: round(group_summary(group)["factor"], 3)
+            for key, group in stats[kind].items()
+            if group["count"] >= min_samples
+        }
+        for kind in ("priority", "keyword")
+    }
@@ -0,0 +1,222 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from datetime import datetime, timedelta
+
+WATCH_POLL_SECONDS = 1.0  # Stat interval when inotify is not available
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+INOTIFY_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE  # Completed writes, renames and deletions
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+def file_stamps(paths):
+    """
+    Returns the modification stamps of files, so a change can be detected by comparison.
+
+    Args:
+        paths (iterable[str]): File paths.
+
+    Returns:
+        tuple: (mtime_ns, size) per file, None for a missing file.
+    """
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            stamps.append(None)
+    return tuple(stamps)
+
+class _Inotify:
+    """Minimal inotify binding (Linux) over ctypes: watches directories and reports changed file names."""
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK) < 0:
+                error = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(error, f"Cannot watch {directory}")
+
+    def read(self, timeout):
+        # Names of the files changed within `timeout` seconds (None blocks until a change)
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        names = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                start = offset + INOTIFY_EVENT.size
+                names.add(os.fsdecode(data[start:start + length].rstrip(b"\0")))
+                offset = start + length
+
+    def close(self):
+        os.close(self.fd)
+
+class FileWatcher:
+    """
+    Waits for changes to a set of files.
+
+    Uses inotify on the files' directories where available, so waiting costs
+    no CPU; elsewhere the files are polled with a stat every
+    WATCH_POLL_SECONDS. Either way a wake-up only counts as a change when
+    the file stamps differ, so rewrites of unrelated files in the same
+    directory are ignored.
+    """
+
+    def __init__(self, paths, use_inotify=True, poll_seconds=WATCH_POLL_SECONDS):
+        """
+        Initialize a FileWatcher instance.
+
+        Args:
+            paths (list[str]): Files to watch. They do not need to exist yet.
+            use_inotify (bool): Try inotify before falling back to polling.
+            poll_seconds (float): Seconds between checks when polling.
+        """
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.poll_seconds = poll_seconds
+        self._names = {os.path.basename(path) for path in self.paths}
+        self._stamps = file_stamps(self.paths)
+        self._inotify = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify(sorted({os.path.dirname(path) for path in self.paths}))
+            except (OSError, AttributeError):
+                self._inotify = None  # Not Linux, or no free watches
+
+    @property
+    def uses_inotify(self):
+        return self._inotify is not None
+
+    def wait(self, timeout=None):
+        """
+        Blocks until a watched file changes or the timeout passes.
+
+        Args:
+            timeout (float, optional): Seconds to wait at most. None waits indefinitely.
+
+        Returns:
+            bool: True if a file changed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._inotify is not None:
+                if not self._inotify.read(remaining) & self._names and remaining != 0:
+                    continue
+            else:
+                time.sleep(self.poll_seconds if remaining is None else min(self.poll_seconds, remaining))
+            current = file_stamps(self.paths)
+            if current != self._stamps:
+                self._stamps = current
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self):
+        """Releases the inotify descriptor."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+class ScreenDiff:
+    """
+    Keeps a block of lines on the terminal and redraws only the lines that changed.
+    """
+
+    def __init__(self, ansi=True):
+        """
+        Initialize a ScreenDiff instance.
+
+        Args:
+            ansi (bool): Use cursor movement. Without it (output is not a terminal),
+                the whole block is printed again when anything changed.
+        """
+        self.ansi = ansi
+        self.lines = None
+
+    def update(self, lines):
+        """
+        Returns the output that turns the previous block into `lines`.
+
+        Args:
+            lines (list[str]): The new block.
+
+        Returns:
+            str: Text to write; empty if nothing changed.
+        """
+        lines = list(lines)
+        previous, self.lines = self.lines, lines
+        if previous == lines:
+            return ""
+        if not self.ansi:
+            return "\n".join(lines) + "\n\n"
+        output = ["\x1b[H\x1b[2J"] if previous is None else []
+        previous = previous or []
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                output.append(f"\x1b[{row + 1};1H{line}\x1b[K")
+        if len(previous) > len(lines):
+            output.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+        output.append(f"\x1b[{len(lines) + 1};1H")
+        return "".join(output)
+
+def next_boundary(entries, now):
+    """
+    Returns when the current time next crosses a slot of today's plan.
+
+    Args:
+        entries (list[tuple]): Today's (item, start, end) entries, hours as floats.
+        now (datetime): Current time.
+
+    Returns:
+        datetime: The next slot start or end, or midnight if none is left today.
+    """
+    midnight = datetime.combine(now.date(), datetime.min.time())
+    times = [midnight + timedelta(seconds=round(hour * 3600)) for _, start, end in entries for hour in (start, end)]
+    return min([moment for moment in times if moment > now] + [midnight + timedelta(days=1)])
+
+def run_watch(render, watcher, write, ansi=True, clock=datetime.now, stop=None):
+    """
+    Keeps a rendered plan on screen until interrupted.
+
+    The plan is rendered again only when a watched file changes or the time
+    reaches the boundary returned by the last render; in between the loop
+    is blocked in the watcher.
+
+    Args:
+        render (callable): Returns (lines, boundary) for the current time.
+        watcher (FileWatcher): Watcher for the task and config files.
+        write (callable): Writes terminal output.
+        ansi (bool): Redraw changed lines in place (see ScreenDiff).
+        clock (callable): Returns the current datetime.
+        stop (callable, optional): Checked before each render; the loop ends when it returns True.
+
+    Returns:
+        int: Number of renders.
+    """
+    screen = ScreenDiff(ansi)
+    renders = 0
+    while stop is None or not stop():
+        lines, boundary = render()
+        renders += 1
+        output = screen.update(lines)
+        if output:
+            write(output)
+        watcher.wait(max(0.0, (boundary - clock()).total_seconds()))
+    return renders
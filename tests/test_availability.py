@@ -0,0 +1,51 @@
+import copy
+import unittest
+from datetime import date, datetime
+from devtime.availability import Availability
+from devtime.config import DEFAULT_CONFIG
+from devtime.scheduler import Task, plan_tasks
+
+class TestAvailability(unittest.TestCase):
+
+    def setUp(self):
+        self.config = copy.deepcopy(DEFAULT_CONFIG)
+        self.config["date_overrides"] = {
+            "2025-03-03": {"start": None, "end": None},  # Monday holiday
+            "2025-03-04": {"start": 9, "end": 13},  # Tuesday half day
+            "2025-03-08": {"start": 10, "end": 12},  # Working Saturday
+        }
+        busy = [(datetime(2025, 3, 5, 0, 0), datetime(2025, 3, 7, 0, 0), "PTO")]
+        self.availability = Availability(self.config, busy)
+
+    def test_overrides(self):
+        self.assertIsNone(self.availability.hours_for(date(2025, 3, 3)))
+        self.assertEqual(self.availability.hours_for(date(2025, 3, 4)), (9, 13))
+        self.assertEqual(self.availability.hours_for(date(2025, 3, 10)), (9, 18))
+
+    def test_next_working_day_skips_holidays_and_pto(self):
+        self.assertEqual(self.availability.next_working_day(date(2025, 3, 3)), date(2025, 3, 4))
+        self.assertEqual(self.availability.next_working_day(date(2025, 3, 5)), date(2025, 3, 7))
+        self.assertEqual(self.availability.next_working_day(date(2025, 3, 9)), date(2025, 3, 10))
+        # Far past the indexed range the weekly pattern applies
+        self.assertEqual(self.availability.next_working_day(date(2030, 6, 1)), date(2030, 6, 3))
+
+    def test_free_intervals(self):
+        self.assertEqual(self.availability.free_intervals(date(2025, 3, 4), from_hour=10.5), [(10.5, 13)])
+        self.assertEqual(self.availability.free_intervals(date(2025, 3, 5)), [])
+
+    def test_busy_hours_are_clipped_to_the_day(self):
+        self.assertEqual(self.availability.busy_hours(date(2025, 3, 5), 0, 24), [(0, 24)])
+        self.assertEqual(self.availability.busy_hours(date(2025, 3, 6), 9, 18), [(9, 18)])
+        self.assertEqual(self.availability.busy_hours(date(2025, 3, 7), 9, 18), [])
+
+    def test_plan_follows_overrides(self):
+        tasks = [Task("Task A", 8, None, "high", 10001)]
+        schedule_plan, _ = plan_tasks(tasks, self.config, datetime(2025, 3, 3, 8, 0), availability=self.availability)
+
+        self.assertNotIn("2025-03-03", schedule_plan)
+        self.assertNotIn("2025-03-05", schedule_plan)
+        self.assertEqual(max(end for _, _, end in schedule_plan["2025-03-04"]), 13)
+        self.assertIn("2025-03-07", schedule_plan)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+from devtime.cli import run_batch, delete_task
+from devtime.history import archive_completed
+from devtime.scheduler import Task
+from devtime.storage import TASKS_FILE, write_tasks_file, get_active_session
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        write_tasks_file([Task("Task A", 1, None, "high", 10001)])
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _run(self, lines, commit_every=None, yes=False):
+        with open("commands.txt", "w") as f:
+            f.write("\n".join(lines) + "\n")
+        run_batch(argparse.Namespace(file="commands.txt", commit_every=commit_every, yes=yes, quiet=True))
+        self.assertIsNone(get_active_session())
+
+    def _file_names(self):
+        with open(TASKS_FILE) as f:
+            return [d["name"] for d in json.load(f)]
+
+    def test_commands_are_applied_in_one_commit(self):
+        self._run(["# comment", "add 'Task B' 2 2030-01-01 1", "devtime add 'Task C' 1.5", "", "edit 10001 --name Renamed"])
+        self.assertEqual(self._file_names(), ["Renamed", "Task B", "Task C"])
+
+    def test_failure_rolls_back_uncommitted_group(self):
+        self._run(["add 'Task B' 2", "add 'Task C' 1", "add 'Task D' 1", "plan"], commit_every=2)
+        self.assertEqual(self._file_names(), ["Task A", "Task B", "Task C"])
+
+    def test_unknown_id_aborts_batch(self):
+        for command in ("complete 99999", "edit 99999 --name X", "delete 99999"):
+            self._run(["add 'Task B' 2", command, "add 'Task C' 1"])
+            self.assertEqual(self._file_names(), ["Task A"])
+
+    def test_canceled_delete_all_aborts_batch(self):
+        self._run(["add 'Task B' 2", "delete all"])
+        self.assertEqual(self._file_names(), ["Task A"])
+
+    def test_unknown_completed_id_fails(self):
+        archive_completed([Task("Done", 1, None, "low", 10002)], datetime(2025, 3, 3, 12, 0))
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertFalse(delete_task(argparse.Namespace(active_ids=[], completed_ids=["10002", "99999"])))
+        self.assertIn("No completed tasks found for IDs: 99999", output.getvalue())
+        with contextlib.redirect_stdout(io.StringIO()), mock.patch("devtime.cli.confirm", return_value=True):
+            self.assertTrue(delete_task(argparse.Namespace(active_ids=["all"], completed_ids=[])))
+
+    def test_missing_file_is_reported(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            run_batch(argparse.Namespace(file="missing.txt", commit_every=None, yes=False, quiet=True))
+        self.assertIn("Cannot read batch file missing.txt", output.getvalue())
+        self.assertIsNone(get_active_session())
+
+    def test_delete_all_needs_yes(self):
+        self._run(["delete all"], yes=True)
+        self.assertEqual(self._file_names(), [])
+
+if __name__ == "__main__":
+    unittest.main()
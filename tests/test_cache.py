@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from devtime.cache import PlanCache, cached_plan, plan_digest
+from devtime.config import DEFAULT_CONFIG
+from devtime.scheduler import Task, plan_tasks
+
+class TestPlanCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = datetime(2025, 3, 3, 9, 0)  # Monday
+        self.tasks = [
+            Task("Task A", 1.5, "2025-03-10 18:00", "high", 10001),
+            Task("Task B", 3, None, "medium", 10002),
+        ]
+
+    def test_plan_tasks_does_not_mutate_input(self):
+        schedule_plan, remaining = plan_tasks(self.tasks, DEFAULT_CONFIG, self.now)
+
+        self.assertEqual(self.tasks[0].duration, 1.5)
+        self.assertEqual(self.tasks[1].duration, 3)
+        self.assertEqual(len(remaining), 0)
+        self.assertIn("2025-03-03", schedule_plan)
+
+    def test_digest_ignores_seconds_but_not_tasks(self):
+        key = plan_digest(self.tasks, DEFAULT_CONFIG, self.now)
+        self.assertEqual(key, plan_digest(self.tasks, DEFAULT_CONFIG, self.now.replace(second=0)))
+
+        self.tasks[0].duration = 2
+        self.assertNotEqual(key, plan_digest(self.tasks, DEFAULT_CONFIG, self.now))
+
+    def test_lru_eviction(self):
+        cache = PlanCache(max_entries=2, cache_dir=None)
+        cache.put("a", {"plan": {}, "remaining": []})
+        cache.put("b", {"plan": {}, "remaining": []})
+        cache.get("a")
+        cache.put("c", {"plan": {}, "remaining": []})
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+
+    def test_disk_tier_survives_new_process(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = PlanCache(cache_dir=tmp)
+            plan, _ = cached_plan(self.tasks, DEFAULT_CONFIG, self.now, cache=first)
+
+            second = PlanCache(cache_dir=tmp)
+            cached, _ = cached_plan(self.tasks, DEFAULT_CONFIG, self.now, cache=second)
+
+            self.assertEqual(second.hits, 1)
+            self.assertEqual(len(os.listdir(tmp)), 1)
+            self.assertEqual([e[1:] for e in plan["2025-03-03"]], [e[1:] for e in cached["2025-03-03"]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import argparse
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+from devtime import changelog
+from devtime.changelog import change_group, stacks, state_at, recent_groups, CHANGELOG_DIR
+from devtime.cli import undo_change, redo_change, finish_tasks
+from devtime.recurrence import build_rule
+from devtime.history import archive_completed, iter_completed, delete_archived, clear_history
+from devtime.scheduler import Task
+from devtime.session import TaskSession
+from devtime.storage import load_tasks, save_tasks, upsert_tasks, remove_tasks
+
+class TestChangeLog(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        with change_group("add"):
+            save_tasks([Task("Write report", 2, None, "high", 10001), Task("Review", 1, None, "low", 10002)])
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def ids(self):
+        return sorted(task.id for task in load_tasks())
+
+    def test_undo_and_redo_delete_all(self):
+        with change_group("delete"):
+            remove_tasks([10001, 10002])
+        self.assertEqual(self.ids(), [])
+
+        undo_change(argparse.Namespace())
+        self.assertEqual(self.ids(), [10001, 10002])
+        redo_change(argparse.Namespace())
+        self.assertEqual(self.ids(), [])
+        undo_change(argparse.Namespace())
+        self.assertEqual(self.ids(), [10001, 10002])
+
+        undo, redo = stacks()
+        self.assertEqual([entry[2] for entry in undo], ["add"])
+        self.assertEqual([entry[2] for entry in redo], ["redo"])
+
+    def test_new_change_clears_redo(self):
+        with change_group("edit"):
+            task = load_tasks()[0]
+            task.duration = 5
+            upsert_tasks([task])
+        undo_change(argparse.Namespace())
+        self.assertEqual(load_tasks()[0].duration, 2)
+        with change_group("add"):
+            upsert_tasks([Task("Deploy", 1, None, "medium", 10003)])
+        self.assertEqual(stacks()[1], [])
+
+    def test_undo_completion_removes_archived_record(self):
+        completed_at = datetime.now().replace(second=0, microsecond=0)
+        with change_group("complete"):
+            archive_completed(load_tasks()[:1], completed_at)
+            remove_tasks([10001])
+        self.assertEqual([task.id for task in iter_completed(completed_at.date(), completed_at.date())], [10001])
+
+        undo_change(argparse.Namespace())
+        self.assertEqual(self.ids(), [10001, 10002])
+        self.assertEqual(list(iter_completed(completed_at.date(), completed_at.date())), [])
+
+        redo_change(argparse.Namespace())
+        self.assertEqual(self.ids(), [10002])
+        self.assertEqual(len(list(iter_completed(completed_at.date(), completed_at.date()))), 1)
+
+    def test_undo_one_recurring_completion(self):
+        series = Task("Standup", 0.25, "2025-03-03 10:00", "medium", 10010, recurrence=build_rule("daily"))
+        with change_group("add"):
+            upsert_tasks([series])
+        for _ in range(3):
+            with change_group("complete"):
+                finish_tasks([task for task in load_tasks() if task.id == 10010])
+        self.assertEqual(len(list(iter_completed())), 3)
+
+        undo_change(argparse.Namespace())
+        self.assertEqual([task.occurrence for task in iter_completed()], ["2025-03-03", "2025-03-04"])
+        redo_change(argparse.Namespace())
+        self.assertEqual(len(list(iter_completed())), 3)
+
+    def test_undo_history_deletions(self):
+        completed_at = datetime(2025, 3, 3, 12, 0)
+        with change_group("complete"):
+            archive_completed(load_tasks(), completed_at)
+            remove_tasks([10001, 10002])
+        with change_group("delete"):
+            delete_archived({10001})
+        self.assertEqual([task.id for task in iter_completed()], [10002])
+
+        undo_change(argparse.Namespace())
+        self.assertEqual(sorted(task.id for task in iter_completed()), [10001, 10002])
+        redo_change(argparse.Namespace())
+        self.assertEqual([task.id for task in iter_completed()], [10002])
+
+        with change_group("delete"):
+            clear_history()
+        self.assertEqual(list(iter_completed()), [])
+        undo_change(argparse.Namespace())
+        restored = list(iter_completed())
+        self.assertEqual([(task.id, task.name) for task in restored], [(10002, "Review")])
+        self.assertEqual(recent_groups(1)[0]["label"], "undo")
+
+    def test_snapshots_bound_replay(self):
+        with mock.patch.object(changelog, "SNAPSHOT_EVERY", 5), mock.patch.object(changelog, "KEEP_SNAPSHOTS", 2):
+            for i in range(23):
+                with change_group("edit"):
+                    upsert_tasks([Task(f"Task {i}", 1, None, "medium", 20000 + i)])
+            snapshots = sorted(name for name in os.listdir(CHANGELOG_DIR) if name.startswith("snapshot"))
+            self.assertEqual(snapshots, ["snapshot-000000000000.json", "snapshot-000000000015.json",
+                                         "snapshot-000000000020.json"])
+            self.assertEqual(len(stacks()[0]), 24)
+            self.assertEqual(len(recent_groups(limit=3)), 3)
+
+            undo_change(argparse.Namespace())
+            self.assertNotIn(20022, self.ids())
+            self.assertEqual(len(state_at(datetime.now().replace(microsecond=0))), 24)
+
+    def test_appends_continue_after_other_writers(self):
+        with mock.patch.object(changelog, "SNAPSHOT_EVERY", 5):
+            for i in range(12):
+                if i % 3 == 0:
+                    changelog._tail = None  # As if another process had appended meanwhile
+                with change_group("edit"):
+                    upsert_tasks([Task(f"Task {i}", 1, None, "medium", 20000 + i)])
+            changelog.append_events([changelog.build_event([(30000, None, {"id": 30000})])] * 4)
+        self.assertEqual([event["seq"] for event in changelog.iter_events()], list(range(1, 18)))
+
+    def test_state_at(self):
+        with self.assertRaises(ValueError):
+            state_at(datetime(2000, 1, 1))
+        self.assertEqual(sorted(task["id"] for task in state_at(datetime.now())), [10001, 10002])
+
+    def test_rolled_back_session_records_nothing(self):
+        session = TaskSession(journal_path=None)
+        session.open()
+        with change_group("batch"):
+            remove_tasks([10001])
+        session.rollback()
+        self.assertEqual(self.ids(), [10001, 10002])
+        self.assertEqual([entry[2] for entry in stacks()[0]], ["add"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from devtime.cli import build_parser
+from devtime.completion import COMPLETION_FILE, completion_script, lookup, write_completion_index
+from devtime.scheduler import Task
+from devtime.storage import TASKS_FILE, write_tasks_file
+
+class TestCompletionIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        write_tasks_file([
+            Task("Write report", 2, None, "high", 12345),
+            Task("write docs", 1, None, "low", 12399),
+            Task("Deploy\tservice", 0.5, None, "medium", 20002),
+        ])
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_written_with_tasks(self):
+        self.assertTrue(os.path.exists(COMPLETION_FILE))
+        self.assertEqual(lookup("123"), [("12345", "Write report"), ("12399", "write docs")])
+        self.assertEqual(lookup("2"), [("20002", "Deploy service")])
+        self.assertEqual(lookup("9"), [])
+
+    def test_name_prefix(self):
+        self.assertEqual([task_id for task_id, _ in lookup("WRITE")], ["12399", "12345"])
+        self.assertEqual(lookup("write r"), [("12345", "write report")])
+        self.assertEqual(len(lookup("", limit=2)), 2)
+
+    def test_rebuilds_when_tasks_file_is_newer(self):
+        time.sleep(0.01)
+        with open(TASKS_FILE, "w") as f:
+            json.dump([{"id": 777, "name": "Hand edited", "duration": 1, "deadline": None, "priority": "low"}], f)
+        os.utime(COMPLETION_FILE, ns=(0, 0))
+        self.assertEqual(lookup("hand"), [("777", "hand edited")])
+
+    def test_binary_search_over_many_lines(self):
+        write_completion_index([{"id": i, "name": f"Task {i}"} for i in range(1, 5000)], "big.idx")
+        self.assertEqual([task_id for task_id, _ in lookup("4999", "big.idx")], ["4999"])
+        self.assertEqual(len(lookup("task 499", "big.idx")), 11)
+
+    def test_scripts(self):
+        parser = build_parser()
+        bash = completion_script("bash", parser, python="python3")
+        self.assertIn("edit|complete|delete|start)", bash)
+        self.assertIn("--project", bash)
+        self.assertIn("#compdef devtime", completion_script("zsh", parser))
+        self.assertIn("__fish_use_subcommand -a plan", completion_script("fish", parser))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from datetime import date, datetime
+from devtime import history
+from devtime.scheduler import Task
+from devtime.storage import COMPLETED_TASKS_FILE
+
+class TestHistoryArchive(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_archive_partitions_by_month(self):
+        history.archive_completed([Task("A", 2, None, "high", 10001)], datetime(2025, 1, 31, 17, 0))
+        history.archive_completed([Task("B", 1, None, "low", 10002)], datetime(2025, 2, 3, 10, 0), compress=True)
+
+        self.assertEqual(history.list_partitions(), ["2025-01", "2025-02"])
+        self.assertTrue(os.path.exists(os.path.join(history.HISTORY_DIR, "completed-2025-02.jsonl.gz")))
+
+        february = history.load_history(date(2025, 2, 1), date(2025, 2, 28))
+        self.assertEqual([task.id for task in february], [10002])
+
+    def test_rollups_track_hours_by_priority(self):
+        history.archive_completed([Task("A", 2, None, "high", 10001), Task("B", 1.5, None, "high", 10002)],
+                                  datetime(2025, 3, 3, 12, 0))
+        history.archive_completed([Task("C", 1, None, "low", 10003)], datetime(2025, 3, 4, 12, 0))
+
+        daily = dict(history.summarize_rollups(date(2025, 3, 1), date(2025, 3, 31)))
+        self.assertEqual(daily["2025-03-03"], {"high": 3.5})
+        weekly = dict(history.summarize_rollups(date(2025, 3, 3), date(2025, 3, 9), weekly=True))
+        self.assertEqual(weekly["2025-W10"], {"high": 3.5, "low": 1.0})
+
+        history.delete_archived({10001})
+        daily = dict(history.summarize_rollups(date(2025, 3, 1), date(2025, 3, 31)))
+        self.assertEqual(daily["2025-03-03"], {"high": 1.5})
+
+    def test_delete_from_compressed_partition(self):
+        history.archive_completed([Task("A", 2, None, "high", 10001), Task("B", 1, None, "low", 10002)],
+                                  datetime(2025, 3, 3, 12, 0), compress=True)
+        self.assertEqual([record["id"] for record in history.delete_archived({10001})], [10001])
+
+        self.assertEqual(os.listdir(history.HISTORY_DIR).count("completed-2025-03.jsonl.gz"), 1)
+        self.assertEqual([task.id for task in history.load_history()], [10002])
+        daily = dict(history.summarize_rollups(date(2025, 3, 1), date(2025, 3, 31)))
+        self.assertEqual((daily["2025-03-03"].get("high", 0), daily["2025-03-03"]["low"]), (0, 1.0))
+
+    def test_legacy_file_kept_if_archive_write_fails(self):
+        with open(COMPLETED_TASKS_FILE, "w") as f:
+            json.dump([{"name": "Old", "duration": 1, "deadline": None, "priority": "medium", "id": 10009}], f)
+        with mock.patch.object(history, "save_rollups", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                history.migrate_legacy_completed()
+        self.assertTrue(os.path.exists(COMPLETED_TASKS_FILE))
+
+    def test_legacy_file_is_migrated(self):
+        with open(COMPLETED_TASKS_FILE, "w") as f:
+            json.dump([{"name": "Old", "duration": 1, "deadline": None, "priority": "medium", "id": 10009}], f)
+
+        records = list(history.iter_history())
+        self.assertEqual([r["id"] for r in records], [10009])
+        self.assertFalse(os.path.exists(COMPLETED_TASKS_FILE))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import unittest
+from datetime import datetime
+from devtime.availability import Availability
+from devtime.config import DEFAULT_CONFIG
+from devtime.ics import fold_line, iter_busy_blocks, write_plan_ics
+from devtime.intervals import IntervalTree, subtract_intervals
+from devtime.scheduler import Task, plan_tasks
+
+SAMPLE_ICS = (
+    "BEGIN:VCALENDAR\r\n"
+    "BEGIN:VEVENT\r\n"
+    "DTSTART:20250303T100000\r\n"
+    "DTEND:20250303T113000\r\n"
+    "SUMMARY:Stand\r\n"
+    " up\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "DTSTART:20250303T140000\r\n"
+    "DURATION:PT30M\r\n"
+    "SUMMARY:Sync\r\n"
+    "TRANSP:TRANSPARENT\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+class TestIcs(unittest.TestCase):
+
+    def test_interval_tree_overlap(self):
+        tree = IntervalTree([(1, 3, "a"), (5, 8, "b"), (2, 9, "c")])
+        self.assertEqual([item[2] for item in tree.overlap(3, 5)], ["c"])
+        self.assertEqual([item[2] for item in tree.overlap(6, 7)], ["c", "b"])
+        self.assertFalse(tree.overlaps(9, 10))
+        self.assertEqual(subtract_intervals(0, 10, [(2, 3), (5, 7)]), [(0, 2), (3, 5), (7, 10)])
+
+    def test_import_skips_transparent_events(self):
+        blocks = list(iter_busy_blocks(io.StringIO(SAMPLE_ICS)))
+        self.assertEqual(blocks, [(datetime(2025, 3, 3, 10, 0), datetime(2025, 3, 3, 11, 30), "Standup")])
+
+    def test_import_ignores_alarm_properties(self):
+        document = (
+            "BEGIN:VCALENDAR\r\n"
+            "BEGIN:VEVENT\r\n"
+            "DTSTART:20250303T100000\r\n"
+            "DURATION:PT1H\r\n"
+            "SUMMARY:Review\r\n"
+            "BEGIN:VALARM\r\n"
+            "ACTION:DISPLAY\r\n"
+            "TRIGGER:-PT15M\r\n"
+            "REPEAT:2\r\n"
+            "DURATION:PT5M\r\n"
+            "SUMMARY:Reminder\r\n"
+            "END:VALARM\r\n"
+            "END:VEVENT\r\n"
+            "END:VCALENDAR\r\n"
+        )
+        blocks = list(iter_busy_blocks(io.StringIO(document)))
+        self.assertEqual(blocks, [(datetime(2025, 3, 3, 10, 0), datetime(2025, 3, 3, 11, 0), "Review")])
+
+    def test_busy_blocks_are_kept_free(self):
+        availability = Availability(DEFAULT_CONFIG, iter_busy_blocks(io.StringIO(SAMPLE_ICS)))
+        tasks = [Task("Task A", 2, None, "high", 10001)]
+        schedule_plan, _ = plan_tasks(tasks, DEFAULT_CONFIG, datetime(2025, 3, 3, 9, 0), availability=availability)
+
+        sessions = [(start, end) for item, start, end in schedule_plan["2025-03-03"] if isinstance(item, Task)]
+        self.assertEqual(sessions, [(9, 10), (11.5, 12.5)])
+
+    def test_export_writes_folded_events(self):
+        tasks = [Task("A very long task name " * 5, 1, None, "high", 10001)]
+        schedule_plan, _ = plan_tasks(tasks, DEFAULT_CONFIG, datetime(2025, 3, 3, 9, 0))
+        self.assertEqual(write_plan_ics(schedule_plan, io.StringIO(newline="")), 1)
+
+        out = io.StringIO(newline="")
+        count = write_plan_ics(schedule_plan, out, include_breaks=True)
+        lines = out.getvalue().split("\r\n")
+        self.assertGreater(count, 1)
+        self.assertIn("DTSTART:20250303T090000", lines)
+        self.assertTrue(all(len(line.encode("utf-8")) <= 75 for line in lines))
+        self.assertEqual(fold_line("x" * 80), "x" * 75 + "\r\n " + "x" * 5 + "\r\n")
+
+if __name__ == "__main__":
+    unittest.main()
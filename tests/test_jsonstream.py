@@ -0,0 +1,67 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from devtime import history
+from devtime.jsonstream import iter_json_array, select_records
+from devtime.scheduler import Task
+from devtime.storage import iter_tasks, iter_schedules, write_tasks_file, save_schedule
+
+class TestIterJsonArray(unittest.TestCase):
+
+    def test_matches_json_load_at_any_chunk_size(self):
+        data = [{"name": "Задача, \"quoted\" ]", "duration": 12345, "deadline": None},
+                1234567, -0.5, "text", [1, [2, {}]], True, None, {"nested": {"a": [1, 2]}}]
+        document = json.dumps(data, indent=4, ensure_ascii=False)
+        for chunk_size in (1, 2, 3, 7, 64, 1 << 16):
+            self.assertEqual(list(iter_json_array(io.StringIO(document), chunk_size)), data)
+
+    def test_empty_documents(self):
+        self.assertEqual(list(iter_json_array(io.StringIO(""))), [])
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "))), [])
+
+    def test_malformed_documents_raise(self):
+        for document in ('{"a": 1}', "[1, 2", "[1 2]", '[{"a": }]'):
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_json_array(io.StringIO(document), chunk_size=3))
+
+    def test_select_records(self):
+        records = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        self.assertEqual(list(select_records(records, where=lambda r: r["id"] > 1, fields=["name", "x"])),
+                         [{"name": "b", "x": None}])
+        self.assertEqual(list(select_records(records, convert=lambda r: r["id"])), [1, 2])
+
+class TestStreamingStorage(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_iter_tasks_pushdown(self):
+        self.assertEqual(list(iter_tasks()), [])
+        write_tasks_file([Task("Task A", 1, None, "high", 10001), Task("Task B", 2, "2025-03-01 18:00", "low", 10002)])
+
+        tasks = list(iter_tasks(where=lambda d: d["priority"] == "low"))
+        self.assertEqual([(task.id, task.deadline) for task in tasks], [(10002, datetime(2025, 3, 1, 18, 0))])
+        self.assertEqual(list(iter_tasks(fields=["id"])), [{"id": 10001}, {"id": 10002}])
+
+    def test_iter_schedules(self):
+        save_schedule("2025-03-01", [(Task("Task A", 1, None, "high", 10001), 9, 10)])
+        save_schedule("2025-03-02", [])
+        self.assertEqual(list(iter_schedules(fields=["date"])), [{"date": "2025-03-01"}, {"date": "2025-03-02"}])
+
+    def test_iter_completed(self):
+        history.archive_completed([Task("Task A", 1, None, "high", 10001)], datetime(2025, 3, 3, 12, 0))
+        history.archive_completed([Task("Task B", 2, None, "low", 10002)], datetime(2025, 4, 3, 12, 0))
+        records = list(history.iter_completed(date(2025, 4, 1), date(2025, 4, 30), fields=["id", "completed_at"]))
+        self.assertEqual(records, [{"id": 10002, "completed_at": "2025-04-03 12:00"}])
+
+if __name__ == "__main__":
+    unittest.main()
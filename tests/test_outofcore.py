@@ -0,0 +1,94 @@
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+from collections import deque
+from datetime import datetime
+from devtime.availability import Availability
+from devtime.config import DEFAULT_CONFIG
+from devtime.recurrence import build_rule
+from devtime.outofcore import external_sort, stream_plan, task_sort_key
+from devtime.scheduler import Task, build_day_blocks, fill_day, plan_tasks
+from devtime.storage import dict_to_task
+
+class TestOutOfCore(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        rng = random.Random(7)
+        self.records = [
+            {"id": 10000 + i, "name": f"Task {i}", "duration": rng.choice([0.5, 1, 2.5]),
+             "deadline": rng.choice([None, "2025-03-10 18:00", "2025-03-04 12:00", "2025-03-01 09:00"]),
+             "priority": rng.choice(["high", "medium", "low"])}
+            for i in range(200)
+        ]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_external_sort_matches_in_memory_sort(self):
+        import devtime.outofcore as outofcore
+        fan_in, outofcore.MAX_FAN_IN = outofcore.MAX_FAN_IN, 3  # Force multi-pass merging
+        try:
+            result = list(external_sort(iter(self.records), run_size=7, tmp_dir=self._tmp.name))
+        finally:
+            outofcore.MAX_FAN_IN = fan_in
+        self.assertEqual(result, sorted(self.records, key=task_sort_key))
+        self.assertEqual(os.listdir(self._tmp.name), [])
+
+    def test_stream_plan_matches_in_memory_planner(self):
+        now = datetime(2025, 3, 3, 9, 0)  # Monday
+        out = io.StringIO()
+        summary = stream_plan(iter(self.records), out, dict(DEFAULT_CONFIG), now=now, max_days=30,
+                              window_size=4, run_size=16, tmp_dir=self._tmp.name)
+
+        ordered = [dict_to_task(r) for r in sorted(self.records, key=task_sort_key)]
+        expected_plan, remaining = plan_tasks(ordered, dict(DEFAULT_CONFIG), now=now)
+        days = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        self.assertEqual([day["date"] for day in days], sorted(expected_plan))
+        for day in days:
+            expected = [(item.id if isinstance(item, Task) else None, round(start, 4), round(end, 4))
+                        for item, start, end in expected_plan[day["date"]]]
+            self.assertEqual([(entry.get("id"), entry["start"], entry["end"]) for entry in day["entries"]], expected)
+        self.assertEqual(summary["expired"], sum(1 for r in self.records if r["deadline"] == "2025-03-01 09:00"))
+        self.assertEqual(summary["remaining"], len(remaining))
+
+    def test_stream_plan_expands_series(self):
+        now = datetime(2025, 3, 5, 9, 0)  # Wednesday; the first occurrence was on Monday
+        series = {"id": 10001, "name": "Standup", "duration": 0.25, "deadline": "2025-03-03 17:00",
+                  "priority": "high", "recurrence": build_rule("weekly", weekdays=[0, 1, 2, 3, 4])}
+        out = io.StringIO()
+        summary = stream_plan(iter([series]), out, dict(DEFAULT_CONFIG), now=now, max_days=7, tmp_dir=self._tmp.name)
+        days = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([[entry["occurrence"] for entry in day["entries"] if "id" in entry] for day in days],
+                         [[day["date"]] for day in days])
+        self.assertEqual([day["date"] for day in days], ["2025-03-05", "2025-03-06", "2025-03-07", "2025-03-10",
+                                                          "2025-03-11"])
+        self.assertEqual(summary["remaining"], 1)  # Wednesday 12th, still waiting at the end of the horizon
+
+    def test_stream_plan_stops_at_horizon(self):
+        config = dict(DEFAULT_CONFIG, project_quotas={"apollo": 0})
+        blocked = {"id": 10001, "name": "Blocked", "duration": 1, "deadline": None, "priority": "high",
+                   "project": "apollo"}
+        out = io.StringIO()
+        summary = stream_plan(iter([blocked]), out, config, now=datetime(2025, 3, 3, 9, 0), tmp_dir=self._tmp.name)
+        self.assertEqual(summary["remaining"], 1)
+        self.assertEqual(summary["entries"], 0)
+        self.assertLessEqual(summary["days"], 30)
+
+    def test_held_tasks_count_against_window(self):
+        config = dict(DEFAULT_CONFIG, project_quotas={"apollo": 0})
+        source = iter([Task(f"Blocked {i}", 1, None, "high", 10000 + i, project="apollo") for i in range(500)])
+        pending = deque()
+        now = datetime(2025, 3, 3, 9, 0)
+        for day in range(3):
+            blocks = build_day_blocks(datetime(2025, 3, 3 + day).date(), now, config, Availability(config))
+            fill_day(blocks, pending, source, 8, config["project_quotas"])
+            self.assertLessEqual(len(pending), 8)
+        self.assertEqual(sum(1 for _ in source), 492)  # The rest was never pulled into memory
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from devtime import history
+from devtime.cli import finish_tasks
+from devtime.config import DEFAULT_CONFIG
+from devtime.recurrence import build_rule, iter_occurrences, complete_occurrence, next_occurrence
+from devtime.scheduler import Task, plan_tasks
+from devtime.storage import task_to_dict, dict_to_task, load_tasks, write_tasks_file
+
+ANCHOR = datetime(2025, 3, 5, 17, 0)  # Wednesday
+
+def days(rule, **kwargs):
+    return [d.strftime("%Y-%m-%d") for d in iter_occurrences(rule, ANCHOR, **kwargs)]
+
+class TestRecurrence(unittest.TestCase):
+
+    def test_daily_every_n_days_with_count(self):
+        rule = build_rule("daily", interval=3, count=4)
+        self.assertEqual(days(rule), ["2025-03-05", "2025-03-08", "2025-03-11", "2025-03-14"])
+        self.assertEqual(days(rule, start=date(2025, 3, 9)), ["2025-03-11", "2025-03-14"])
+
+    def test_weekly_on_weekdays_with_until(self):
+        rule = build_rule("weekly", interval=2, weekdays=[0, 2, 4], until=date(2025, 3, 24))
+        self.assertEqual(days(rule), ["2025-03-05", "2025-03-07", "2025-03-17", "2025-03-19", "2025-03-21"])
+        occurrences = list(iter_occurrences(rule, ANCHOR))
+        self.assertEqual(occurrences[0], ANCHOR)
+
+    def test_jumping_matches_full_expansion(self):
+        for rule in (build_rule("daily", interval=4, count=40), build_rule("weekly", interval=3, weekdays=[1, 2, 6], count=25)):
+            full = days(rule)
+            for start in (date(2025, 3, 1), date(2025, 3, 6), date(2025, 4, 13), date(2025, 6, 30)):
+                self.assertEqual(days(rule, start=start), [d for d in full if d >= start.strftime("%Y-%m-%d")])
+
+    def test_completions_are_folded_into_done_through(self):
+        rule = build_rule("daily")
+        rule = complete_occurrence(rule, ANCHOR, date(2025, 3, 7))
+        self.assertEqual(rule["done"], ["2025-03-07"])
+        rule = complete_occurrence(rule, ANCHOR, date(2025, 3, 5))
+        rule = complete_occurrence(rule, ANCHOR, date(2025, 3, 6))
+        self.assertEqual(rule["done_through"], "2025-03-07")
+        self.assertNotIn("done", rule)
+        self.assertEqual(next_occurrence(rule, ANCHOR), datetime(2025, 3, 8, 17, 0))
+
+    def test_plan_expands_occurrences_within_horizon(self):
+        series = Task("Standup notes", 0.25, ANCHOR, "medium", 10001, build_rule("weekly", weekdays=[0, 2]))
+        plan, remaining = plan_tasks([series], dict(DEFAULT_CONFIG), now=datetime(2025, 3, 5, 9, 0))
+        occurrences = [item.occurrence for entries in plan.values() for item, _, _ in entries if isinstance(item, Task)]
+        self.assertEqual(occurrences[:3], ["2025-03-05", "2025-03-10", "2025-03-12"])
+        self.assertEqual(len(occurrences), 9)  # Mondays and Wednesdays up to 30 days ahead
+        self.assertEqual(remaining, [])
+
+    def test_occurrences_wait_for_their_day(self):
+        series = Task("Standup", 0.25, ANCHOR, "high", 10001, build_rule("weekly", weekdays=[0, 1, 2, 3, 4]))
+        plan, _ = plan_tasks([series], dict(DEFAULT_CONFIG), now=datetime(2025, 3, 5, 9, 0))
+        for day, entries in plan.items():
+            occurrences = [item.occurrence for item, _, _ in entries if isinstance(item, Task)]
+            self.assertEqual(occurrences, [day])
+
+    def test_storage_round_trip(self):
+        series = Task("Backup", 1, ANCHOR, "low", 10001, build_rule("daily", count=3))
+        restored = dict_to_task(task_to_dict(series))
+        self.assertEqual(restored.recurrence, series.recurrence)
+        self.assertNotIn("recurrence", task_to_dict(Task("One-off", 1, None, "low", 10002)))
+
+class TestCompleteSeries(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_series_is_removed_after_last_occurrence(self):
+        write_tasks_file([Task("Backup", 1, ANCHOR, "low", 10001, build_rule("daily", count=2))])
+        finish_tasks(load_tasks())
+        self.assertEqual(load_tasks()[0].recurrence["done_through"], "2025-03-05")
+        finish_tasks(load_tasks())
+        self.assertEqual(load_tasks(), [])
+        self.assertEqual([r["occurrence"] for r in history.iter_history()], ["2025-03-05", "2025-03-06"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime
+from devtime.remind import TimingWheel, plan_events, run_reminders
+from devtime.scheduler import Task
+
+NOW = datetime(2025, 3, 3, 9, 0)  # Monday
+
+class TestTimingWheel(unittest.TestCase):
+
+    def test_fires_in_order_across_levels(self):
+        rng = random.Random(7)
+        start = 1_700_000_000
+        wheel = TimingWheel(start)
+        offsets = [rng.choice([1, 63, 64, 65, 4095, 4096, 300_000, 20_000_000]) + rng.randrange(5000) for _ in range(300)]
+        for i, offset in enumerate(offsets):
+            wheel.add(start + offset, i)
+        self.assertEqual(len(wheel), 300)
+
+        fired = []
+        now = start
+        while len(wheel):
+            now = max(now + 1, wheel.next_expiry())
+            for when, item in wheel.advance(now):
+                self.assertEqual(when, now)
+                self.assertEqual(when, start + offsets[item])
+                fired.append(item)
+        self.assertEqual(sorted(fired), list(range(300)))
+        self.assertEqual([offsets[item] for item in fired], sorted(offsets))
+
+    def test_jumps_and_past_events(self):
+        wheel = TimingWheel(1000)
+        wheel.add(999, "late")
+        wheel.add(1000 + 86400, "tomorrow")
+        self.assertEqual(wheel.next_expiry(), 1000)
+        self.assertEqual(wheel.advance(1000), [(999, "late")])
+        self.assertEqual(wheel.advance(1000 + 86399), [])
+        self.assertEqual(wheel.advance(1000 + 90000), [(1000 + 86400, "tomorrow")])
+        self.assertIsNone(wheel.next_expiry())
+
+class TestReminders(unittest.TestCase):
+
+    def setUp(self):
+        self.task = Task("Write report", 1, datetime(2025, 3, 3, 12, 0), "high", 10001)
+        self.plan = {"2025-03-03": [(self.task, 9.5, 10.5), ("Break", 10.5, 10.75)]}
+
+    def test_plan_events(self):
+        events = plan_events(self.plan, [self.task], NOW, lead_minutes=30)
+        self.assertEqual([(at.strftime("%H:%M"), kind) for at, kind, _ in events],
+                         [("09:30", "start"), ("10:30", "break"), ("11:30", "deadline"), ("12:00", "deadline")])
+        self.assertIn("until 10:30", events[0][2])
+
+    def test_runner_sleeps_until_events_and_reloads_on_change(self):
+        clock = [NOW.timestamp()]
+        sleeps, received, loads = [], [], []
+
+        with tempfile.TemporaryDirectory() as tmp:
+            watched = os.path.join(tmp, "tasks.json")
+            open(watched, "w").close()
+
+            def load_plan():
+                loads.append(clock[0])
+                return self.plan, [self.task]
+
+            def sleep(seconds):
+                sleeps.append(seconds)
+                clock[0] += seconds
+                if len(sleeps) == 3:
+                    with open(watched, "w") as f:
+                        f.write("[]")
+                    os.utime(watched, ns=(1, 1))
+
+            sent = run_reminders(load_plan, lambda kind, message, when: received.append((kind, when)), 30,
+                                 clock=lambda: clock[0], sleep=sleep,
+                                 stop=lambda: clock[0] >= datetime(2025, 3, 3, 12, 30).timestamp(),
+                                 watched=(watched,), check_seconds=3600)
+
+        self.assertEqual(sent, 4)
+        self.assertEqual([kind for kind, _ in received], ["start", "break", "deadline", "deadline"])
+        self.assertEqual(len(loads), 2)  # Initial load plus one reload after the file changed
+        self.assertLessEqual(len(sleeps), 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from devtime.scheduler import Task
+from devtime.server import make_server
+from devtime.storage import save_tasks
+
+NOW = datetime(2025, 3, 3, 10, 0)
+
+class TestStatusServer(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.clock = NOW
+        self.plans = 0
+        save_tasks([Task("Write report", 1, "2025-03-03 09:00", "high", 10001),
+                    Task("Review", 1, "2025-03-05 17:00", "low", 10002)])
+        self.server = make_server(self.load_plan, port=0, clock=lambda: self.clock)
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def load_plan(self, tasks):
+        self.plans += 1
+        return {"2025-03-03": [(tasks[1], 10.0, 11.0), ("Break", 11.0, 11.25)]}, tasks[:1]
+
+    def get(self, path, etag=None):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        try:
+            connection.request("GET", path, headers={"If-None-Match": etag} if etag else {})
+            response = connection.getresponse()
+            body = response.read()
+            return response.status, response.getheader("ETag"), json.loads(body) if body else None
+        finally:
+            connection.close()
+
+    def test_endpoints(self):
+        status, _, body = self.get("/overdue")
+        self.assertEqual(status, 200)
+        self.assertEqual([task["id"] for task in body["tasks"]], [10001])
+
+        status, _, body = self.get("/plan")
+        self.assertEqual(body["entries"][0], {"start": "10:00", "end": "11:00", "current": True,
+                                              "id": 10002, "name": "Review", "occurrence": None})
+        self.assertEqual(body["unscheduled"], [10001])
+
+        status, _, body = self.get("/forecast")
+        self.assertEqual(body["days"], [{"date": "2025-03-03", "hours": 1.0}])
+        self.assertEqual(body["tasks"][0]["finish"], "2025-03-03 11:00")
+        self.assertFalse(body["tasks"][0]["late"])
+        self.assertEqual(self.get("/missing")[0], 404)
+
+    def test_unchanged_poll_is_not_modified(self):
+        status, etag, _ = self.get("/plan")
+        builds = self.server.status_cache.builds
+        self.assertEqual(self.get("/plan", etag)[:2], (304, etag))
+        self.assertEqual(self.server.status_cache.builds, builds)
+        self.assertEqual(self.plans, 1)
+
+        time.sleep(0.01)
+        save_tasks([Task("Deploy", 2, None, "medium", 10003), Task("Review", 1, None, "low", 10002)])
+        status, new_etag, _ = self.get("/plan", etag)
+        self.assertEqual(status, 200)
+        self.assertNotEqual(new_etag, etag)
+
+    def test_expires_at_slot_boundary(self):
+        _, etag, body = self.get("/plan")
+        self.assertTrue(body["entries"][0]["current"])
+        self.clock = datetime(2025, 3, 3, 11, 0)
+        status, _, body = self.get("/plan", etag)
+        self.assertEqual(status, 200)
+        self.assertFalse(body["entries"][0]["current"])
+
+    def test_many_concurrent_pollers(self):
+        _, etag, _ = self.get("/forecast")
+        with ThreadPoolExecutor(max_workers=300) as pool:
+            results = list(pool.map(lambda _: self.get("/forecast", etag)[0], range(300)))
+        self.assertEqual(results, [304] * 300)
+        self.assertEqual(self.plans, 1)
+
+if __name__ == "__main__":
+    unittest.main()
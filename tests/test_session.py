@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+from devtime import history
+from devtime.scheduler import Task
+from devtime.session import TaskSession, JOURNAL_FILE
+from devtime.storage import TASKS_FILE, load_tasks, save_tasks, write_tasks_file, get_active_session, set_active_session
+
+class TestTaskSession(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        write_tasks_file([Task("Task A", 1, None, "high", 10001)])
+
+    def tearDown(self):
+        if get_active_session() is not None:
+            get_active_session().close()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _file_ids(self):
+        with open(TASKS_FILE) as f:
+            return [d["id"] for d in json.load(f)]
+
+    def test_changes_stay_in_memory_until_flush(self):
+        session = TaskSession(flush_interval=3600)
+        session.open()
+        save_tasks(load_tasks() + [Task("Task B", 2, None, "low", 10002)])
+
+        self.assertEqual([task.id for task in load_tasks()], [10001, 10002])
+        self.assertEqual(self._file_ids(), [10001])
+
+        session.flush()
+        self.assertEqual(self._file_ids(), [10001, 10002])
+        session.close()
+        self.assertFalse(os.path.exists(JOURNAL_FILE))
+
+    def test_completions_are_buffered(self):
+        session = TaskSession(flush_interval=3600)
+        session.open()
+        tasks = load_tasks()
+        history.archive_completed(tasks, datetime(2025, 3, 3, 12, 0))
+        save_tasks([])
+
+        self.assertEqual(history.list_partitions(), [])
+        session.close()
+        self.assertEqual(history.list_partitions(), ["2025-03"])
+        self.assertEqual(self._file_ids(), [])
+
+    def test_idle_prompt_flushes_when_due(self):
+        session = TaskSession(flush_interval=0.1)
+        session.open()
+        save_tasks(load_tasks() + [Task("Task B", 2, None, "low", 10002)])
+        read_end, write_end = os.pipe()
+        with os.fdopen(read_end) as stream, os.fdopen(write_end, "w") as writer:
+            writer.write("list\n")
+            writer.flush()
+            session.wait_for_input(stream)  # Input is waiting: nothing is written yet
+            self.assertEqual(self._file_ids(), [10001])
+            stream.readline()
+
+            session.wait_for_input(stream)  # Idle until the change is due
+            self.assertEqual(self._file_ids(), [10001, 10002])
+            self.assertFalse(session.dirty)
+        session.close()
+
+    def test_crash_is_recovered_from_journal(self):
+        session = TaskSession(flush_interval=3600)
+        session.open()
+        tasks = load_tasks()
+        tasks[0].name = "Renamed"
+        save_tasks(tasks)
+        # Simulate a crash: deactivate without flushing
+        session._journal.close()
+        session._journal = None
+        set_active_session(None)
+
+        recovered = TaskSession()
+        self.assertEqual(recovered.recover(), 1)
+        self.assertEqual(load_tasks()[0].name, "Renamed")
+        self.assertFalse(os.path.exists(JOURNAL_FILE))
+
+    def test_replay_after_archive_write_does_not_duplicate(self):
+        session = TaskSession(flush_interval=3600)
+        session.open()
+        history.archive_completed(load_tasks(), datetime(2025, 3, 3, 12, 0))
+        save_tasks([])
+
+        def crash_after_write(*args, **kwargs):
+            history.write_archive(*args, **kwargs)
+            raise KeyboardInterrupt
+        # Simulate a crash between the archive append and the journal truncate
+        with mock.patch("devtime.session.write_archive", side_effect=crash_after_write):
+            with self.assertRaises(KeyboardInterrupt):
+                session.flush()
+        session._journal.close()
+        session._journal = None
+        set_active_session(None)
+
+        TaskSession().recover()
+        self.assertEqual([record["id"] for record in history.iter_history()], [10001])
+        self.assertEqual(self._file_ids(), [])
+
+    def test_flush_merges_external_writes(self):
+        session = TaskSession(flush_interval=3600)
+        session.open()
+        save_tasks(load_tasks() + [Task("Task B", 2, None, "low", 10002)])
+        # Another devtime process adds a task meanwhile
+        write_tasks_file([Task("Task A", 1, None, "high", 10001), Task("Task C", 3, None, "medium", 10003)])
+
+        session.flush()
+        self.assertEqual(sorted(self._file_ids()), [10001, 10002, 10003])
+        self.assertEqual(sorted(task.id for task in load_tasks()), [10001, 10002, 10003])
+        session.close()
+
+if __name__ == "__main__":
+    unittest.main()
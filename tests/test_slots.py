@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from devtime.availability import Availability
+from devtime.config import DEFAULT_CONFIG
+from devtime.scheduler import Task, plan_tasks
+from devtime.slots import SlotIndex, SLOT_INDEX_FILE, slot_state, load_slot_index, save_slot_index, reserve_added_task
+from devtime.storage import load_tasks, upsert_tasks, write_tasks_file
+
+NOW = datetime(2025, 3, 3, 9, 0)  # Monday
+
+class TestSlotIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.config = dict(DEFAULT_CONFIG)
+        self.availability = Availability(self.config, [(datetime(2025, 3, 3, 14, 0), datetime(2025, 3, 3, 15, 0), "Meeting")])
+        self.tasks = [Task("Task A", 3, None, "high", 10001), Task("Task B", 2.5, None, "low", 10002)]
+        self.plan, _ = plan_tasks(self.tasks, self.config, now=NOW, availability=self.availability)
+
+    def _index(self, until=None):
+        return SlotIndex.from_plan(self.plan, self.config, self.availability, NOW, until)
+
+    def test_matches_planner_placement(self):
+        pieces = self._index().earliest(4)
+        new_task = Task("New", 4, None, "medium", 10003)
+        plan, _ = plan_tasks(self.tasks + [new_task], self.config, now=NOW, availability=self.availability)
+        expected = [(date.fromisoformat(day), round(start, 4), round(end, 4))
+                    for day, entries in sorted(plan.items())
+                    for item, start, end in entries if isinstance(item, Task) and item.id == 10003]
+        self.assertEqual([(day, round(start, 4), round(end, 4)) for day, start, end in pieces], expected)
+
+    def test_contiguous_and_before(self):
+        index = self._index()
+        pieces = index.earliest(2, contiguous=True)
+        self.assertEqual(len(pieces), 1)
+        self.assertAlmostEqual(pieces[0][2] - pieces[0][1], 2)
+        self.assertIsNone(self._index(until=datetime(2025, 3, 3, 18, 0)).earliest(3))
+        self.assertIsNotNone(self._index(until=datetime(2025, 3, 4, 18, 0)).earliest(3))
+
+    def test_reserve_updates_free_time(self):
+        index = self._index(until=datetime(2025, 3, 4, 18, 0))
+        total = index.free_minutes()
+        first = index.reserve(1.5)
+        second = index.reserve(1)
+        self.assertEqual(index.free_minutes(), total - 150)
+        self.assertLessEqual((first[-1][0], first[-1][2]), (second[0][0], second[0][1]))
+        self.assertIsNone(index.reserve(total))
+
+class TestStoredSlotIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.config = dict(DEFAULT_CONFIG, project_quotas={"apollo": 2})
+        write_tasks_file([Task("Task A", 3, None, "high", 10001), Task("Task B", 2.5, "2025-03-05 18:00", "low", 10002)])
+        self.state = slot_state(NOW)
+        save_slot_index(self._rebuilt(), self.state)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _rebuilt(self):
+        availability = Availability(self.config)
+        plan, _ = plan_tasks(load_tasks(), self.config, now=NOW, availability=availability)
+        return SlotIndex.from_plan(plan, self.config, availability, NOW)
+
+    def test_round_trip(self):
+        index = self._rebuilt()
+        index.reserve(1.25)
+        self.assertEqual(SlotIndex.from_dict(index.to_dict()).earliest(2), index.earliest(2))
+
+    def test_add_updates_stored_index(self):
+        new_task = Task("Urgent", 4, "2025-03-03 17:00", "high", 10003)
+        upsert_tasks([new_task])
+        self.assertIsNone(load_slot_index(slot_state(NOW)))  # The store changed
+        reserve_added_task(new_task, self.state, NOW, self.config)
+        self.assertEqual(load_slot_index(slot_state(NOW)).to_dict(), self._rebuilt().to_dict())
+
+    def test_quota_task_drops_stored_index(self):
+        new_task = Task("Capped", 4, None, "medium", 10003, project="apollo")
+        upsert_tasks([new_task])
+        reserve_added_task(new_task, self.state, NOW, self.config)
+        self.assertFalse(os.path.exists(SLOT_INDEX_FILE))
+
+if __name__ == "__main__":
+    unittest.main()
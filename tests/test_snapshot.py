@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from devtime.scheduler import Task
+from devtime.snapshot import TaskSnapshot, open_snapshot
+from devtime.storage import (
+    TASKS_FILE, SNAPSHOT_FILE, build_snapshot, get_tasks, read_tasks_file, write_tasks_file
+)
+
+class TestTaskSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        write_tasks_file([
+            Task("Write report", 2, "2025-03-01 18:00", "high", 30003),
+            Task("Ревʼю коду", 1.5, None, "low", 10001),
+            Task("Deploy", 0.5, "2025-03-02 09:30", "medium", 20002),
+        ])
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_round_trip_keeps_order_and_fields(self):
+        self.assertEqual(build_snapshot(), 3)
+        with TaskSnapshot(SNAPSHOT_FILE) as snapshot:
+            tasks = list(snapshot)
+        self.assertEqual([task.id for task in tasks], [30003, 10001, 20002])
+        self.assertEqual(tasks[0].deadline, datetime(2025, 3, 1, 18, 0))
+        self.assertIsNone(tasks[1].deadline)
+        self.assertEqual(tasks[1].name, "Ревʼю коду")
+        self.assertEqual((tasks[2].duration, tasks[2].priority), (0.5, "medium"))
+        self.assertIsInstance(tasks[0].duration, int)
+
+    def test_lookup_by_id(self):
+        build_snapshot()
+        with TaskSnapshot(SNAPSHOT_FILE) as snapshot:
+            self.assertEqual(snapshot.get(20002).name, "Deploy")
+            self.assertIsNone(snapshot.get(99999))
+            self.assertNotIn(5, snapshot)
+        self.assertEqual([task.name for task in get_tasks([10001, 30003])], ["Ревʼю коду", "Write report"])
+
+    def test_stale_snapshot_is_rebuilt(self):
+        build_snapshot()
+        with open(TASKS_FILE) as f:
+            data = json.load(f)
+        data.append({"name": "Edited by hand", "duration": 1, "deadline": None, "priority": "low", "id": 40004})
+        time.sleep(0.01)
+        with open(TASKS_FILE, "w") as f:
+            json.dump(data, f)
+
+        with open_snapshot(TASKS_FILE, SNAPSHOT_FILE) as snapshot:
+            self.assertEqual(snapshot.get(40004).name, "Edited by hand")
+        self.assertEqual(len(read_tasks_file()), 4)
+
+    def test_saves_keep_snapshot_fresh(self):
+        build_snapshot()
+        write_tasks_file(read_tasks_file()[:1])
+        with TaskSnapshot(SNAPSHOT_FILE) as snapshot:
+            self.assertEqual(len(snapshot), 1)
+            self.assertEqual(snapshot.source_stamp, (os.stat(TASKS_FILE).st_mtime_ns, os.stat(TASKS_FILE).st_size))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+from datetime import datetime
+from unittest import mock
+from devtime.history import archive_completed, iter_completed
+from devtime.scheduler import Task
+from devtime.storage import load_tasks, save_tasks, upsert_tasks, remove_tasks, task_to_dict
+from devtime.sync import export_bundle, apply_bundle, write_bundle, read_bundle, load_sync_state
+
+class TestSync(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.laptop = os.path.join(self._tmp.name, "laptop")
+        self.desktop = os.path.join(self._tmp.name, "desktop")
+        os.mkdir(self.laptop)
+        os.mkdir(self.desktop)
+        self.clock = "2025-03-03 09:00:00"
+        self._now = mock.patch("devtime.changelog._now", lambda: self.clock)
+        self._now.start()
+        with self.store(self.laptop):
+            save_tasks([Task(f"Task {i}", 1, None, "medium", 10000 + i) for i in range(50)])
+        self.sync(self.laptop, self.desktop)
+        self.sync(self.desktop, self.laptop)
+
+    def tearDown(self):
+        self._now.stop()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    @contextmanager
+    def store(self, path):
+        os.chdir(path)
+        try:
+            yield
+        finally:
+            os.chdir(self._cwd)
+
+    def sync(self, source, target):
+        with self.store(target):
+            replica = load_sync_state()["replica"]
+        with self.store(source):
+            peers = load_sync_state()["peers"]
+            bundle = export_bundle(replica if replica in peers else None)
+            write_bundle(bundle, os.path.join(self._tmp.name, "bundle"))
+        with self.store(target):
+            return bundle, apply_bundle(read_bundle(os.path.join(self._tmp.name, "bundle")))
+
+    def tasks(self, path):
+        with self.store(path):
+            return sorted((task_to_dict(task) for task in load_tasks()), key=lambda task: task["id"])
+
+    def edit(self, path, task_id, **fields):
+        with self.store(path):
+            task = next(task for task in load_tasks() if task.id == task_id)
+            for name, value in fields.items():
+                setattr(task, name, value)
+            upsert_tasks([task])
+
+    def test_initial_sync_copies_store(self):
+        self.assertEqual(len(self.tasks(self.desktop)), 50)
+        self.assertEqual(self.tasks(self.desktop), self.tasks(self.laptop))
+
+    def test_bundle_holds_only_changes(self):
+        self.clock = "2025-03-03 10:00:00"
+        self.edit(self.laptop, 10007, duration=3)
+        bundle, result = self.sync(self.laptop, self.desktop)
+        self.assertEqual(list(bundle["tasks"]), ["10007"])
+        self.assertEqual(bundle["tasks"]["10007"]["fields"], {"duration": [3, "2025-03-03 10:00:00", bundle["replica"]]})
+        self.assertEqual(result["updated"], 1)
+
+        bundle, result = self.sync(self.desktop, self.laptop)
+        self.assertEqual(bundle["tasks"], {})  # The change came from the laptop
+        self.assertEqual(self.tasks(self.desktop), self.tasks(self.laptop))
+
+    def test_concurrent_edits_merge_per_field(self):
+        self.clock = "2025-03-03 10:00:00"
+        self.edit(self.laptop, 10001, name="Laptop name", duration=2)
+        self.clock = "2025-03-03 11:00:00"
+        self.edit(self.desktop, 10001, duration=4)
+        self.clock = "2025-03-03 10:30:00"
+        self.edit(self.laptop, 10002, priority="high")
+        self.edit(self.desktop, 10002, priority="low")  # Same time: the higher replica ID wins
+
+        self.sync(self.laptop, self.desktop)
+        self.sync(self.desktop, self.laptop)
+        laptop, desktop = self.tasks(self.laptop), self.tasks(self.desktop)
+        self.assertEqual(laptop, desktop)
+        merged = {task["id"]: task for task in laptop}
+        self.assertEqual((merged[10001]["name"], merged[10001]["duration"]), ("Laptop name", 4))
+        with self.store(self.laptop):
+            laptop_id = load_sync_state()["replica"]
+        with self.store(self.desktop):
+            desktop_id = load_sync_state()["replica"]
+        self.assertEqual(merged[10002]["priority"], "high" if laptop_id > desktop_id else "low")
+
+    def test_delete_against_edit(self):
+        self.clock = "2025-03-03 10:00:00"
+        with self.store(self.laptop):
+            remove_tasks([10003, 10004])
+        self.clock = "2025-03-03 11:00:00"
+        self.edit(self.desktop, 10004, duration=6)  # Edited after the delete: kept
+        self.clock = "2025-03-03 09:30:00"
+        self.edit(self.desktop, 10003, duration=6)  # Edited before the delete: removed
+
+        self.sync(self.desktop, self.laptop)
+        self.sync(self.laptop, self.desktop)
+        laptop = {task["id"]: task for task in self.tasks(self.laptop)}
+        self.assertEqual(laptop, {task["id"]: task for task in self.tasks(self.desktop)})
+        self.assertNotIn(10003, laptop)
+        self.assertEqual(laptop[10004]["duration"], 6)
+
+    def test_completions_are_copied_once(self):
+        with self.store(self.laptop):
+            archive_completed([task for task in load_tasks() if task.id == 10005], datetime(2025, 3, 3, 12, 0))
+            remove_tasks([10005])
+        self.sync(self.laptop, self.desktop)
+        bundle, result = self.sync(self.laptop, self.desktop)  # Not confirmed yet, so sent again
+        self.assertEqual(result["completed"], 0)
+        self.sync(self.desktop, self.laptop)
+        with self.store(self.desktop):
+            self.assertEqual([task.id for task in iter_completed()], [10005])
+            self.assertNotIn(10005, [task.id for task in load_tasks()])
+        with self.store(self.laptop):
+            self.assertEqual(len(list(iter_completed())), 1)
+
+    def test_rejects_own_bundle(self):
+        with self.store(self.laptop):
+            with self.assertRaises(ValueError):
+                apply_bundle(export_bundle())
+
+if __name__ == "__main__":
+    unittest.main()
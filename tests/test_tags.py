@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from collections import deque
+from datetime import datetime
+from devtime.config import DEFAULT_CONFIG
+from devtime.scheduler import Task, fill_day, plan_tasks
+from devtime.storage import TAG_INDEX_FILE, build_snapshot, filter_tasks, read_tasks_file, upsert_tasks, write_tasks_file
+from devtime.tags import TagIndex, normalize_tags
+
+NOW = datetime(2025, 3, 3, 9, 0)  # Monday
+
+class TestTagIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TagIndex.from_records([
+            {"id": 1, "tags": ["bug", "backend"], "project": "apollo"},
+            {"id": 2, "tags": ["frontend"], "project": "zeus"},
+            {"id": 3, "tags": ["bug"]},
+            {"id": 4},
+        ])
+
+    def test_normalize(self):
+        self.assertEqual(normalize_tags("Bug, #backend  bug"), ["backend", "bug"])
+        self.assertEqual(normalize_tags(None), [])
+
+    def test_and_or_project(self):
+        self.assertEqual(self.index.find(), [1, 2, 3, 4])
+        self.assertEqual(self.index.find(all_tags=["bug"]), [1, 3])
+        self.assertEqual(self.index.find(all_tags=["bug", "backend"]), [1])
+        self.assertEqual(self.index.find(any_tags=["backend", "frontend"]), [1, 2])
+        self.assertEqual(self.index.find(all_tags=["bug"], project="apollo"), [1])
+        self.assertEqual(self.index.find(all_tags=["unknown"]), [])
+
+    def test_bulk_build_matches_incremental_adds(self):
+        records = [{"id": i, "tags": [f"t{i % 7}", f"t{i % 3}"], "project": f"p{i % 5}" if i % 2 else None}
+                   for i in range(1000)]
+        incremental = TagIndex()
+        for record in records:
+            incremental.add(record["id"], record["tags"], record["project"])
+        self.assertEqual(TagIndex.from_records(records).to_dict(), incremental.to_dict())
+
+    def test_dict_round_trip(self):
+        restored = TagIndex.from_dict(self.index.to_dict())
+        self.assertEqual(restored.find(any_tags=["bug"], project="apollo"), [1])
+        self.assertEqual(restored.counts(), ({"bug": 2, "backend": 1, "frontend": 1}, {"apollo": 1, "zeus": 1}))
+
+class TestTaggedStore(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        write_tasks_file([
+            Task("API", 2, None, "high", 10001, tags=["backend", "bug"], project="apollo"),
+            Task("UI", 1, None, "low", 10002, tags=["frontend"]),
+        ])
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_filter_and_rebuild_after_write(self):
+        self.assertEqual([task.id for task in filter_tasks(["bug"])], [10001])
+        self.assertTrue(os.path.exists(TAG_INDEX_FILE))
+        upsert_tasks([Task("Crash", 1, None, "high", 10003, tags=["bug"])])
+        self.assertEqual([task.id for task in filter_tasks(["bug"])], [10001, 10003])
+        self.assertEqual([task.id for task in filter_tasks(project="apollo")], [10001])
+
+    def test_fields_survive_snapshot(self):
+        build_snapshot()
+        task = read_tasks_file()[0]
+        self.assertEqual((task.tags, task.project), (["backend", "bug"], "apollo"))
+
+class TestProjectQuotas(unittest.TestCase):
+
+    def test_quota_holds_task_for_the_day(self):
+        pending = deque([Task("A", 3, None, "high", 1, project="apollo"), Task("B", 2, None, "high", 2)])
+        day = fill_day([(9, 11), ("Break", 11, 11.5), (11.5, 14)], pending, quotas={"apollo": 1.5})
+        placed = [(item.id, start, end) for item, start, end in day if isinstance(item, Task)]
+        self.assertEqual(placed, [(1, 9, 10.5), (2, 10.5, 11), (2, 11.5, 13)])
+        self.assertEqual([task.id for task in pending], [1])
+        self.assertEqual(pending[0].duration, 1.5)
+
+    def test_plan_respects_quota_every_day(self):
+        config = dict(DEFAULT_CONFIG, project_quotas={"apollo": 2})
+        plan, remaining = plan_tasks([Task("A", 5, None, "high", 1, project="apollo")], config, now=NOW)
+        hours = {day: sum(end - start for item, start, end in entries if isinstance(item, Task))
+                 for day, entries in plan.items()}
+        self.assertEqual([hours[day] for day in sorted(hours)][:3], [2, 2, 1])
+        self.assertEqual(remaining, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from datetime import datetime
+from devtime.config import DEFAULT_CONFIG
+from devtime.scheduler import Task
+from devtime.team import Capacity, assign_tasks, plan_team
+
+NOW = datetime(2025, 3, 3, 9, 0)  # Monday
+
+class TestTeamPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.config = dict(DEFAULT_CONFIG)
+        self.team = {"ana": {"skills": ["sql"]}, "bo": {"skills": ["backend"]}, "cy": {"skills": ["sql", "backend"]}}
+
+    def _names(self, result):
+        return {name: sorted(task.id for task in tasks) for name, tasks in result["assignments"].items()}
+
+    def test_balances_least_loaded(self):
+        tasks = [Task(f"Task {i}", 2, None, "medium", 10000 + i) for i in range(6)]
+        result = assign_tasks(tasks, self.team, self.config, NOW)
+        self.assertEqual([len(assigned) for assigned in result["assignments"].values()], [2, 2, 2])
+
+    def test_skills_restrict_candidates(self):
+        tasks = [Task("Fix sql report", 2, None, "high", 10001),
+                 Task("Sql and backend migration", 2, None, "high", 10002),
+                 Task("Tune backend cache", 2, None, "high", 10003)]
+        result = assign_tasks(tasks, self.team, self.config, NOW)
+        names = self._names(result)
+        self.assertIn(10001, names["ana"] + names["cy"])
+        self.assertEqual(names["cy"].count(10002), 1)
+        self.assertIn(10003, names["bo"] + names["cy"])
+
+        lone = {"ana": {"skills": ["sql"]}, "bo": {"skills": ["backend"]}}
+        result = assign_tasks([Task("Sql and backend migration", 2, None, "high", 10002)], lone, self.config, NOW)
+        self.assertEqual([task.id for task in result["unassignable"]], [10002])
+
+    def test_keeps_existing_assignee(self):
+        task = Task("Write docs", 20, None, "low", 10001)
+        task.assignee = "bo"
+        result = assign_tasks([task], self.team, self.config, NOW)
+        self.assertEqual(self._names(result)["bo"], [10001])
+
+    def test_deadline_capacity(self):
+        capacity = Capacity(self.config, NOW)
+        self.assertEqual(capacity.until(datetime(2025, 3, 2, 12, 0)), 0)
+        self.assertGreater(capacity.until(datetime(2025, 3, 4, 18, 0)), capacity.until(datetime(2025, 3, 3, 18, 0)))
+
+        team = {"ana": {"skills": []}}
+        tasks = [Task("Big", 40, datetime(2025, 3, 3, 18, 0), "high", 10001),
+                 Task("Small", 1, None, "high", 10002)]
+        result = assign_tasks(tasks, team, self.config, NOW)
+        self.assertEqual([task.id for task in result["at_risk"]], [10001])
+
+    def test_parallel_matches_serial(self):
+        tasks = [Task(f"Sql task {i}", 1 + i % 3, None, "medium", 10000 + i) for i in range(9)]
+        serial, serial_result = plan_team(tasks, self.team, self.config, now=NOW, workers=1)
+        parallel, parallel_result = plan_team(tasks, self.team, self.config, now=NOW, workers=2)
+        self.assertEqual(self._names(serial_result), self._names(parallel_result))
+        for name in self.team:
+            entries = lambda plan: [(day, getattr(item, "id", item), round(start, 4), round(end, 4))
+                                    for day, items in sorted(plan[name][0].items()) for item, start, end in items]
+            self.assertEqual(entries(serial), entries(parallel))
+
+if __name__ == "__main__":
+    unittest.main()
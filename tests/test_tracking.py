@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from devtime import tracking
+from devtime.config import DEFAULT_CONFIG
+from devtime.scheduler import Task, correction_factor, plan_tasks
+
+class TestTimeTracking(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.t0 = datetime(2025, 3, 3, 9, 0)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _track(self, task, hours, start):
+        tracking.start_timer(task.id, start)
+        tracking.stop_timer(start + timedelta(hours=hours))
+        tracking.record_completion(task, start + timedelta(hours=hours))
+
+    def test_start_stops_previous_timer(self):
+        tracking.start_timer(10001, self.t0)
+        stopped = tracking.start_timer(10002, self.t0 + timedelta(minutes=30))
+
+        self.assertEqual(stopped[0], 10001)
+        self.assertEqual(tracking.running_timer()[0], 10002)
+        tracking.stop_timer(self.t0 + timedelta(hours=1))
+        self.assertIsNone(tracking.running_timer())
+
+    def test_stats_are_incremental(self):
+        for i in range(3):
+            self._track(Task(f"Review PR {i}", 1, None, "high", 10001 + i), 2, self.t0 + timedelta(days=i))
+        stats = tracking.update_stats()
+        self.assertEqual(stats["priority"]["high"]["count"], 3)
+        offset = stats["offset"]
+
+        self._track(Task("Review docs", 1, None, "high", 10009), 2, self.t0 + timedelta(days=5))
+        stats = tracking.update_stats()
+        self.assertEqual(stats["priority"]["high"]["count"], 4)
+        self.assertGreater(stats["offset"], offset)
+
+        factors = tracking.correction_factors(stats)
+        self.assertAlmostEqual(factors["priority"]["high"], 2.0)
+        self.assertAlmostEqual(factors["keyword"]["review"], 2.0)
+
+    def test_plan_applies_corrections(self):
+        task = Task("Review PR", 1, None, "high", 10001)
+        corrections = {"priority": {"high": 1.5}, "keyword": {"review": 2.0}}
+
+        self.assertEqual(correction_factor(task, corrections), 2.0)
+        schedule_plan, _ = plan_tasks([task], DEFAULT_CONFIG, self.t0, corrections)
+        _, start, end = schedule_plan["2025-03-03"][0]
+        self.assertEqual(end - start, 2.0)
+        self.assertEqual(task.duration, 1)
+
+if __name__ == "__main__":
+    unittest.main()
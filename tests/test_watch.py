@@ -0,0 +1,89 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from devtime.watch import FileWatcher, ScreenDiff, next_boundary, run_watch
+
+class TestScreenDiff(unittest.TestCase):
+
+    def test_redraws_only_changed_lines(self):
+        screen = ScreenDiff()
+        first = screen.update(["title", "row 1", "row 2"])
+        self.assertTrue(first.startswith("\x1b[H\x1b[2J"))
+        self.assertEqual(screen.update(["title", "row 1", "row 2"]), "")
+
+        output = screen.update(["title", "row 1 changed", "row 2"])
+        self.assertIn("\x1b[2;1Hrow 1 changed\x1b[K", output)
+        self.assertNotIn("title", output)
+        self.assertNotIn("row 2", output)
+
+        self.assertIn("\x1b[2;1H\x1b[J", screen.update(["title"]))
+
+    def test_plain_output(self):
+        screen = ScreenDiff(ansi=False)
+        self.assertEqual(screen.update(["a", "b"]), "a\nb\n\n")
+        self.assertEqual(screen.update(["a", "b"]), "")
+
+class TestWatch(unittest.TestCase):
+
+    def test_next_boundary(self):
+        now = datetime(2025, 3, 3, 10, 15)
+        entries = [("task", 9.0, 10.5), ("Break", 10.5, 10.75)]
+        self.assertEqual(next_boundary(entries, now), datetime(2025, 3, 3, 10, 30))
+        self.assertEqual(next_boundary(entries, datetime(2025, 3, 3, 11, 0)), datetime(2025, 3, 4))
+
+    def check_watcher(self, use_inotify):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tasks.json")
+            watcher = FileWatcher([path], use_inotify=use_inotify, poll_seconds=0.05)
+            try:
+                if use_inotify and not watcher.uses_inotify:
+                    self.skipTest("inotify is not available")
+                with open(os.path.join(tmp, "completion.idx"), "w") as f:
+                    f.write("unrelated")
+                self.assertFalse(watcher.wait(0.2))
+
+                timer = threading.Timer(0.1, lambda: open(path, "w").write("[]"))
+                timer.start()
+                started = time.monotonic()
+                self.assertTrue(watcher.wait(5))
+                self.assertLess(time.monotonic() - started, 2)
+                timer.join()
+            finally:
+                watcher.close()
+
+    def test_inotify_watcher(self):
+        self.check_watcher(use_inotify=True)
+
+    def test_polling_watcher(self):
+        self.check_watcher(use_inotify=False)
+
+    def test_renders_on_change_and_boundary(self):
+        clock = [datetime(2025, 3, 3, 10, 0)]
+        waits, output = [], []
+
+        class FakeWatcher:
+            def wait(self, timeout):
+                waits.append(timeout)
+                if len(waits) == 1:
+                    return True  # A file changed
+                clock[0] += timedelta(seconds=timeout)  # Slept until the boundary
+                return False
+
+        def render():
+            row = "▶ task" if clock[0] >= datetime(2025, 3, 3, 10, 30) else "  task"
+            return ["title", row], datetime(2025, 3, 3, 10, 30) if clock[0] < datetime(2025, 3, 3, 10, 30) \
+                else datetime(2025, 3, 4)
+
+        renders = run_watch(render, FakeWatcher(), output.append, clock=lambda: clock[0],
+                            stop=lambda: len(waits) >= 3)
+        self.assertEqual(renders, 3)
+        self.assertEqual(waits[:2], [1800.0, 1800.0])
+        self.assertEqual(len(output), 2)  # The render after the file change drew nothing new
+        self.assertIn("▶ task", output[1])
+        self.assertNotIn("title", output[1])
+
+if __name__ == "__main__":
+    unittest.main()